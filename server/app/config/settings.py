@@ -1,9 +1,12 @@
 import typing as t
+import os
 
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
 
 
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # server/
+
 class Config(BaseSettings):
     """Configuration class for the Avasara application.
     
@@ -24,11 +27,15 @@ class Config(BaseSettings):
     RABBITMQ_EXCHANGE_NAME: str = "default_exchange"
     RABBITMQ_EXCHANGE_TYPE: str = "direct"
     RABBITMQ_URL: str = ""  # For CloudAMQP or other managed services
+    RABBITMQ_CHANNEL_POOL_SIZE: int = 10 # Channels are held for a whole publish/consume, so consumers count too
+    RABBITMQ_PUBLISH_BATCH_SIZE: int = 500 # Max messages awaiting publisher confirms at once
 
     # Bot Configuration
     BOT_USERNAME: str = "avasara_bot"
     BOT_NAME: str = "Avasara"
     BOT_ID: int = 7259245296
+    UNKNOWN_USERNAME_TTL_SECONDS: int = 60 * 5 # Usernames without any chat aren't looked up again for this long
+    UNKNOWN_USERNAME_CACHE_SIZE: int = 10000
 
     # Application Configuration
     LOG_LEVEL: str = "INFO"
@@ -41,6 +48,37 @@ class Config(BaseSettings):
     # Frontend Configuration
     FRONTEND_URL: str
 
+    # HTTP Client Configuration
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 20
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+
+    # Rate Limiter Configuration
+    RATE_LIMITER_BACKEND: str = "memory" # "memory" (per process) or "sqlite" (shared by every process using RATE_LIMITER_SQLITE_PATH)
+    RATE_LIMITER_SQLITE_PATH: str = "data/rate_limits.sqlite3" # Relative to the server directory, whatever the working directory
+
+    # Chat Context Cache Configuration
+    CHAT_CONTEXT_SIZE: int = 10 # Latest messages of a chat sent to the agent as context
+    CHAT_CONTEXT_MAX_TOKENS: int = 4000 # Older messages are dropped from a chat's context above this
+    CHAT_CONTEXT_CACHE_BACKEND: str = "memory" # "memory" (per process) or "redis" (shared, needs the redis package)
+    CHAT_CONTEXT_CACHE_MAX_CHATS: int = 1000 # Least recently used chats are evicted above this (memory backend)
+    CHAT_CONTEXT_CACHE_MAX_TOKENS: int = 1000000 # Least recently used chats are evicted above this (memory backend)
+    CHAT_CONTEXT_CACHE_TTL_SECONDS: int = 60 * 60 * 6 # Chats without any activity for this long are evicted
+    CHAT_CONTEXT_REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Matching Configuration
+    REGISTERED_USERS_TTL_SECONDS: int = 60 * 15 # Refresh the registered users, and rebuild the matching indexes, after this time
+    OPPORTUNITY_MATCHING_MODE: str = "skills" # "skills" (users with one of the opportunity's key skills), "embedding" (users ranked by profile similarity) or "scoring" (users ranked by weighted criteria)
+    OPPORTUNITY_MATCHING_MIN_SIMILARITY: float = 0.3 # Users whose profile is less similar to the opportunity aren't notified (embedding mode)
+    OPPORTUNITY_MATCHING_MAX_USERS: int = 200 # Best matched users notified of each opportunity (embedding and scoring modes)
+    OPPORTUNITY_SCORING_WEIGHTS: t.Dict[str, float] = {"skills": 0.5, "location": 0.15, "experience": 0.15, "status": 0.1, "deadline": 0.1} # Weights of the criteria (scoring mode)
+    OPPORTUNITY_SCORING_MIN_SCORE: float = 0.6 # Users scoring less aren't notified (scoring mode); with the default weights a skill match is required
+    OPPORTUNITY_SCORING_DEADLINE_HORIZON_DAYS: int = 30 # Opportunities closing sooner than this score higher (scoring mode)
+
+    # Metrics Configuration
+    METRICS_SINKS: t.List[str] = ["prometheus", "log"] # Where LLM call metrics go: "prometheus" (GET /metrics) and/or "log"
+
     # APScheduler Configuration
     APSCHEDULER_RUN_ON_STARTUP: bool = False # Run immediately once on startup (Default: False)
 
@@ -57,6 +95,40 @@ class Config(BaseSettings):
     OPENAI_API_KEY: str
     GOOGLE_API_KEY: str
 
+    # LLM Configuration
+    OPENAI_MAX_REQUESTS_PER_MINUTE: int = 500
+    OPENAI_MAX_TOKENS_PER_MINUTE: int = 30000
+    GEMINI_MAX_REQUESTS_PER_MINUTE: int = 15
+    GEMINI_MAX_TOKENS_PER_MINUTE: int = 1000000
+    OPENAI_MAX_CONCURRENT_REQUESTS: int = 16 # In-flight requests per OpenAI model, across the whole process
+    GEMINI_MAX_CONCURRENT_REQUESTS: int = 4 # In-flight requests per Gemini model, across the whole process
+    LLM_TIMEOUT_SECONDS: float = 120.0
+    LLM_FALLBACK_MODELS: t.List[str] = ["gemini-2.0-flash"] # Models tried in order when the requested model fails
+    LLM_HEDGE_AFTER_SECONDS: float = 0 # Also ask the next fallback model when no answer came after this time (0: disabled)
+
+    # LLM Cache Configuration
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 60 * 60 * 24 * 30 # 30 days
+    LLM_CACHE_MAX_ENTRIES: int = 10000
+
+    # Embedding Configuration
+    EMBEDDING_BATCH_SIZE: int = 256 # Texts embedded per API request (OpenAI accepts up to 2048)
+    EMBEDDING_MAX_CONCURRENT_REQUESTS: int = 4
+    EMBEDDING_CACHE_ENABLED: bool = True # Keep the embeddings in the database, so unchanged texts are never embedded twice
+
+    # Opportunity Vector Index Configuration
+    OPPORTUNITY_INDEX_DIR: str = "data/opportunity_index" # FAISS index and its id -> document sidecar
+    OPPORTUNITY_INDEX_SYNC_BATCH_SIZE: int = 500 # Opportunities read from the database at a time when catching up
+    OPPORTUNITY_INDEX_COMPACT_AFTER_UPDATES: int = 5000 # Updates appended to the log of the index before a new snapshot is written
+    OPPORTUNITY_SEARCH_DEFAULT_TOP_K: int = 10
+    OPPORTUNITY_SEARCH_MAX_TOP_K: int = 100
+    OPPORTUNITY_SEARCH_QUERY_CACHE_SIZE: int = 256 # Embeddings of the recent search queries kept in memory
+
+    # Prompt Compaction Configuration
+    LLM_COMPACTION_ENABLED: bool = True # Project and truncate the listings (see app.static.compaction) before sending them to the LLM
+    LLM_COMPACTION_DESCRIPTION_MAX_TOKENS: int = 400
+    LLM_COMPACTION_FIELD_MAX_TOKENS: int = 100 # For the other text fields
+
     def get_database_url(self) -> str:
         """
         Get the synchronous database connection URL.
@@ -109,5 +181,11 @@ class Config(BaseSettings):
             raise ValueError(f"Log level must be one of {valid_levels}")
         return v
 
+    @field_validator("RATE_LIMITER_SQLITE_PATH")
+    @classmethod
+    def resolve_rate_limiter_path(cls, v: str) -> str:
+        """Resolve a relative path against the server directory, so every process shares the same database."""
+        return os.path.join(BASE_DIR, v)
+
 
 config = Config() 
\ No newline at end of file
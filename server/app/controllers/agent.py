@@ -1,18 +1,18 @@
+import typing as t
 from typing import Optional
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
 from fastapi_restful.cbv import cbv
 
 from app.core.logging import logger
-from app.models.core.pageable import PageRequestSchema
-from app.models.repository.chat import ChatSchema
 from app.service.chat.data import ChatService
-from app.config.settings import config
 from app.service.core.llm import LLM
 from app.static.default import DEFAULT_LLM_MODEL
 from app.types.base import BackendAPIResponse
 from app.models.agent.chat import RequestAgentAskQuestion
 from app.helpers.chat.llm_message import generate_llm_message
+from app.helpers.sse import format_sse_event
 from app.static.prompts.ask_question import SYSTEM_PROMPT
 
 
@@ -23,42 +23,68 @@ agent_router = APIRouter()
 class AgentController:
     def __init__(self):
         self.chat_service = ChatService()
-        self.llm = LLM(model=DEFAULT_LLM_MODEL)
-        self.pageable = PageRequestSchema(page=1, size=10, sort='created_at', direction='DESC')
+        self.llm = LLM(model=DEFAULT_LLM_MODEL, call_site="ask_question")
 
     @agent_router.post("/ask-question", response_model=BackendAPIResponse[str])
     async def ask_question(self, request: RequestAgentAskQuestion):
         """
         Ask a question to the agent.
+
+        The answer isn't saved: the caller saves it once sent, under the ID of the sent message.
         """
         try:
-            # Get chat history
-            chat_history = await self.chat_service.get_paged_chats_by_chat_id(request.chat_id, self.pageable)
-            messages = generate_llm_message(chat_history.data)
-
-            # Add system prompt to the messages
-            prompt = SYSTEM_PROMPT.format(current_date_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-            messages.insert(0, {"role": "system", "content": prompt})
-
-            # Add user question to the messages
-            question = request.question
-            messages.append({"role": "user", "content": question})
+            messages = await self._build_messages(request)
 
             # Get response from the LLM
             response = await self.llm.chat_completion(messages)
 
-            # Save the response to the database
-            chat = ChatSchema(
-                chat_id=request.chat_id,
-                user_id=config.BOT_ID,
-                username=config.BOT_USERNAME,
-                message_id=int(chat_history.data[-1].message_id)+1,
-                message_content=response.content,
-                chat_type=chat_history.data[-1].chat_type,
-                media=None
-            )
-            await self.chat_service.save_message(chat.to_orm())
             return BackendAPIResponse(success=True, message="Question asked successfully", data=response.content)
         except Exception as e:
             logger.error(f"Error asking question: {e}")
             raise HTTPException(status_code=500, detail=str(e))
+
+    @agent_router.post("/ask-question/stream")
+    async def ask_question_stream(self, request: RequestAgentAskQuestion):
+        """
+        Ask a question to the agent, and stream the answer as server-sent events.
+
+        Every piece of the answer is sent as a `{"content": "..."}` event as soon as the LLM
+        produces it. The stream ends with a `done` event once the answer is complete, or with an
+        `error` event if the answer fails midway. The answer isn't saved: the caller saves it
+        once sent, under the IDs of the sent messages.
+        """
+        try:
+            messages = await self._build_messages(request)
+        except Exception as e:
+            logger.error(f"Error asking question: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+        async def events():
+            try:
+                async for delta in self.llm.stream_chat_completion(messages):
+                    yield format_sse_event({"content": delta})
+
+                yield format_sse_event({}, event="done")
+            except Exception as e:
+                logger.error(f"Error streaming answer: {e}")
+                yield format_sse_event({"detail": str(e)}, event="error")
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # Don't let proxies buffer the stream
+        )
+
+    async def _build_messages(self, request: RequestAgentAskQuestion) -> t.List[t.Dict[str, t.Any]]:
+        """Build the LLM messages from the chat history and the question"""
+        # Get chat history
+        chat_history = await self.chat_service.get_recent_chats_by_chat_id(request.chat_id)
+        messages = generate_llm_message(chat_history)
+
+        # Add system prompt to the messages
+        prompt = SYSTEM_PROMPT.format(current_date_time=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        messages.insert(0, {"role": "system", "content": prompt})
+
+        # Add user question to the messages
+        messages.append({"role": "user", "content": request.question})
+        return messages
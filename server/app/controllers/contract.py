@@ -4,6 +4,7 @@ from fastapi import APIRouter, HTTPException, Query, Depends
 from fastapi_restful.cbv import cbv
 
 from app.service.contract.get_data import SmartContractAPI
+from app.service.contract.registered_users import registered_users
 from app.types.contract import UserRegistrationStatus
 from app.types.base import BackendAPIResponse
 from app.core.logging import logger
@@ -27,7 +28,11 @@ class ContractController:
         """
         
         try:
-            registration_status = self.smart_contract_service.check_user_registration(username)
+            registration_status = await self.smart_contract_service.check_user_registration(username)
+
+            # The bot checks the registration of new users: match them from the next opportunity on
+            if registration_status.is_registered and registration_status.address and not registered_users.has_user(registration_status.address):
+                registered_users.invalidate()
             
             return BackendAPIResponse(
                 success=True,
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Response
+from fastapi_restful.cbv import cbv
+
+from app.service.core.metrics import export_prometheus_metrics
+
+
+metrics_router = APIRouter()
+
+
+@cbv(metrics_router)
+class MetricsController:
+    @metrics_router.get("", include_in_schema=False)
+    async def get_metrics(self):
+        """
+        Expose the application metrics in the Prometheus text format.
+        """
+        data, content_type = export_prometheus_metrics()
+        return Response(content=data, media_type=content_type)
@@ -1,13 +1,16 @@
 import typing as t
+import datetime
 
 from fastapi import APIRouter, HTTPException, Query, Depends
 from fastapi_restful.cbv import cbv
 
 from app.core.logging import logger
+from app.config.settings import config
 from app.models.core.pageable import PageRequestSchema, PageResponseSchema
 from app.service.opportunity.data import OpportunityService
+from app.service.opportunity.vector_index import opportunity_vector_index
 from app.types.base import BackendAPIResponse
-from app.models.opportunity import Opportunity as OpportunitySchema
+from app.models.opportunity import Opportunity as OpportunitySchema, OpportunitySearchResult
 
 
 opportunity_router = APIRouter()
@@ -22,6 +25,8 @@ class OpportunityController:
     async def get_opportunities(self, pageable: PageRequestSchema = Depends(PageRequestSchema)):
         """
         Get a paginated list of opportunities.
+
+        Deep pages should be fetched with the `after`/`before` cursors of the previous response rather than `page`.
         """
         try:
             data = await self.opportunity_service.get_paged_opportunities(pageable)
@@ -31,10 +36,60 @@ class OpportunityController:
                 message="Opportunities fetched successfully",
                 data=data
             )
+        except ValueError as e:
+            logger.error(f"Invalid page request: {e}")
+            raise HTTPException(
+                status_code=400,
+                detail=str(e)
+            )
         except Exception as e:
             logger.error(f"Error fetching opportunities: {e}")
             raise HTTPException(
                 status_code=500,
                 detail=f"Error fetching opportunities: {e}"
             )
-    
+
+    @opportunity_router.get("/search", response_model=BackendAPIResponse[t.List[OpportunitySearchResult]])
+    async def search_opportunities(
+        self,
+        q: str = Query(..., min_length=1, description="What to search for, in natural language"),
+        top_k: int = Query(config.OPPORTUNITY_SEARCH_DEFAULT_TOP_K, ge=1, le=config.OPPORTUNITY_SEARCH_MAX_TOP_K),
+        opportunity_types: t.Optional[t.List[str]] = Query(None, alias="type", description="Opportunity types to keep"),
+        deadline_after: t.Optional[datetime.datetime] = Query(None),
+        deadline_before: t.Optional[datetime.datetime] = Query(None),
+        skills: t.Optional[t.List[str]] = Query(None, description="Key skills, any of which is required")
+    ):
+        """
+        Search for the opportunities most relevant to a query, with optional filters.
+
+        Responds with 503 while the search index is loading.
+        """
+        if not opportunity_vector_index.is_loaded:
+            opportunity_vector_index.load_in_background()
+            raise HTTPException(
+                status_code=503,
+                detail="Opportunity search index is loading, try again later",
+                headers={"Retry-After": "30"}
+            )
+
+        try:
+            data = await opportunity_vector_index.search(
+                q,
+                top_k=top_k,
+                opportunity_types=opportunity_types,
+                deadline_after=deadline_after,
+                deadline_before=deadline_before,
+                skills=skills
+            )
+
+            return BackendAPIResponse[t.List[OpportunitySearchResult]](
+                success=True,
+                message="Opportunities searched successfully",
+                data=data
+            )
+        except Exception as e:
+            logger.error(f"Error searching opportunities: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error searching opportunities: {e}"
+            )
@@ -1,8 +1,11 @@
+import typing as t
+
 from fastapi import APIRouter, HTTPException, Query
 from fastapi_restful.cbv import cbv
 
 from app.core.logging import logger
 from app.models.core.pageable import PageRequestSchema
+from app.models.repository.telegram_user import RequestChatIds
 from app.service.chat.data import ChatService
 from app.types.base import BackendAPIResponse
 
@@ -14,7 +17,7 @@ users_router = APIRouter()
 class UsersController:
     def __init__(self):
         self.chat_service = ChatService()
-        self.pageable = PageRequestSchema(page=1, size=10, sort='created_at', direction='DESC')
+        self.pageable = PageRequestSchema(page=1, size=10, sort='created_at', direction='DESC', count='none')
 
     @users_router.get("/get-chat-id-by-username", response_model=BackendAPIResponse[int])
     async def get_chat_id_by_username(self, telegram_username: str = Query(..., description="Telegram username")):
@@ -35,3 +38,20 @@ class UsersController:
         except Exception as e:
             logger.error(f"Error fetching chat ID: {e}")
             raise HTTPException(status_code=500, detail=str(e))
+
+    @users_router.post("/chat-ids", response_model=BackendAPIResponse[t.Dict[str, int]])
+    async def get_chat_ids(self, request: RequestChatIds):
+        """
+        Get the chat IDs of many usernames at once. Usernames without a chat are left out.
+        """
+        try:
+            chat_ids = await self.chat_service.get_chat_ids_by_usernames(request.usernames)
+
+            return BackendAPIResponse(
+                success=True,
+                message=f"Fetched {len(chat_ids)}/{len(request.usernames)} chat IDs successfully",
+                data=chat_ids
+            )
+        except Exception as e:
+            logger.error(f"Error fetching chat IDs: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
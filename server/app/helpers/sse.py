@@ -0,0 +1,20 @@
+import json
+import typing as t
+
+from app.helpers.json import default_encoder
+
+
+def format_sse_event(data: t.Any, event: t.Optional[str] = None) -> str:
+    """
+    Format a server-sent event, with the data encoded as JSON.
+
+    Example:
+        >>> format_sse_event({"content": "Hello"})
+        'data: {"content": "Hello"}\\n\\n'
+        >>> format_sse_event({}, event="done")
+        'event: done\\ndata: {}\\n\\n'
+    """
+    message = f"data: {json.dumps(data, default=default_encoder)}\n\n"
+    if event:
+        message = f"event: {event}\n{message}"
+    return message
@@ -9,6 +9,10 @@ from starlette.exceptions import HTTPException
 from app.config import exception_config as exh
 from app.config.settings import config
 from app.core.logging import logger
+from app.service.core.api import close_async_clients
+from app.service.core.llm_clients import close_llm_clients
+from app.service.opportunity.vector_index import opportunity_vector_index
+from app.utils.telegram_publisher import telegram_publisher
 from app.service.scheduler.manager import SchedulerManager
 from app.service.scheduler.resource_hub_scheduler import ResourceHubScheduler
 from app.service.platforms.superteam.superteam_bounty_listing import SuperteamBountyListingResourceHub
@@ -18,6 +22,7 @@ from app.controllers.chat import chat_router
 from app.controllers.agent import agent_router
 from app.controllers.users import users_router
 from app.controllers.opportunity import opportunity_router
+from app.controllers.metrics import metrics_router
 
 
 ORIGINS = ["*"]
@@ -43,12 +48,27 @@ async def lifespan(app: FastAPI):
     logger.info("Starting schedulers...")
     scheduler_manager.start_all()
     
+    # Load the opportunity vector index without delaying the startup
+    logger.info("Loading opportunity vector index...")
+    vector_index_task = opportunity_vector_index.load_in_background()
+    
     logger.info("S E R V E R   S T A R T I N G . . . . . . . . . .")
     yield
 
+    vector_index_task.cancel()
+
     # Shut Down Event
     logger.info("Shutting down schedulers...")
     scheduler_manager.shutdown_all()
+
+    logger.info("Closing RabbitMQ publisher...")
+    await telegram_publisher.close()
+
+    logger.info("Closing HTTP clients...")
+    await close_async_clients()
+
+    logger.info("Closing LLM clients...")
+    await close_llm_clients()
     
     logger.info("S E R V E R   S H U T D O W N . . . . . . . . . .")
 
@@ -90,6 +110,7 @@ def create_application() -> FastAPI:
     app.include_router(chat_router, prefix="/chat", tags=["chat"])
     app.include_router(agent_router, prefix="/agent", tags=["agent"])
     app.include_router(users_router, prefix="/users", tags=["users"])
+    app.include_router(metrics_router, prefix="/metrics", tags=["metrics"])
 
     logger.info("Application setup complete")
     return app
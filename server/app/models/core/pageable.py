@@ -1,4 +1,7 @@
 import math
+import json
+import base64
+import datetime
 import typing as t
 
 from pydantic import BaseModel
@@ -7,27 +10,91 @@ from sqlalchemy.orm import InstrumentedAttribute
 
 T = t.TypeVar('T')
 
+
+def encode_cursor(value: t.Any, id: int) -> str:
+    """Encode the position of an item (its sort column value and ID) into an opaque cursor"""
+    if isinstance(value, datetime.datetime):
+        value = value.isoformat()
+    payload = json.dumps([value, id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> t.Tuple[t.Any, int]:
+    """
+    Decode a cursor made by `encode_cursor` into the sort column value and ID of the item.
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        value, id = json.loads(payload)
+        return value, int(id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
 class PageRequestSchema(BaseModel):
     page: t.Optional[int] = 1
     size: t.Optional[int] = 25
     sort: t.Optional[str] = 'created_at'
     direction: t.Optional[t.Literal['ASC', 'DESC']] = 'DESC'
 
+    # Keyset pagination: the page right after/before the item of the cursor (`page` is then ignored)
+    after: t.Optional[str] = None
+    before: t.Optional[str] = None
+
+    # How the total count is computed: exactly, estimated from the table statistics, or not at all
+    count: t.Optional[t.Literal['exact', 'estimated', 'none']] = 'exact'
+
     @property
     def offset(self):
         return (self.page - 1) * self.size
 
+    @property
+    def is_keyset(self) -> bool:
+        return self.after is not None or self.before is not None
+
     def sql_sort(self, sort: InstrumentedAttribute):
         return sort.asc() if self.direction == "ASC" else sort.desc()
 
+    def cursor_of(self, item: t.Any) -> str:
+        """Get the cursor of an item (ORM or schema) of the page"""
+        return encode_cursor(getattr(item, self.sort), item.id)
+
 
 class PageResponseSchema(BaseModel, t.Generic[T]):
     data: t.List[T]
     total_pages: t.Optional[int]
-    total_count: int
+    total_count: t.Optional[int]
     page_size: int
+    next_cursor: t.Optional[str] = None
+    previous_cursor: t.Optional[str] = None
 
     def __init__(self, **data):
         super().__init__(**data)
 
-        self.total_pages = math.ceil(self.total_count / self.page_size)
\ No newline at end of file
+        self.total_pages = math.ceil(self.total_count / self.page_size) if self.total_count is not None else None
+
+    @classmethod
+    def from_page(cls, data: t.List[T], total_count: t.Optional[int], pageable: PageRequestSchema) -> "PageResponseSchema[T]":
+        """
+        Build the response of a page, with the cursors of the pages around it.
+
+        Args:
+            data (List[T]): Items of the page, in the requested order
+            total_count (Optional[int]): Total number of items, if computed
+            pageable (PageRequestSchema): The request of the page
+        """
+        is_partial = len(data) < pageable.size
+        is_first_page = (not pageable.is_keyset and pageable.page == 1) or (pageable.before is not None and is_partial)
+        is_last_page = pageable.before is None and is_partial
+
+        return cls(
+            data=data,
+            total_count=total_count,
+            page_size=pageable.size,
+            total_pages=None,
+            next_cursor=pageable.cursor_of(data[-1]) if data and not is_last_page else None,
+            previous_cursor=pageable.cursor_of(data[0]) if data and not is_first_page else None
+        )
@@ -5,5 +5,40 @@ from pydantic import BaseModel
 
 class LLMResponse(BaseModel):
     content: str
+    model: t.Optional[str] = None # model which actually answered (may be a fallback model)
+    prompt_tokens: t.Optional[int] = None
+    completion_tokens: t.Optional[int] = None
+    wait_seconds: t.Optional[float] = None # time spent waiting for a free slot and the provider budget
+    latency_seconds: t.Optional[float] = None
 
 
+class ChunkMetrics(BaseModel):
+    """Timing metrics of a single chunk sent to the LLM"""
+    index: int
+    size: int # number of raw items in the chunk
+    estimated_tokens: int
+    wait_seconds: float # time spent waiting for a free slot and the provider budget
+    duration_seconds: float # LLM round trip including response parsing
+    processed: int # number of opportunities returned for the chunk
+    success: bool
+
+
+class LLMCallMetrics(BaseModel):
+    """Metrics of a single request to an LLM provider"""
+    call_site: str # what the request is for, e.g. "opportunity_normalization" or "ask_question"
+    model: str
+    outcome: t.Literal["success", "error", "cancelled"] # cancelled: lost a hedged race or abandoned by the caller
+    streamed: bool = False
+    latency_seconds: float
+    time_to_first_token_seconds: t.Optional[float] = None # streamed requests only
+    prompt_tokens: t.Optional[int] = None
+    completion_tokens: t.Optional[int] = None
+
+
+class LLMCacheMetrics(BaseModel):
+    """Metrics of a lookup in a cache of LLM results"""
+    cache: str # which cache was looked up, e.g. "opportunity_normalization"
+    model: str
+    hits: int
+    misses: int
+    tokens_saved: int = 0 # estimated prompt tokens not sent to the LLM thanks to the hits
@@ -2,6 +2,8 @@ import datetime
 import typing as t
 from uuid import uuid4
 
+from pydantic import BaseModel
+
 from app.models.core.base import BaseSchema
 from app.models.repository.opportunity import OpportunityOrm
 
@@ -28,3 +30,8 @@ class Opportunity(BaseSchema):
         
         return orm
 
+
+
+class OpportunitySearchResult(BaseModel):
+    opportunity: Opportunity
+    score: float # Cosine similarity with the query
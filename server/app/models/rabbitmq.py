@@ -17,6 +17,7 @@ class RabbitMQConfig:
     virtual_host: str = config.RABBITMQ_VIRTUAL_HOST
     exchange_name: str = config.RABBITMQ_EXCHANGE_NAME
     exchange_type: ExchangeType = ExchangeType.DIRECT
+    channel_pool_size: int = config.RABBITMQ_CHANNEL_POOL_SIZE
 
     def __post_init__(self):
         """Convert exchange_type string to ExchangeType enum"""
@@ -24,6 +25,16 @@ class RabbitMQConfig:
             self.exchange_type = ExchangeType[self.exchange_type.upper()]
 
 
+@dataclass
+class RabbitMQPoolStats:
+    """Utilization of the RabbitMQ channel pool"""
+    connection_open: bool
+    max_channels: int
+    channels_created: int
+    channels_in_use: int
+    channels_waiting: int
+
+
 @dataclass
 class RabbitMQMessage:
     """RabbitMQ message structure"""
@@ -38,4 +49,5 @@ class OpportunityNotification(BaseModel):
     """Opportunity notification data"""
     username: str
     message: str
+    chat_id: Optional[int] = None  # Resolved by the server when known, so the bot doesn't have to look it up
     timestamp: datetime = datetime.utcnow().isoformat()
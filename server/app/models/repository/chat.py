@@ -9,6 +9,8 @@ from sqlalchemy import (
     BigInteger,
     DateTime,
     Text,
+    Index,
+    UniqueConstraint,
 )
 
 from app.models.core.base import BaseOrm, BaseSchema
@@ -16,6 +18,10 @@ from app.models.core.base import BaseOrm, BaseSchema
 
 class ChatOrm(BaseOrm):
     __tablename__ = "chats"
+    __table_args__ = (
+        UniqueConstraint("chat_id", "message_id", name="uq_chats_chat_id_message_id"),
+        {"extend_existing": True},
+    )
 
     chat_id = Column(BigInteger, nullable=False)
     user_id = Column(BigInteger, nullable=False)
@@ -27,6 +33,11 @@ class ChatOrm(BaseOrm):
     media = Column(Text, nullable=True)
 
 
+# Chat history is always read latest first, by chat or by username
+Index("ix_chats_chat_id_created_at", ChatOrm.chat_id, ChatOrm.created_at.desc())
+Index("ix_chats_username_created_at", ChatOrm.username, ChatOrm.created_at.desc())
+
+
 class ChatSchema(BaseSchema):
     __orm__ = ChatOrm
 
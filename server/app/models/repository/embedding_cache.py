@@ -0,0 +1,17 @@
+from sqlalchemy import (
+    Column,
+    String,
+    Integer,
+    LargeBinary,
+)
+
+from app.models.core.base import BaseOrm
+
+
+class EmbeddingCacheOrm(BaseOrm):
+    __tablename__ = "embedding_cache"
+
+    key = Column(String(64), nullable=False, unique=True, index=True)  # sha256 of (model, text)
+    model = Column(String, nullable=False)
+    dimension = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # float32 array bytes
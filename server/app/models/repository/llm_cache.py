@@ -0,0 +1,23 @@
+import typing as t
+import datetime
+
+from sqlalchemy import (
+    Column,
+    String,
+    DateTime,
+    Text,
+)
+
+from app.models.core.base import BaseOrm
+
+
+class LLMCacheOrm(BaseOrm):
+    __tablename__ = "llm_cache"
+
+    key = Column(String(64), nullable=False, unique=True, index=True)  # sha256 of (model, prompt version, canonical input)
+    model = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+    value = Column(Text, nullable=False)  # JSON encoded LLM result
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_accessed_at = Column(DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc), nullable=False, index=True)
+
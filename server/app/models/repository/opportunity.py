@@ -9,6 +9,7 @@ from sqlalchemy import (
     BigInteger,
     DateTime,
     Text,
+    UniqueConstraint,
 )
 
 from app.models.core.base import BaseOrm
@@ -16,6 +17,10 @@ from app.models.core.base import BaseOrm
 
 class OpportunityOrm(BaseOrm):
     __tablename__ = "opportunities"
+    __table_args__ = (
+        UniqueConstraint("platform_name", "platform_id", name="uq_opportunities_platform_name_platform_id"),
+        {"extend_existing": True},
+    )
 
     title = Column(String, nullable=False)
     description = Column(Text, nullable=False)
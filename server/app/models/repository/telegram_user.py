@@ -0,0 +1,26 @@
+import typing as t
+import datetime
+
+from pydantic import BaseModel
+from sqlalchemy import (
+    Column,
+    String,
+    BigInteger,
+    DateTime,
+)
+
+from app.models.core.base import BaseOrm
+
+
+class TelegramUserOrm(BaseOrm):
+    """Latest chat of every Telegram username, maintained when messages are saved"""
+    __tablename__ = "telegram_users"
+
+    username = Column(String, nullable=False, unique=True, index=True)  # Lowercased, Telegram usernames are case insensitive
+    chat_id = Column(BigInteger, nullable=False)
+    user_id = Column(BigInteger, nullable=False)
+    last_seen_at = Column(DateTime(timezone=True), default=lambda: datetime.datetime.now(datetime.timezone.utc), nullable=False)
+
+
+class RequestChatIds(BaseModel):
+    usernames: t.List[str]
@@ -1,15 +1,19 @@
-import openai
+import os
+import json
+import base64
+
 import faiss
 import numpy as np
 
-from app.config.settings import config
+from app.service.core.embeddings import EmbeddingService
+from app.static.default import DEFAULT_EMBEDDING_TOP_K
 
 
 class VectorStore:
     """A vector store implementation using FAISS for efficient similarity search.
     
     This class provides functionality to:
-    - Generate embeddings using OpenAI's embedding models
+    - Generate embeddings using OpenAI's embedding models (batched and cached, see `EmbeddingService`)
     - Build and maintain a FAISS index for fast similarity search
     - Search for similar documents based on query text
     
@@ -18,12 +22,13 @@ class VectorStore:
         documents (List[str]): List of documents stored in the vector store
     """
     
-    def __init__(self):
+    def __init__(self, embedding_service: EmbeddingService | None = None):
         """Initialize an empty vector store."""
+        self.embedding_service = embedding_service or EmbeddingService()
         self.index = None
         self.documents = []
 
-    def embed(self, text: str) -> np.ndarray:
+    async def embed(self, text: str) -> np.ndarray:
         """Generate embeddings for the input text using OpenAI's embedding model.
         
         Args:
@@ -34,19 +39,16 @@ class VectorStore:
             
         Example:
             >>> vector_store = VectorStore()
-            >>> embedding = vector_store.embed("Hello world")
+            >>> embedding = await vector_store.embed("Hello world")
             >>> embedding.shape
             (1536,)
         """
-        response = openai.embeddings.create(
-            model=config.DEFAULT_EMBEDDING_MODEL,
-            input=text
-        )
-        return np.array(response['data'][0]['embedding'], dtype=np.float32)
+        return await self.embedding_service.embed(text)
 
-    def build_index(self, chunks: list[str]) -> None:
+    async def build_index(self, chunks: list[str]) -> None:
         """Build a FAISS index from the given text chunks.
         It helps to find the most similar documents to the query text.
+        All the chunks are embedded in batches, and chunks embedded before are read from the cache.
         
         Args:
             chunks (List[str]): List of text chunks to index
@@ -54,15 +56,14 @@ class VectorStore:
         Example:
             >>> vector_store = VectorStore()
             >>> chunks = ["Hello", "world"]
-            >>> vector_store.build_index(chunks)
+            >>> await vector_store.build_index(chunks)
         """
         self.documents = chunks
-        dim = len(self.embed("test"))
-        self.index = faiss.IndexFlatL2(dim)
-        vectors = np.array([self.embed(chunk) for chunk in chunks])
-        self.index.add(vectors)
+        self.index = faiss.IndexFlatL2(self.embedding_service.dimension)
+        if chunks:
+            self.index.add(await self.embedding_service.embed_many(chunks))
 
-    def search(self, query: str, top_k: int = config.DEFAULT_EMBEDDING_TOP_K) -> list[str]:
+    async def search(self, query: str, top_k: int = DEFAULT_EMBEDDING_TOP_K) -> list[str]:
         """Search for similar documents to the query text.
         
         Args:
@@ -74,11 +75,268 @@ class VectorStore:
             
         Example:
             >>> vector_store = VectorStore()
-            >>> vector_store.build_index(["Hello", "world"])
-            >>> results = vector_store.search("Hello", 1)
+            >>> await vector_store.build_index(["Hello", "world"])
+            >>> results = await vector_store.search("Hello", 1)
             >>> results
             ['Hello']
         """
-        query_vec = self.embed(query).reshape(1, -1)
+        query_vec = (await self.embed(query)).reshape(1, -1)
         _, I = self.index.search(query_vec, top_k)
-        return [self.documents[i] for i in I[0]]
+        return [self.documents[i] for i in I[0] if i != -1]
+
+
+class PersistentVectorStore:
+    """A FAISS vector store keyed by integer ids, which can be updated in place and saved to disk.
+    
+    Unlike `VectorStore`, documents can be added, removed and replaced one by one, so the
+    index never has to be rebuilt. Vectors are L2 normalized and compared by inner product,
+    so the search scores are cosine similarities.
+    
+    On disk, the store is a snapshot and an append-only log:
+    - a FAISS index file, memory-mapped when loaded, and a compact JSON sidecar mapping each id to its document
+    - a JSON lines log of the updates made since the snapshot, replayed on load
+    
+    `flush` appends the pending updates to the log, in O(updates). `save` writes a new snapshot
+    and empties the log, in O(corpus), and only needs to run once in a while to compact the log.
+    A memory-mapped index is copied into memory on its first update.
+    
+    Attributes:
+        dimension (int): Dimension of the vectors
+        index (faiss.IndexIDMap): The FAISS index, keyed by document id
+        documents (Dict[int, dict]): The documents stored in the vector store, by id
+        metadata (dict): Free-form metadata saved with the store (e.g. the embedding model)
+        log_size (int): Number of updates in the log since the last snapshot
+    """
+    INDEX_FILENAME = "index.faiss"
+    DOCUMENTS_FILENAME = "documents.json"
+    LOG_FILENAME = "updates.jsonl"
+
+    def __init__(self, dimension: int, metadata: dict | None = None):
+        """Initialize an empty vector store."""
+        self.dimension = dimension
+        self.index = faiss.IndexIDMap(faiss.IndexFlatIP(dimension))
+        self.documents: dict[int, dict] = {}
+        self.metadata = metadata or {}
+        self.log_size = 0
+        self._pending: list[dict] = []  # Updates not flushed to the log yet
+        self._mmapped = False
+
+    def __len__(self) -> int:
+        return self.index.ntotal
+
+    def __contains__(self, id: int) -> bool:
+        return int(id) in self.documents
+
+    @property
+    def ids(self) -> list[int]:
+        return list(self.documents.keys())
+
+    @property
+    def pending_size(self) -> int:
+        """Number of updates not flushed to the log yet"""
+        return len(self._pending)
+
+    def add(self, ids: list[int], vectors: np.ndarray, documents: list[dict]) -> None:
+        """Add new documents to the store.
+        
+        Args:
+            ids (List[int]): Ids of the documents, not in the store yet
+            vectors (np.ndarray): Their vectors, of shape (len(ids), dimension)
+            documents (List[dict]): The documents themselves
+            
+        Raises:
+            ValueError: If an id is already in the store, or the arguments don't have the same length
+            
+        Example:
+            >>> store = PersistentVectorStore(1536)
+            >>> store.add([1, 2], vectors, [{"title": "Hello"}, {"title": "world"}])
+        """
+        if not (len(ids) == len(vectors) == len(documents)):
+            raise ValueError("ids, vectors and documents must have the same length")
+        if not ids:
+            return
+
+        existing = [id for id in ids if id in self]
+        if existing:
+            raise ValueError(f"Ids already in the vector store: {existing}")
+
+        vectors = self._normalize(vectors)
+        self._add(ids, vectors, documents)
+        self._pending.extend(
+            {"op": "add", "id": int(id), "document": document, "vector": base64.b64encode(vector.tobytes()).decode()}
+            for id, vector, document in zip(ids, vectors, documents)
+        )
+
+    def remove(self, ids: list[int]) -> int:
+        """Remove documents from the store. Unknown ids are ignored.
+        
+        Returns:
+            int: The number of removed documents
+        """
+        ids = [int(id) for id in ids if id in self]
+        if not ids:
+            return 0
+
+        removed = self._remove(ids)
+        self._pending.append({"op": "remove", "ids": ids})
+        return removed
+
+    def upsert(self, ids: list[int], vectors: np.ndarray, documents: list[dict]) -> None:
+        """Add documents to the store, replacing the ones with the same ids."""
+        self.remove(ids)
+        self.add(ids, vectors, documents)
+
+    def search(self, vector: np.ndarray, top_k: int = DEFAULT_EMBEDDING_TOP_K, ids: list[int] | None = None) -> list[tuple[int, float]]:
+        """Search for the documents most similar to a vector.
+        
+        Args:
+            vector (np.ndarray): The query vector, of shape (dimension,)
+            top_k (int): Number of most similar documents to return
+            ids (List[int] | None): Only search among these documents (e.g. the ones matching some filters)
+            
+        Returns:
+            List[Tuple[int, float]]: The ids of the top_k most similar documents and their scores, best first
+        """
+        if len(self) == 0 or ids is not None and len(ids) == 0:
+            return []
+
+        params = None
+        if ids is not None:
+            params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(np.asarray(ids, dtype=np.int64)))
+        scores, found_ids = self.index.search(self._normalize(vector.reshape(1, -1)), top_k, params=params)
+        return [(int(id), float(score)) for id, score in zip(found_ids[0], scores[0]) if id != -1]
+
+    def flush(self, directory: str) -> int:
+        """Append the updates made since the last flush to the log of a saved store.
+        
+        Args:
+            directory (str): Directory of the store, where `save` already wrote a snapshot
+            
+        Returns:
+            int: The number of appended updates
+        """
+        if not self._pending:
+            return 0
+
+        lines = "".join(json.dumps(update, separators=(",", ":"), ensure_ascii=False) + "\n" for update in self._pending)
+        with open(os.path.join(directory, self.LOG_FILENAME), "a", encoding="utf-8") as file:
+            file.write(lines)
+            file.flush()
+            os.fsync(file.fileno())
+
+        flushed = len(self._pending)
+        self.log_size += flushed
+        self._pending = []
+        return flushed
+
+    def save(self, directory: str) -> None:
+        """Save a snapshot of the store to a directory, and empty its log. Every file is replaced atomically.
+        
+        Args:
+            directory (str): Directory of the store, created if needed
+        """
+        os.makedirs(directory, exist_ok=True)
+        index_path = os.path.join(directory, self.INDEX_FILENAME)
+        documents_path = os.path.join(directory, self.DOCUMENTS_FILENAME)
+        log_path = os.path.join(directory, self.LOG_FILENAME)
+
+        faiss.write_index(self.index, f"{index_path}.tmp")
+        with open(f"{documents_path}.tmp", "w", encoding="utf-8") as file:
+            json.dump(
+                {"dimension": self.dimension, "metadata": self.metadata, "documents": self.documents},
+                file, separators=(",", ":"), ensure_ascii=False
+            )
+        # A memory-mapped previous index stays valid until it's closed
+        os.replace(f"{index_path}.tmp", index_path)
+        os.replace(f"{documents_path}.tmp", documents_path)
+
+        # Replaying the log is idempotent, so a crash before it's emptied loses nothing
+        open(log_path, "w").close()
+        self.log_size = 0
+        self._pending = []
+
+    @classmethod
+    def exists(cls, directory: str) -> bool:
+        """Whether a snapshot of a store was saved to a directory"""
+        return os.path.exists(os.path.join(directory, cls.INDEX_FILENAME)) and os.path.exists(os.path.join(directory, cls.DOCUMENTS_FILENAME))
+
+    @classmethod
+    def load(cls, directory: str) -> "PersistentVectorStore | None":
+        """Load a store saved with `save`, memory-mapping its index, and replay its log.
+        
+        Args:
+            directory (str): Directory of the store
+            
+        Returns:
+            PersistentVectorStore | None: The store, or None if it was never saved
+            
+        Raises:
+            ValueError: If the index and its sidecar don't match
+        """
+        index_path = os.path.join(directory, cls.INDEX_FILENAME)
+        documents_path = os.path.join(directory, cls.DOCUMENTS_FILENAME)
+        log_path = os.path.join(directory, cls.LOG_FILENAME)
+        if not cls.exists(directory):
+            return None
+
+        with open(documents_path, encoding="utf-8") as file:
+            sidecar = json.load(file)
+        index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP)
+
+        store = cls(sidecar["dimension"], sidecar["metadata"])
+        if index.d != store.dimension:
+            raise ValueError(f"Index dimension {index.d} doesn't match its sidecar ({store.dimension})")
+        if index.ntotal != len(sidecar["documents"]):
+            raise ValueError(f"Index has {index.ntotal} vectors but its sidecar {len(sidecar['documents'])} documents")
+
+        store.index = index
+        store.documents = {int(id): document for id, document in sidecar["documents"].items()}
+        store._mmapped = True
+
+        if os.path.exists(log_path):
+            with open(log_path, "rb+") as file:
+                content = file.read()
+                # Drop the last line if a crash cut it while appending, before anything is appended after it
+                complete = content[:content.rfind(b"\n") + 1]
+                if len(complete) != len(content):
+                    file.truncate(len(complete))
+            for line in complete.decode("utf-8").splitlines():
+                store._replay(json.loads(line))
+                store.log_size += 1
+        return store
+
+    def _replay(self, update: dict) -> None:
+        """Apply an update of the log, even if it was already applied"""
+        if update["op"] == "add":
+            id = update["id"]
+            if id in self:
+                self._remove([id])
+            vector = np.frombuffer(base64.b64decode(update["vector"]), dtype=np.float32).reshape(1, -1)
+            self._add([id], vector, [update["document"]])
+        elif update["op"] == "remove":
+            ids = [id for id in update["ids"] if id in self]
+            if ids:
+                self._remove(ids)
+
+    def _add(self, ids: list[int], vectors: np.ndarray, documents: list[dict]) -> None:
+        self._ensure_writable()
+        self.index.add_with_ids(vectors, np.asarray(ids, dtype=np.int64))
+        self.documents.update(zip(map(int, ids), documents))
+
+    def _remove(self, ids: list[int]) -> int:
+        self._ensure_writable()
+        removed = self.index.remove_ids(np.asarray(ids, dtype=np.int64))
+        for id in ids:
+            del self.documents[id]
+        return removed
+
+    def _ensure_writable(self) -> None:
+        """Copy a memory-mapped index into memory before updating it"""
+        if self._mmapped:
+            self.index = faiss.clone_index(self.index)
+            self._mmapped = False
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).copy()
+        faiss.normalize_L2(vectors)
+        return vectors
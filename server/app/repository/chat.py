@@ -59,9 +59,10 @@ class ChatRepository(GenericRepository[ChatOrm]):
                     select(ChatOrm)
                     .filter(ChatOrm.username == telegram_username)
                     .order_by(ChatOrm.created_at.desc())
+                    .limit(1)
                 )
                 result = await session.execute(query)
-                return result.scalars().all()[0]
+                return result.scalars().first()
             except NoResultFound:
                 return None
 
@@ -100,7 +101,7 @@ class ChatRepository(GenericRepository[ChatOrm]):
             except NoResultFound:
                 return None
 
-    async def get_paged_items(self, pageable: PageRequestSchema, filters: dict) -> tuple[list[ChatOrm], int]:
+    async def get_paged_items(self, pageable: PageRequestSchema, filters: dict) -> tuple[list[ChatOrm], t.Optional[int]]:
         """
         Get paginated chat items with optional filters.
 
@@ -116,9 +117,9 @@ class ChatRepository(GenericRepository[ChatOrm]):
             filters (dict): Filter criteria for the query
 
         Returns:
-            tuple[list[ChatOrm], int]: A tuple containing:
+            tuple[list[ChatOrm], Optional[int]]: A tuple containing:
                 - List of chat records matching the criteria
-                - Total count of matching records
+                - Total count of matching records (None when `pageable.count` is "none")
 
         Example:
             >>> chat_repo = ChatRepository()
@@ -1,12 +1,14 @@
+import datetime
 from abc import ABC, abstractmethod
 from typing import Generic, TypeVar, List, Optional, Any
 
-from sqlalchemy import select, delete, func
+from sqlalchemy import select, delete, func, text, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import joinedload, selectinload
 from sqlalchemy.exc import NoResultFound
 
 from app.models.core.base import BaseOrm
-from app.models.core.pageable import PageRequestSchema
+from app.models.core.pageable import PageRequestSchema, decode_cursor
 from app.repository.core.session import get_db_session
 
 
@@ -19,6 +21,10 @@ class BaseRepository(ABC, Generic[T]):
     async def save(self, entity: T) -> T:
         pass
 
+    @abstractmethod
+    async def save_many(self, entities: List[T], conflict_columns: Optional[List[str]] = None) -> List[T]:
+        pass
+
     @abstractmethod
     async def delete(self, entity: T) -> None:
         pass
@@ -36,7 +42,7 @@ class BaseRepository(ABC, Generic[T]):
         pass
 
     @abstractmethod
-    async def get_paged_items(self, pageable: PageRequestSchema, params: dict) -> tuple[List[T], int]:
+    async def get_paged_items(self, pageable: PageRequestSchema, params: dict) -> tuple[List[T], Optional[int]]:
         pass
 
 
@@ -66,6 +72,47 @@ class GenericRepository(BaseRepository[T]):
             await session.commit()
             return entity
 
+    async def save_many(self, entities: List[T], conflict_columns: Optional[List[str]] = None) -> List[T]:
+        """
+        Insert the given entities in a single statement and transaction.
+
+        When `conflict_columns` is given, rows conflicting on those (unique) columns are skipped
+        with `ON CONFLICT DO NOTHING`, which makes the insert idempotent.
+
+        :param entities: The entities to be inserted.
+        :param conflict_columns: The unique columns to skip conflicting rows on.
+        :return: The entities which were actually inserted.
+        """
+        if not entities:
+            return []
+
+        rows = [self._to_row(entity) for entity in entities]
+        async with get_db_session() as session:
+            stmt = insert(self._model)
+            if conflict_columns:
+                stmt = stmt.on_conflict_do_nothing(index_elements=conflict_columns)
+
+            result = await session.scalars(stmt.returning(self._model), rows)
+            saved = result.all()
+            await session.commit()
+            return saved
+
+    def _to_row(self, entity: T) -> dict:
+        """
+        Convert an entity into the column values to be inserted, leaving unset columns to their defaults.
+
+        :param entity: The entity to be converted.
+        :return: The column values of the entity.
+        """
+        row = {}
+        for column in self._model.__mapper__.column_attrs:
+            if column.key in ("id", "created_at", "updated_at"):
+                continue
+            value = getattr(entity, column.key)
+            if value is not None:
+                row[column.key] = value
+        return row
+
     async def delete(self, entity: T) -> None:
         """
         Delete the given entity from the database.
@@ -140,33 +187,83 @@ class GenericRepository(BaseRepository[T]):
             result = await session.execute(query)
             return result.scalars().all()
 
-    async def get_paged_items(self, pageable: PageRequestSchema, params: dict) -> tuple[List[T], int]:
+    async def get_paged_items(self, pageable: PageRequestSchema, params: dict) -> tuple[List[T], Optional[int]]:
         """
         Retrieve a paginated list of entities based on the given parameters.
 
-        :param pageable: The pagination and sorting information.
+        Pages are either selected by offset (`page`), or by keyset when an `after`/`before` cursor is
+        given: the rows are then filtered on (sort column, id) instead of skipping the previous ones,
+        so deep pages are as fast as the first one.
+
+        :param pageable: The pagination, sorting and count information.
         :param params: The filter parameters.
-        :return: A tuple containing the list of entities and the total count.
+        :return: A tuple containing the list of entities (in the requested order) and the total count
+            (None when `pageable.count` is "none").
         """
         async with get_db_session() as session:
-            # Get total count
-            count_query = select(func.count()).select_from(self._model).filter_by(**params)
-            total_count = (await session.execute(count_query)).scalar()
+            total_count = await self._count(session, pageable, params)
+            if total_count == 0:
+                return [], total_count
+
+            sort_column = getattr(self._model, pageable.sort)
+            descending = pageable.direction == "DESC"
+            query = select(self._model).filter_by(**params)
+
+            if pageable.is_keyset:
+                forward = pageable.after is not None
+                value, id = decode_cursor(pageable.after if forward else pageable.before)
+                value = self._to_column_value(sort_column, value)
+
+                position = tuple_(sort_column, self._model.id)
+                query = query.where(position < tuple_(value, id) if forward == descending else position > tuple_(value, id))
 
-            # Get paginated results
-            if total_count > 0:
-                sort_column = getattr(self._model, pageable.sort)
+                # Going backwards, the rows closest to the cursor are read first, then put back in order
+                reverse = not forward
+                order = [sort_column.asc(), self._model.id.asc()] if descending == reverse else [sort_column.desc(), self._model.id.desc()]
+                query = query.order_by(*order).limit(pageable.size)
+            else:
+                reverse = False
                 query = (
-                    select(self._model)
-                    .filter_by(**params)
-                    .order_by(pageable.sql_sort(sort_column))
+                    query
+                    .order_by(pageable.sql_sort(sort_column), pageable.sql_sort(self._model.id))
                     .limit(pageable.size)
                     .offset(pageable.offset)
                 )
-                
-                result = await session.execute(query)
-                data = result.scalars().all()
-            else:
-                data = []
 
-            return data, total_count
\ No newline at end of file
+            result = await session.execute(query)
+            data = result.scalars().all()
+            return (data[::-1] if reverse else data), total_count
+
+    async def _count(self, session, pageable: PageRequestSchema, params: dict) -> Optional[int]:
+        """
+        Count the entities matching the filter parameters, as requested by `pageable.count`.
+
+        The estimation reads the planner statistics of the table (pg_class), so it is only used
+        without filters; filtered counts are always exact.
+        """
+        if pageable.count == "none":
+            return None
+
+        if pageable.count == "estimated" and not params:
+            estimate_query = text("SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)")
+            estimate = (await session.execute(estimate_query, {"table": self._model.__tablename__})).scalar()
+            # The table has never been analyzed when the estimate is negative
+            if estimate is not None and estimate >= 0:
+                return estimate
+
+        count_query = select(func.count()).select_from(self._model).filter_by(**params)
+        return (await session.execute(count_query)).scalar()
+
+    @staticmethod
+    def _to_column_value(column, value: Any) -> Any:
+        """Convert a value decoded from a cursor back to the Python type of the column"""
+        try:
+            python_type = column.type.python_type
+        except NotImplementedError:
+            return value
+
+        if python_type is datetime.datetime and isinstance(value, str):
+            return datetime.datetime.fromisoformat(value)
+        if python_type is datetime.date and isinstance(value, str):
+            return datetime.date.fromisoformat(value)
+        return value
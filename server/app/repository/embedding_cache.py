@@ -0,0 +1,53 @@
+import typing as t
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.repository.embedding_cache import EmbeddingCacheOrm
+from app.repository.core.repository import GenericRepository
+from app.repository.core.session import get_db_session
+
+
+class EmbeddingCacheRepository(GenericRepository[EmbeddingCacheOrm]):
+    """
+    Repository class for the persistent embedding cache.
+
+    Use Cases:
+    - Looking up already computed embeddings by their (model, text) hash
+    - Storing new embeddings
+    """
+    def __init__(self):
+        super().__init__(EmbeddingCacheOrm)
+
+    async def get_by_keys(self, keys: t.List[str]) -> t.List[EmbeddingCacheOrm]:
+        """
+        Retrieve the cache entries for the given keys.
+
+        Args:
+            keys (List[str]): Cache keys to look up
+
+        Returns:
+            List[EmbeddingCacheOrm]: The cache entries found
+        """
+        if not keys:
+            return []
+
+        async with get_db_session() as session:
+            result = await session.execute(select(EmbeddingCacheOrm).where(EmbeddingCacheOrm.key.in_(keys)))
+            return result.scalars().all()
+
+    async def insert_many(self, entries: t.List[t.Dict[str, t.Any]]) -> None:
+        """
+        Insert cache entries in a single statement. Existing keys are left as they are, since
+        the embedding of a text by a model never changes.
+
+        Args:
+            entries (List[Dict]): Rows with `key`, `model`, `dimension` and `vector`
+        """
+        if not entries:
+            return
+
+        async with get_db_session() as session:
+            stmt = insert(EmbeddingCacheOrm).values(entries)
+            stmt = stmt.on_conflict_do_nothing(index_elements=[EmbeddingCacheOrm.key])
+            await session.execute(stmt)
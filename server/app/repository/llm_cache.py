@@ -0,0 +1,96 @@
+import typing as t
+import datetime
+
+from sqlalchemy import select, update, delete
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.repository.llm_cache import LLMCacheOrm
+from app.repository.core.repository import GenericRepository
+from app.repository.core.session import get_db_session
+
+
+class LLMCacheRepository(GenericRepository[LLMCacheOrm]):
+    """
+    Repository class for the persistent LLM result cache.
+
+    Use Cases:
+    - Looking up already computed LLM results by their content hash
+    - Storing new LLM results
+    - Evicting expired and least recently used entries
+    """
+    def __init__(self):
+        super().__init__(LLMCacheOrm)
+
+    async def get_valid_by_keys(self, keys: t.List[str]) -> t.List[LLMCacheOrm]:
+        """
+        Retrieve the non-expired cache entries for the given keys and mark them as accessed.
+
+        Args:
+            keys (List[str]): Cache keys to look up
+
+        Returns:
+            List[LLMCacheOrm]: The cache entries found
+        """
+        if not keys:
+            return []
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        async with get_db_session() as session:
+            stmt = select(LLMCacheOrm).where(LLMCacheOrm.key.in_(keys), LLMCacheOrm.expires_at > now)
+            result = await session.execute(stmt)
+            entries = result.scalars().all()
+
+            if entries:
+                await session.execute(
+                    update(LLMCacheOrm)
+                    .where(LLMCacheOrm.key.in_([entry.key for entry in entries]))
+                    .values(last_accessed_at=now)
+                )
+            return entries
+
+    async def upsert_many(self, entries: t.List[t.Dict[str, t.Any]]) -> None:
+        """
+        Insert or replace cache entries in a single statement.
+
+        Args:
+            entries (List[Dict]): Rows with `key`, `model`, `prompt_version`, `value` and `expires_at`
+        """
+        if not entries:
+            return
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = [{**entry, "last_accessed_at": now} for entry in entries]
+        async with get_db_session() as session:
+            stmt = insert(LLMCacheOrm).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[LLMCacheOrm.key],
+                set_={
+                    "value": stmt.excluded.value,
+                    "expires_at": stmt.excluded.expires_at,
+                    "last_accessed_at": stmt.excluded.last_accessed_at,
+                    "updated_at": now,
+                }
+            )
+            await session.execute(stmt)
+
+    async def evict(self, max_entries: int) -> int:
+        """
+        Delete expired entries and keep at most `max_entries` most recently accessed ones.
+
+        Args:
+            max_entries (int): Maximum number of entries to keep
+
+        Returns:
+            int: Number of deleted entries
+        """
+        now = datetime.datetime.now(datetime.timezone.utc)
+        async with get_db_session() as session:
+            expired = await session.execute(delete(LLMCacheOrm).where(LLMCacheOrm.expires_at <= now))
+
+            keep = (
+                select(LLMCacheOrm.id)
+                .order_by(LLMCacheOrm.last_accessed_at.desc())
+                .limit(max_entries)
+            )
+            overflow = await session.execute(delete(LLMCacheOrm).where(LLMCacheOrm.id.not_in(keep)))
+            return expired.rowcount + overflow.rowcount
@@ -55,3 +55,36 @@ class OpportunityRepository(GenericRepository[OpportunityOrm]):
             result = await session.execute(stmt)
             opportunity = result.scalar_one_or_none()
             return opportunity
+
+    async def get_existing_platform_ids(self, platform_name: str, platform_ids: t.List[str]) -> t.Set[str]:
+        """
+        Retrieve which of the given platform IDs are already saved for the platform, in a single query.
+
+        Args:
+            platform_name (str): The name of the platform to search for
+            platform_ids (List[str]): The IDs of the opportunities on the platform
+
+        Returns:
+            Set[str]: The platform IDs which already exist in the database
+        """
+        if not platform_ids:
+            return set()
+
+        async with get_db_session() as session:
+            stmt = select(OpportunityOrm.platform_id).where(
+                OpportunityOrm.platform_name == platform_name,
+                OpportunityOrm.platform_id.in_(platform_ids)
+            )
+            result = await session.execute(stmt)
+            return set(result.scalars().all())
+
+    async def get_ids(self) -> t.List[int]:
+        """
+        Retrieve the IDs of all the opportunities, without loading them.
+
+        Returns:
+            List[int]: The IDs of the opportunities
+        """
+        async with get_db_session() as session:
+            result = await session.execute(select(OpportunityOrm.id))
+            return list(result.scalars().all())
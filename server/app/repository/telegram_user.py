@@ -0,0 +1,69 @@
+import typing as t
+import datetime
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.repository.telegram_user import TelegramUserOrm
+from app.repository.core.repository import GenericRepository
+from app.repository.core.session import get_db_session
+
+
+class TelegramUserRepository(GenericRepository[TelegramUserOrm]):
+    """
+    Repository class for the Telegram username -> chat mapping.
+
+    Use Cases:
+    - Resolving the chat ID of notification recipients without scanning the chat history
+    - Keeping the mapping up to date when messages are saved
+    """
+    def __init__(self):
+        super().__init__(TelegramUserOrm)
+
+    async def upsert_many(self, users: t.List[t.Dict[str, t.Any]]) -> None:
+        """
+        Insert or update the chat of the given users in a single statement.
+
+        Args:
+            users (List[Dict]): Rows with `username`, `chat_id` and `user_id`
+        """
+        if not users:
+            return
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        rows = {
+            user["username"].lower(): {**user, "username": user["username"].lower(), "last_seen_at": now}
+            for user in users
+        }
+        async with get_db_session() as session:
+            stmt = insert(TelegramUserOrm).values(list(rows.values()))
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TelegramUserOrm.username],
+                set_={
+                    "chat_id": stmt.excluded.chat_id,
+                    "user_id": stmt.excluded.user_id,
+                    "last_seen_at": stmt.excluded.last_seen_at,
+                    "updated_at": now,
+                }
+            )
+            await session.execute(stmt)
+
+    async def get_chat_ids_by_usernames(self, usernames: t.List[str]) -> t.Dict[str, int]:
+        """
+        Retrieve the chat ID of many usernames in a single query.
+
+        Args:
+            usernames (List[str]): Telegram usernames to look up
+
+        Returns:
+            Dict[str, int]: Chat ID by lowercased username, for the usernames found
+        """
+        if not usernames:
+            return {}
+
+        async with get_db_session() as session:
+            stmt = select(TelegramUserOrm.username, TelegramUserOrm.chat_id).where(
+                TelegramUserOrm.username.in_({username.lower() for username in usernames})
+            )
+            result = await session.execute(stmt)
+            return {username: chat_id for username, chat_id in result.all()}
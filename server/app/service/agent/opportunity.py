@@ -1,5 +1,7 @@
 import typing as t
+import asyncio
 import json
+import time
 
 from app.static.prompts.opportunity import SYSTEM_PROMPT, PROMPT
 from app.models.opportunity import Opportunity
@@ -9,16 +11,46 @@ from app.core.logging import logger
 from app.config.settings import config
 from app.service.core.llm import LLM
 from app.static.default import DEFAULT_LLM_MODEL
-from app.helpers.json import default_encoder
+from app.models.llm import ChunkMetrics, LLMCacheMetrics, LLMResponse
+from app.service.agent.opportunity_cache import OpportunityCache
+from app.service.core.metrics import record_llm_cache_lookup
+from app.service.agent.prompt_compaction import compact_opportunities, serialize_opportunities
+from app.utils.text_utils import count_tokens
 
 
-async def process_opportunity(opportunities: t.List[t.Dict]) -> t.Optional[t.List[Opportunity]]:
+def _build_messages(opportunities: t.List[t.Dict]) -> t.List[t.Dict[str, str]]:
+    """
+    Build the LLM messages for normalizing the given opportunities.
+    """
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT.format(available_key_skills=AVAILABLE_KEY_SKILLS)
+        },
+        {
+            "role": "user",
+            "content": PROMPT.format(opportunities=serialize_opportunities(opportunities))
+        }
+    ]
+
+
+def _estimate_tokens(opportunities: t.List[t.Dict]) -> int:
+    """
+    Estimate the tokens a request for the given opportunities will consume.
+    The response is roughly as large as the input listings, so the prompt is counted twice.
+    """
+    prompt_tokens = sum(count_tokens(message["content"], DEFAULT_LLM_MODEL.value) for message in _build_messages(opportunities))
+    return prompt_tokens * 2
+
+
+async def process_opportunity(opportunities: t.List[t.Dict], responses: t.Optional[t.List[LLMResponse]] = None) -> t.Optional[t.List[Opportunity]]:
     """
     Process opportunities asynchronously and processes them through the LLM.
 
     Args:
         opportunities (List[Dict]): List of opportunity dictionaries containing details like title,
             reward amount, deadline etc.
+        responses (List[LLMResponse], optional): If given, the raw LLM response is appended to it
 
     Returns:
         List[Opportunity]: Processed opportunities as Opportunity model instances
@@ -27,26 +59,19 @@ async def process_opportunity(opportunities: t.List[t.Dict]) -> t.Optional[t.Lis
         logger.info(f"Processing {len(opportunities)} opportunities through {DEFAULT_LLM_MODEL} LLM")
         
         # Initialize LLM client
-        llm = LLM(model=DEFAULT_LLM_MODEL)
+        llm = LLM(model=DEFAULT_LLM_MODEL, call_site="opportunity_normalization")
         
         # Make the API call
         response = await llm.chat_completion(
-            messages=[
-                {
-                    "role": "system",
-                    "content": SYSTEM_PROMPT.format(available_key_skills=AVAILABLE_KEY_SKILLS)
-                },
-                {
-                    "role": "user",
-                    "content": PROMPT.format(opportunities=json.dumps(opportunities, indent=2, default=default_encoder))
-                }
-            ],
+            messages=_build_messages(opportunities),
             temperature=0.2,
             frequency_penalty=0.1,
             response_format={
                 "type": "json_object",
             }
         )
+        if responses is not None:
+            responses.append(response)
 
         # Parse the JSON response
         try:
@@ -94,30 +119,116 @@ async def process_opportunity(opportunities: t.List[t.Dict]) -> t.Optional[t.Lis
         raise e
 
 
-async def process_opportunity_by_chunk(opportunities: t.List[t.Dict], chunk_size: int = 5) -> t.Optional[t.List[Opportunity]]:
+async def process_opportunity_by_chunk(
+    opportunities: t.List[t.Dict],
+    chunk_size: int = 5,
+    metrics: t.Optional[t.List[ChunkMetrics]] = None,
+    use_cache: bool = config.LLM_CACHE_ENABLED,
+    compact: bool = config.LLM_COMPACTION_ENABLED
+) -> t.Optional[t.List[Opportunity]]:
     """
-    Process opportunities in chunks
+    Process opportunities in chunks.
+
+    The raw items are first compacted (see `compact_opportunities`): only the fields relevant to
+    their platform are kept, and long texts are truncated.
+
+    Items already normalized before (see `OpportunityCache`) are served from the cache without
+    calling the LLM. The remaining chunks are sent to the LLM concurrently, within the concurrency
+    limit of the model and the request/token budget of its provider (see `LLM`). Results are returned in the same order as the input. A failing chunk
+    is logged and skipped without affecting the others.
 
     Args:
         opportunities (List[Dict]): List of opportunity dictionaries containing details like title,
             reward amount, deadline etc.
+        chunk_size (int): Number of opportunities sent to the LLM in a single request
+        metrics (List[ChunkMetrics], optional): If given, timing metrics of every chunk are appended to it
+        use_cache (bool): Whether to use the persistent LLM result cache
+        compact (bool): Whether to compact the raw items before sending them to the LLM
 
     Returns:
         List[Opportunity]: Processed opportunities as Opportunity model instances
     """
-    results: t.List[Opportunity] = []
-    total_chunks = (len(opportunities) + chunk_size - 1) // chunk_size
-    logger.info(f"Processing {len(opportunities)} opportunities in {total_chunks} chunks of size {chunk_size}")
+    if compact and opportunities:
+        opportunities, _ = compact_opportunities(opportunities)
+
+    cache = OpportunityCache(model=DEFAULT_LLM_MODEL.value) if use_cache else None
+    cached: t.Dict[int, t.List[Opportunity]] = {}
+    if cache and opportunities:
+        cached = await cache.get_many(opportunities)
+        tokens_saved = _estimate_tokens([opportunities[index] for index in cached]) if cached else 0
+        record_llm_cache_lookup(LLMCacheMetrics(
+            cache="opportunity_normalization",
+            model=cache.model,
+            hits=len(cached),
+            misses=len(opportunities) - len(cached),
+            tokens_saved=tokens_saved
+        ))
+        if cached:
+            logger.info(f"Skipped LLM for {len(cached)} cached opportunities (~{tokens_saved} tokens saved)")
+
+    # Chunks hold the indexes of the items which still have to go through the LLM
+    pending = [index for index in range(len(opportunities)) if index not in cached]
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    total_chunks = len(chunks)
+    logger.info(f"Processing {len(pending)} opportunities in {total_chunks} chunks of size {chunk_size}")
+
+    async def process_chunk(index: int, chunk_indexes: t.List[int]) -> t.Tuple[t.List[Opportunity], ChunkMetrics]:
+        queued_at = time.perf_counter()
+        chunk = [opportunities[item_index] for item_index in chunk_indexes]
+        estimated_tokens = _estimate_tokens(chunk)
+        chunk_result: t.List[Opportunity] = []
+        responses: t.List[LLMResponse] = []
+        success = False
 
-    for i in range(0, len(opportunities), chunk_size):
-        chunk = opportunities[i:i + chunk_size]
         try:
-            logger.debug(f"Processing chunk {i//chunk_size + 1}/{total_chunks}")
-            chunk_result = await process_opportunity(chunk)
-            results.extend(chunk_result if isinstance(
-                chunk_result, list) else [chunk_result])
+            logger.debug(f"Processing chunk {index + 1}/{total_chunks}")
+            result = await process_opportunity(chunk, responses)
+            if result:
+                chunk_result = result if isinstance(result, list) else [result]
+            success = True
         except Exception as e:
-            logger.error(f"Error processing chunk {i//chunk_size + 1}: {e}")
+            logger.error(f"Error processing chunk {index + 1}: {e}")
+        finished_at = time.perf_counter()
+        # The LLM reports how long the request waited for a free slot and the provider budget
+        started_at = queued_at + ((responses[0].wait_seconds or 0.0) if responses else 0.0)
+
+        if success and cache:
+            await cache.set_many(chunk, chunk_result)
+
+        chunk_metrics = ChunkMetrics(
+            index=index,
+            size=len(chunk),
+            estimated_tokens=estimated_tokens,
+            wait_seconds=started_at - queued_at,
+            duration_seconds=finished_at - started_at,
+            processed=len(chunk_result),
+            success=success
+        )
+        logger.info(
+            f"Chunk {index + 1}/{total_chunks}: {chunk_metrics.processed}/{chunk_metrics.size} processed, "
+            f"~{estimated_tokens} tokens, waited {chunk_metrics.wait_seconds:.2f}s, took {chunk_metrics.duration_seconds:.2f}s"
+        )
+        return chunk_result, chunk_metrics
+
+    started_at = time.perf_counter()
+    chunk_outputs = await asyncio.gather(*(process_chunk(index, chunk) for index, chunk in enumerate(chunks)))
+
+    # Reassemble in input order: cached items at their own position, chunk results at their first item's
+    results_by_position: t.Dict[int, t.List[Opportunity]] = dict(cached)
+    for chunk, (chunk_result, chunk_metrics) in zip(chunks, chunk_outputs):
+        results_by_position[chunk[0]] = chunk_result
+        if metrics is not None:
+            metrics.append(chunk_metrics)
+
+    results: t.List[Opportunity] = []
+    for position in sorted(results_by_position):
+        results.extend(results_by_position[position])
+
+    failed_chunks = sum(1 for _, chunk_metrics in chunk_outputs if not chunk_metrics.success)
+    logger.info(f"Processed {total_chunks} chunks in {time.perf_counter() - started_at:.2f}s ({failed_chunks} failed)")
+
+    if cache:
+        await cache.evict()
 
     if len(results) == 0:
         logger.warning("No opportunities found after processing all chunks")
@@ -0,0 +1,157 @@
+import typing as t
+import datetime
+import hashlib
+import json
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.helpers.json import default_encoder
+from app.models.opportunity import Opportunity
+from app.repository.llm_cache import LLMCacheRepository
+from app.static.key_skills import AVAILABLE_KEY_SKILLS
+from app.static.prompts.opportunity import SYSTEM_PROMPT, PROMPT
+
+
+# Any change to the prompts (or the skills they embed) invalidates previously cached results
+PROMPT_VERSION = hashlib.sha256(
+    "\n".join([SYSTEM_PROMPT, PROMPT, ",".join(AVAILABLE_KEY_SKILLS)]).encode()
+).hexdigest()[:16]
+
+# Fields added by the resource hubs on every fetch, which must not be part of the cache key
+VOLATILE_FIELDS = {"fetched_at"}
+
+
+class OpportunityCache:
+    """
+    Content-addressed cache of LLM normalized opportunities.
+
+    Every raw item is keyed by a hash of (model, prompt version, canonicalized item), so a
+    byte-identical listing is never sent to the LLM twice while its entry is alive. Entries
+    expire after `LLM_CACHE_TTL_SECONDS` and the table is trimmed to `LLM_CACHE_MAX_ENTRIES`
+    least recently used entries.
+
+    Usage:
+        ```python
+        cache = OpportunityCache(model=DEFAULT_LLM_MODEL.value)
+        cached = await cache.get_many(items)  # {index: [Opportunity, ...]}
+        ...
+        await cache.set_many(missed_items, opportunities)
+        ```
+
+    Args:
+        model (str): Name of the model which normalizes the opportunities
+    """
+
+    def __init__(self, model: str):
+        self.model = model
+        self.ttl = datetime.timedelta(seconds=config.LLM_CACHE_TTL_SECONDS)
+        self.max_entries = config.LLM_CACHE_MAX_ENTRIES
+        self.repository = LLMCacheRepository()
+
+    @staticmethod
+    def _canonicalize(item: t.Dict) -> str:
+        data = {key: value for key, value in item.items() if key not in VOLATILE_FIELDS}
+        return json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=default_encoder)
+
+    def make_key(self, item: t.Dict) -> str:
+        """
+        Build the cache key of a raw item.
+        """
+        payload = "\n".join([self.model, PROMPT_VERSION, self._canonicalize(item)])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    @staticmethod
+    def _serialize(opportunities: t.List[Opportunity]) -> str:
+        data = []
+        for opportunity in opportunities:
+            dumped = opportunity.model_dump(mode="json")
+            for field in Opportunity.__transient_fields__:
+                dumped.pop(field, None)
+            data.append(dumped)
+        return json.dumps(data)
+
+    @staticmethod
+    def _deserialize(value: str) -> t.List[Opportunity]:
+        return [Opportunity(**data) for data in json.loads(value)]
+
+    async def get_many(self, items: t.List[t.Dict]) -> t.Dict[int, t.List[Opportunity]]:
+        """
+        Look up the cached results of the given raw items.
+
+        Args:
+            items (List[Dict]): Raw items which are about to be sent to the LLM
+
+        Returns:
+            Dict[int, List[Opportunity]]: Cached opportunities by index of the item in `items`.
+                An empty list means the LLM skipped the item before.
+        """
+        keys = [self.make_key(item) for item in items]
+        try:
+            entries = await self.repository.get_valid_by_keys(list(set(keys)))
+        except Exception as e:
+            logger.error(f"Error reading opportunity cache: {e}")
+            entries = []
+
+        values = {entry.key: entry.value for entry in entries}
+        cached: t.Dict[int, t.List[Opportunity]] = {}
+        for index, key in enumerate(keys):
+            if key not in values:
+                continue
+            try:
+                cached[index] = self._deserialize(values[key])
+            except Exception as e:
+                logger.warning(f"Ignoring invalid opportunity cache entry {key}: {e}")
+
+        logger.info(f"Opportunity cache: {len(cached)} hits, {len(items) - len(cached)} misses")
+        return cached
+
+    async def set_many(self, items: t.List[t.Dict], opportunities: t.List[Opportunity]) -> None:
+        """
+        Store the LLM results of a successfully processed chunk.
+
+        The results are attributed to their raw item by platform ID. Items without any result are
+        cached as skipped only when every result could be attributed, otherwise they are left uncached.
+
+        Args:
+            items (List[Dict]): Raw items of the chunk
+            opportunities (List[Opportunity]): Opportunities the LLM returned for the chunk
+        """
+        by_platform_id: t.Dict[str, t.List[Opportunity]] = {}
+        for opportunity in opportunities:
+            by_platform_id.setdefault(str(opportunity.platform_id), []).append(opportunity)
+
+        item_ids = {str(item.get("id")) for item in items if item.get("id") is not None}
+        all_attributed = all(platform_id in item_ids for platform_id in by_platform_id)
+
+        expires_at = datetime.datetime.now(datetime.timezone.utc) + self.ttl
+        entries: t.Dict[str, t.Dict[str, t.Any]] = {}
+        for item in items:
+            item_id = item.get("id")
+            results = by_platform_id.get(str(item_id), []) if item_id is not None else []
+            if not results and not all_attributed:
+                continue
+
+            key = self.make_key(item)
+            entries[key] = {
+                "key": key,
+                "model": self.model,
+                "prompt_version": PROMPT_VERSION,
+                "value": self._serialize(results),
+                "expires_at": expires_at,
+            }
+
+        try:
+            await self.repository.upsert_many(list(entries.values()))
+            logger.debug(f"Cached {len(entries)} opportunity results")
+        except Exception as e:
+            logger.error(f"Error writing opportunity cache: {e}")
+
+    async def evict(self) -> None:
+        """
+        Remove expired entries and trim the cache to its maximum size.
+        """
+        try:
+            evicted = await self.repository.evict(self.max_entries)
+            logger.debug(f"Evicted {evicted} opportunity cache entries")
+        except Exception as e:
+            logger.error(f"Error evicting opportunity cache: {e}")
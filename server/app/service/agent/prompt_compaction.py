@@ -0,0 +1,138 @@
+import typing as t
+import json
+from dataclasses import dataclass
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.helpers.json import default_encoder
+from app.static.compaction import COMPACTION_PROFILES, DEFAULT_COMPACTION_PROFILE, CompactionProfile
+from app.static.default import DEFAULT_LLM_MODEL
+from app.utils.text_utils import count_tokens, strip_html, truncate_to_tokens
+
+
+_MISSING = object()
+
+
+@dataclass
+class PromptCompactionStats:
+    """Process wide counters of the prompt compaction"""
+    runs: int = 0
+    bytes_saved: int = 0
+    tokens_saved: int = 0
+
+
+prompt_compaction_stats = PromptCompactionStats()
+
+
+@dataclass
+class CompactionReport:
+    """Size of the listings of a run in the prompt, before and after compaction"""
+    items: int
+    bytes_before: int
+    bytes_after: int
+    tokens_before: int
+    tokens_after: int
+
+    @property
+    def bytes_saved(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+
+def serialize_opportunities(opportunities: t.List[t.Dict]) -> str:
+    """
+    Serialize the listings for the prompt as compact JSON.
+    """
+    return json.dumps(opportunities, separators=(",", ":"), ensure_ascii=False, default=default_encoder)
+
+
+def _get_path(item: t.Dict, path: str) -> t.Any:
+    value = item
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+def _set_path(item: t.Dict, path: str, value: t.Any) -> None:
+    *parents, key = path.split(".")
+    for parent in parents:
+        item = item.setdefault(parent, {})
+    item[key] = value
+
+
+def _compact_value(path: str, value: t.Any, profile: CompactionProfile) -> t.Any:
+    if not isinstance(value, str):
+        return value
+
+    if path in profile.html_fields:
+        value = strip_html(value)
+    value = value.strip()
+
+    default_max_tokens = config.LLM_COMPACTION_DESCRIPTION_MAX_TOKENS if path == "description" else config.LLM_COMPACTION_FIELD_MAX_TOKENS
+    return truncate_to_tokens(value, profile.max_tokens.get(path, default_max_tokens), DEFAULT_LLM_MODEL.value)
+
+
+def compact_opportunity(item: t.Dict, profile: CompactionProfile) -> t.Dict:
+    """
+    Keep the fields of the profile, convert and truncate the text fields, and drop the empty values.
+
+    Args:
+        item (Dict): Raw listing
+        profile (CompactionProfile): Compaction profile of the listing's platform
+
+    Returns:
+        Dict: The compacted listing
+    """
+    paths = profile.fields if profile.fields is not None else tuple(item.keys())
+
+    compacted: t.Dict[str, t.Any] = {}
+    for path in paths:
+        value = _get_path(item, path)
+        if value is _MISSING:
+            continue
+        value = _compact_value(path, value, profile)
+        if value is None or value == "" or value == [] or value == {}:
+            continue
+        _set_path(compacted, path, value)
+    return compacted
+
+
+def compact_opportunities(opportunities: t.List[t.Dict]) -> t.Tuple[t.List[t.Dict], CompactionReport]:
+    """
+    Compact the raw listings of a run with the profile of their platform (see `COMPACTION_PROFILES`).
+
+    Args:
+        opportunities (List[Dict]): Raw listings, with their `platform_name`
+
+    Returns:
+        Tuple[List[Dict], CompactionReport]: The compacted listings, and how much smaller they are in the prompt
+    """
+    compacted = [
+        compact_opportunity(item, COMPACTION_PROFILES.get(item.get("platform_name"), DEFAULT_COMPACTION_PROFILE))
+        for item in opportunities
+    ]
+
+    # Compared with the previous serialization: every raw field, indented JSON
+    before = json.dumps(opportunities, indent=2, default=default_encoder)
+    after = serialize_opportunities(compacted)
+    report = CompactionReport(
+        items=len(opportunities),
+        bytes_before=len(before.encode()),
+        bytes_after=len(after.encode()),
+        tokens_before=count_tokens(before, DEFAULT_LLM_MODEL.value),
+        tokens_after=count_tokens(after, DEFAULT_LLM_MODEL.value)
+    )
+
+    prompt_compaction_stats.runs += 1
+    prompt_compaction_stats.bytes_saved += report.bytes_saved
+    prompt_compaction_stats.tokens_saved += report.tokens_saved
+    logger.info(
+        f"Compacted {report.items} opportunities: {report.bytes_before} -> {report.bytes_after} bytes, "
+        f"{report.tokens_before} -> {report.tokens_after} tokens ({report.tokens_saved} tokens saved)"
+    )
+    return compacted, report
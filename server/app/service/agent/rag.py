@@ -9,10 +9,10 @@ from app.static.prompts.ask_question import SYSTEM_PROMPT, PROMPT
 class RAGService:
     def __init__(self, vector_store):
         self.vector_store = vector_store
-        self.llm = LLM(model=DEFAULT_LLM_MODEL)
+        self.llm = LLM(model=DEFAULT_LLM_MODEL, call_site="rag")
 
     async def ask(self, query, top_k=5):
-        context_chunks = self.vector_store.search(query, top_k)
+        context_chunks = await self.vector_store.search(query, top_k)
         context = "\n\n".join(context_chunks)
 
         response = await self.llm.chat_completion(
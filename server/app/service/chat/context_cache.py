@@ -0,0 +1,283 @@
+import typing as t
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.models.repository.chat import ChatSchema
+from app.static.default import DEFAULT_LLM_MODEL
+from app.utils.text_utils import count_tokens
+
+try:
+    import redis.asyncio as redis_asyncio
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+@dataclass
+class ChatContext:
+    """Latest messages of a chat, latest first, with their token counts"""
+    messages: t.List[ChatSchema] = field(default_factory=list)
+    tokens: t.List[int] = field(default_factory=list)
+    touched_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def total_tokens(self) -> int:
+        return sum(self.tokens)
+
+
+class ChatContextEntries(BaseModel):
+    """Serialized form of a chat context"""
+    messages: t.List[ChatSchema]
+    tokens: t.List[int]
+
+
+class BaseChatContextBackend(ABC):
+    """
+    Abstract storage of the chat contexts.
+    """
+
+    @abstractmethod
+    async def get(self, chat_id: int) -> t.Optional[ChatContext]:
+        """
+        Get the context of a chat, or None if it isn't cached.
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, chat_id: int, context: ChatContext) -> None:
+        """
+        Store the context of a chat.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, chat_id: int) -> None:
+        """
+        Remove the context of a chat.
+        """
+        pass
+
+
+class LocalChatContextBackend(BaseChatContextBackend):
+    """
+    Chat contexts kept in memory by the current process.
+
+    The least recently used chats are evicted when there are more than `max_chats` chats, or when
+    the contexts hold more than `max_tokens` tokens in total. Chats idle for `ttl_seconds` are
+    evicted on access.
+    """
+
+    def __init__(self, max_chats: int, max_tokens: int, ttl_seconds: int):
+        self.max_chats = max_chats
+        self.max_tokens = max_tokens
+        self.ttl_seconds = ttl_seconds
+
+        self._contexts: t.OrderedDict[int, ChatContext] = OrderedDict()
+        self._total_tokens = 0
+
+    async def get(self, chat_id: int) -> t.Optional[ChatContext]:
+        context = self._contexts.get(chat_id)
+        if context is None:
+            return None
+        if time.monotonic() - context.touched_at > self.ttl_seconds:
+            await self.delete(chat_id)
+            return None
+
+        context.touched_at = time.monotonic()
+        self._contexts.move_to_end(chat_id)
+        return context
+
+    async def set(self, chat_id: int, context: ChatContext) -> None:
+        await self.delete(chat_id)
+        context.touched_at = time.monotonic()
+        self._contexts[chat_id] = context
+        self._total_tokens += context.total_tokens
+
+        while len(self._contexts) > 1 and (len(self._contexts) > self.max_chats or self._total_tokens > self.max_tokens):
+            evicted_chat_id, evicted = self._contexts.popitem(last=False)
+            self._total_tokens -= evicted.total_tokens
+            logger.debug(f"Evicted context of chat {evicted_chat_id}")
+
+    async def delete(self, chat_id: int) -> None:
+        context = self._contexts.pop(chat_id, None)
+        if context is not None:
+            self._total_tokens -= context.total_tokens
+
+
+class RedisChatContextBackend(BaseChatContextBackend):
+    """
+    Chat contexts kept in Redis (or any Redis compatible server), shared by every process.
+
+    Every context expires after `ttl_seconds` without activity. The total size is bounded by
+    the server's own `maxmemory` policy.
+    """
+    KEY_PREFIX = "chat_context:"
+
+    def __init__(self, url: str, ttl_seconds: int):
+        self.ttl_seconds = ttl_seconds
+        self._client = redis_asyncio.from_url(url)
+
+    async def get(self, chat_id: int) -> t.Optional[ChatContext]:
+        value = await self._client.getex(f"{self.KEY_PREFIX}{chat_id}", ex=self.ttl_seconds)
+        if value is None:
+            return None
+
+        entries = ChatContextEntries.model_validate_json(value)
+        return ChatContext(messages=entries.messages, tokens=entries.tokens)
+
+    async def set(self, chat_id: int, context: ChatContext) -> None:
+        value = ChatContextEntries(messages=context.messages, tokens=context.tokens).model_dump_json()
+        await self._client.set(f"{self.KEY_PREFIX}{chat_id}", value, ex=self.ttl_seconds)
+
+    async def delete(self, chat_id: int) -> None:
+        await self._client.delete(f"{self.KEY_PREFIX}{chat_id}")
+
+
+class ChatContextCache:
+    """
+    Rolling cache of the latest messages of every active chat, so the agent's prompt can be built
+    without reading the chat history from the database.
+
+    A chat's context is loaded from the database on its first question, then kept up to date by
+    `append` whenever a message of the chat is saved. Each context holds at most `size` messages
+    and `max_tokens` tokens (the latest message is always kept).
+
+    Loads and appends of the same chat are serialized within the process, so a message saved
+    while its chat is being loaded is neither lost nor duplicated. With the Redis backend, a
+    message saved by another process at that moment may be missing until the context expires.
+
+    Usage:
+        ```python
+        async with chat_context_cache.lock(chat_id):
+            messages = await chat_context_cache.get(chat_id)
+            if messages is None:
+                messages = await chat_context_cache.load(chat_id, history)  # history is latest first
+        ...
+        await chat_context_cache.append(saved_chat)
+        ```
+
+    Args:
+        backend (BaseChatContextBackend): Storage of the contexts
+        size (int): Maximum number of messages of a context
+        max_tokens (int): Maximum number of tokens of a context
+    """
+    LOCK_STRIPES = 64
+
+    def __init__(self, backend: BaseChatContextBackend, size: int, max_tokens: int):
+        self.backend = backend
+        self.size = size
+        self.max_tokens = max_tokens
+
+        # A fixed set of locks shared by the chats, so the locks don't grow with the number of chats
+        self._locks = [asyncio.Lock() for _ in range(self.LOCK_STRIPES)]
+
+    @asynccontextmanager
+    async def lock(self, chat_id: int):
+        """
+        Serialize the loads and appends of a chat within the process.
+        """
+        async with self._locks[chat_id % self.LOCK_STRIPES]:
+            yield
+
+    def _trim(self, context: ChatContext) -> ChatContext:
+        """Drop the oldest messages above the size and token limits"""
+        messages, tokens = context.messages[:self.size], context.tokens[:self.size]
+        while len(messages) > 1 and sum(tokens) > self.max_tokens:
+            messages.pop()
+            tokens.pop()
+        return ChatContext(messages=messages, tokens=tokens)
+
+    @staticmethod
+    def _count_tokens(chat: ChatSchema) -> int:
+        return count_tokens(chat.message_content, DEFAULT_LLM_MODEL.value)
+
+    async def get(self, chat_id: int) -> t.Optional[t.List[ChatSchema]]:
+        """
+        Get the latest messages of a chat, latest first.
+
+        Returns:
+            Optional[List[ChatSchema]]: The messages, or None if the chat isn't cached
+        """
+        try:
+            context = await self.backend.get(chat_id)
+        except Exception as e:
+            logger.error(f"Error reading context of chat {chat_id}: {e}")
+            return None
+        return context.messages if context is not None else None
+
+    async def load(self, chat_id: int, history: t.List[ChatSchema]) -> t.List[ChatSchema]:
+        """
+        Cache the context of a chat from its history read from the database.
+
+        Args:
+            chat_id (int): The chat ID
+            history (List[ChatSchema]): Latest messages of the chat, latest first
+
+        Returns:
+            List[ChatSchema]: The messages kept in the context, latest first
+        """
+        context = self._trim(ChatContext(messages=list(history), tokens=[self._count_tokens(chat) for chat in history]))
+        try:
+            await self.backend.set(chat_id, context)
+        except Exception as e:
+            logger.error(f"Error caching context of chat {chat_id}: {e}")
+        return context.messages
+
+    async def append(self, chat: ChatSchema) -> None:
+        """
+        Add a newly saved message to the context of its chat.
+
+        Chats which aren't cached are left alone, they are loaded in full on their next question.
+        """
+        async with self.lock(chat.chat_id):
+            try:
+                context = await self.backend.get(chat.chat_id)
+                if context is None or any(cached.message_id == chat.message_id for cached in context.messages):
+                    return
+
+                context = self._trim(ChatContext(
+                    messages=[chat] + context.messages,
+                    tokens=[self._count_tokens(chat)] + context.tokens
+                ))
+                await self.backend.set(chat.chat_id, context)
+            except Exception as e:
+                logger.error(f"Error updating context of chat {chat.chat_id}: {e}")
+                await self.invalidate(chat.chat_id)
+
+    async def invalidate(self, chat_id: int) -> None:
+        """
+        Drop the context of a chat, so it is loaded from the database again.
+        """
+        try:
+            await self.backend.delete(chat_id)
+        except Exception as e:
+            logger.error(f"Error invalidating context of chat {chat_id}: {e}")
+
+
+def _create_backend() -> BaseChatContextBackend:
+    if config.CHAT_CONTEXT_CACHE_BACKEND == "redis":
+        if REDIS_AVAILABLE:
+            logger.info("Using redis chat context cache")
+            return RedisChatContextBackend(config.CHAT_CONTEXT_REDIS_URL, config.CHAT_CONTEXT_CACHE_TTL_SECONDS)
+        logger.warning("The redis package is not installed, using the in-memory chat context cache")
+
+    return LocalChatContextBackend(
+        max_chats=config.CHAT_CONTEXT_CACHE_MAX_CHATS,
+        max_tokens=config.CHAT_CONTEXT_CACHE_MAX_TOKENS,
+        ttl_seconds=config.CHAT_CONTEXT_CACHE_TTL_SECONDS
+    )
+
+
+chat_context_cache = ChatContextCache(
+    backend=_create_backend(),
+    size=config.CHAT_CONTEXT_SIZE,
+    max_tokens=config.CHAT_CONTEXT_MAX_TOKENS
+)
@@ -1,9 +1,19 @@
 import typing as t
+import time
 import asyncio
+from collections import OrderedDict
 
+from app.core.logging import logger
+from app.config.settings import config
 from app.models.repository.chat import ChatOrm, ChatSchema
 from app.models.core.pageable import PageRequestSchema, PageResponseSchema
 from app.repository.chat import ChatRepository
+from app.repository.telegram_user import TelegramUserRepository
+from app.service.chat.context_cache import chat_context_cache
+
+
+# Lowercased usernames without any chat (e.g. users who never started the bot) -> expiry, shared by every instance
+_unknown_usernames: "OrderedDict[str, float]" = OrderedDict()
 
 
 class ChatService:
@@ -23,6 +33,7 @@ class ChatService:
 
     Attributes:
         chat_repo (ChatRepository): Repository instance for database operations
+        telegram_user_repo (TelegramUserRepository): Repository of the username -> chat mapping
 
     Example Usage:
         >>> # Initialize the service
@@ -47,6 +58,7 @@ class ChatService:
     def __init__(self):
         """Initialize the ChatService with a ChatRepository instance."""
         self.chat_repo: ChatRepository = ChatRepository()
+        self.telegram_user_repo: TelegramUserRepository = TelegramUserRepository()
 
     async def save_message(self, chat: ChatOrm) -> ChatSchema:
         """
@@ -77,8 +89,20 @@ class ChatService:
         # Save the chat and get all its data while session is active
         saved_chat = await self.chat_repo.save(chat)
 
+        # Keep the username -> chat mapping up to date (the bot's own messages are saved with its username)
+        if saved_chat.username and saved_chat.username != config.BOT_USERNAME:
+            _unknown_usernames.pop(saved_chat.username.lower(), None)
+            try:
+                await self.telegram_user_repo.upsert_many([{
+                    "username": saved_chat.username,
+                    "chat_id": saved_chat.chat_id,
+                    "user_id": saved_chat.user_id,
+                }])
+            except Exception as e:
+                logger.error(f"Error updating chat of username {saved_chat.username}: {str(e)}")
+
         # Convert to schema while session is still active
-        return ChatSchema(
+        schema = ChatSchema(
             id=saved_chat.id,
             chat_id=saved_chat.chat_id,
             user_id=saved_chat.user_id,
@@ -91,6 +115,10 @@ class ChatService:
             media=saved_chat.media
         )
 
+        # Keep the agent's context of the chat up to date
+        await chat_context_cache.append(schema)
+        return schema
+
     async def get_message(self, chat_id: int) -> ChatOrm:
         """
         Retrieve a specific chat message by its ID.
@@ -179,14 +207,7 @@ class ChatService:
             PageResponseSchema[ChatSchema]: Paginated response with chat messages
         """
         data, total_count = await self.chat_repo.get_paged_items(pageable, {'username': telegram_username})
-        total_pages = (total_count + pageable.size - 1) // pageable.size
-
-        return PageResponseSchema(
-            data=[ChatSchema.model_validate(chat) for chat in data],
-            total_count=total_count,
-            page_size=pageable.size,
-            total_pages=total_pages
-        )
+        return PageResponseSchema.from_page([ChatSchema.model_validate(chat) for chat in data], total_count, pageable)
 
     async def get_paged_chats_by_chat_id(self, chat_id: int, pageable: PageRequestSchema) -> PageResponseSchema[ChatSchema]:
         """
@@ -206,13 +227,7 @@ class ChatService:
             ...     print(f"Message: {chat.message_content}")
         """
         data, total_count = await self.chat_repo.get_paged_items(pageable, {'chat_id': chat_id})
-        total_pages = (total_count + pageable.size - 1) // pageable.size
-        return PageResponseSchema(
-            data=[ChatSchema.model_validate(chat) for chat in data],
-            total_count=total_count,
-            page_size=pageable.size,
-            total_pages=total_pages
-        )
+        return PageResponseSchema.from_page([ChatSchema.model_validate(chat) for chat in data], total_count, pageable)
 
     async def get_paged_chats(self, pageable: PageRequestSchema) -> PageResponseSchema[ChatSchema]:
         """
@@ -230,13 +245,33 @@ class ChatService:
             >>> print(f"Total messages: {all_chats.total_count}")
         """
         data, total_count = await self.chat_repo.get_paged_items(pageable, {})
-        total_pages = (total_count + pageable.size - 1) // pageable.size
-        return PageResponseSchema(
-            data=[ChatSchema.model_validate(chat) for chat in data],
-            total_count=total_count,
-            page_size=pageable.size,
-            total_pages=total_pages
-        )
+        return PageResponseSchema.from_page([ChatSchema.model_validate(chat) for chat in data], total_count, pageable)
+
+    async def get_recent_chats_by_chat_id(self, chat_id: int) -> t.List[ChatSchema]:
+        """
+        Get the latest messages of a chat, latest first, as context for the agent.
+
+        The messages are served from the chat context cache, and read from the database only
+        when the chat isn't cached yet.
+
+        Args:
+            chat_id (int): The chat ID
+
+        Returns:
+            List[ChatSchema]: At most `CHAT_CONTEXT_SIZE` messages within `CHAT_CONTEXT_MAX_TOKENS` tokens
+
+        Example:
+            >>> chats = await chat_service.get_recent_chats_by_chat_id(123)
+            >>> print(f"Latest message: {chats[0].message_content}")
+        """
+        async with chat_context_cache.lock(chat_id):
+            chats = await chat_context_cache.get(chat_id)
+            if chats is not None:
+                return chats
+
+            pageable = PageRequestSchema(page=1, size=config.CHAT_CONTEXT_SIZE, sort='created_at', direction='DESC', count='none')
+            history = await self.get_paged_chats_by_chat_id(chat_id, pageable)
+            return await chat_context_cache.load(chat_id, history.data)
 
     async def get_chat_id_by_username(self, telegram_username: str) -> t.Optional[int]:
         """
@@ -262,16 +297,50 @@ class ChatService:
             ...     print("User not found")
         """
         try:
-            chat = await self.chat_repo.get_by_telegram_username(telegram_username)
-            if chat is None:
-                return None
-            return chat.chat_id
+            chat_ids = await self.get_chat_ids_by_usernames([telegram_username])
+            return chat_ids.get(telegram_username.lower())
         except Exception as e:
-            # Log the error and return None to handle the case where multiple rows are found
-            from app.core.logging import logger
             logger.error(f"Error getting chat ID for username {telegram_username}: {str(e)}")
             return None
 
+    async def get_chat_ids_by_usernames(self, telegram_usernames: t.List[str]) -> t.Dict[str, int]:
+        """
+        Get the chat IDs associated with many Telegram usernames at once.
+
+        The usernames are resolved from the username -> chat mapping in a single query. Usernames
+        missing from it have no chat yet, and aren't looked up again for `UNKNOWN_USERNAME_TTL_SECONDS`,
+        unless one of their messages is saved meanwhile.
+
+        Args:
+            telegram_usernames (List[str]): The Telegram usernames to look up
+
+        Returns:
+            Dict[str, int]: Chat ID by lowercased username, for the usernames found
+
+        Example:
+            >>> chat_ids = await chat_service.get_chat_ids_by_usernames(['john_doe', 'jane_doe'])
+            >>> print(chat_ids.get('john_doe'))
+        """
+        now = time.monotonic()
+        usernames = []
+        for username in {username.lower() for username in telegram_usernames}:
+            expires_at = _unknown_usernames.get(username)
+            if expires_at is None or expires_at <= now:
+                _unknown_usernames.pop(username, None)
+                usernames.append(username)
+        if not usernames:
+            return {}
+
+        chat_ids = await self.telegram_user_repo.get_chat_ids_by_usernames(usernames)
+
+        for username in usernames:
+            if username not in chat_ids:
+                _unknown_usernames[username] = now + config.UNKNOWN_USERNAME_TTL_SECONDS
+        while len(_unknown_usernames) > config.UNKNOWN_USERNAME_CACHE_SIZE:
+            _unknown_usernames.popitem(last=False)
+
+        return chat_ids
+
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ import typing as t
 from datetime import datetime
 
 from app.core.logging import logger
-from app.service.core.api import APIService
+from app.service.core.api import AsyncAPIService
 from app.service.contract.routes import SmartContractAPIRoutes
 from app.types.base import FrontendAPIResponse
 from app.types.contract import (
@@ -28,13 +28,13 @@ class SmartContractAPI:
         """
         Initialize the smart contract API client.
         """
-        self.api = APIService[SmartContractAPIRoutes](
+        self.api = AsyncAPIService[SmartContractAPIRoutes](
             service_name="Smart Contract API",
             base_url=SmartContractAPIRoutes.BASE
         )
         logger.info("Initialized SmartContractAPI")
 
-    def get_contract_info(self) -> ContractInfoData:
+    async def get_contract_info(self) -> ContractInfoData:
         """
         Fetches the core information about the smart contract.
 
@@ -47,14 +47,14 @@ class SmartContractAPI:
         """
         try:
             logger.info("Fetching contract info")
-            response: FrontendAPIResponse[ContractInfoData] = self.api.get(SmartContractAPIRoutes.CONTRACT_INFO)
+            response: FrontendAPIResponse[ContractInfoData] = await self.api.get(SmartContractAPIRoutes.CONTRACT_INFO)
             logger.info("Successfully fetched contract info")
             return response["data"]
         except Exception as e:
             logger.error(f"Error fetching contract info: {e}")
             raise
 
-    def get_users_by_skill(self, skill: str) -> UsersBySkillResponse:
+    async def get_users_by_skill(self, skill: str) -> UsersBySkillResponse:
         """
         Retrieves users who have registered with a specific skill.
 
@@ -77,7 +77,7 @@ class SmartContractAPI:
 
         try:
             logger.info(f"Fetching users with skill: {skill}")
-            response: FrontendAPIResponse[UsersBySkillResponse] = self.api.get(
+            response: FrontendAPIResponse[UsersBySkillResponse] = await self.api.get(
                 SmartContractAPIRoutes.USERS_BY_SKILL,
                 params={"skill": skill.strip()}
             )
@@ -88,7 +88,7 @@ class SmartContractAPI:
             logger.error(f"Error fetching users by skill {skill}: {e}")
             raise
 
-    def get_users_by_location(self, location: str) -> UsersByLocationResponse:
+    async def get_users_by_location(self, location: str) -> UsersByLocationResponse:
         """
         Retrieves users who have registered from a specific location.
 
@@ -111,7 +111,7 @@ class SmartContractAPI:
 
         try:
             logger.info(f"Fetching users from location: {location}")
-            response: FrontendAPIResponse[UsersByLocationResponse] = self.api.get(
+            response: FrontendAPIResponse[UsersByLocationResponse] = await self.api.get(
                 SmartContractAPIRoutes.USERS_BY_LOCATION,
                 params={"location": location.strip()}
             )
@@ -122,7 +122,7 @@ class SmartContractAPI:
             logger.error(f"Error fetching users by location {location}: {e}")
             raise
 
-    def get_registered_users(self) -> RegisteredUsersResponse:
+    async def get_registered_users(self) -> RegisteredUsersResponse:
         """
         Retrieves all users registered in the smart contract.
 
@@ -135,7 +135,7 @@ class SmartContractAPI:
         """
         try:
             logger.info("Fetching all registered users")
-            response: FrontendAPIResponse[RegisteredUsersResponse] = self.api.get(SmartContractAPIRoutes.REGISTERED_USERS)
+            response: FrontendAPIResponse[RegisteredUsersResponse] = await self.api.get(SmartContractAPIRoutes.REGISTERED_USERS)
             users = [UserProfile(**user) for user in response["data"]]
             logger.info(f"Successfully fetched {len(users)} registered users")
             return users
@@ -143,7 +143,7 @@ class SmartContractAPI:
             logger.error(f"Error fetching registered users: {e}")
             raise
 
-    def get_user_profile(self, address: str) -> UserProfileResponse:
+    async def get_user_profile(self, address: str) -> UserProfileResponse:
         """
         Retrieves the complete profile information for a specific user.
 
@@ -163,7 +163,7 @@ class SmartContractAPI:
 
         try:
             logger.info(f"Fetching profile for user: {address}")
-            response: FrontendAPIResponse[UserProfileResponse] = self.api.get(
+            response: FrontendAPIResponse[UserProfileResponse] = await self.api.get(
                 SmartContractAPIRoutes.USER_PROFILE,
                 params={"address": address.lower()}  # Normalize address to lowercase
             )
@@ -174,7 +174,7 @@ class SmartContractAPI:
             logger.error(f"Error fetching profile for user {address}: {e}")
             raise
 
-    def check_user_registration(self, username: str) -> UserRegistrationStatus:
+    async def check_user_registration(self, username: str) -> UserRegistrationStatus:
         """
         Checks if a user is registered in the system based on their username.
 
@@ -194,7 +194,7 @@ class SmartContractAPI:
             logger.info(f"Checking registration status for username: {username}")
             
             # Get all registered users
-            registered_users = self.get_registered_users()
+            registered_users = await self.get_registered_users()
             
             # Check if user exists
             user = next(
@@ -0,0 +1,132 @@
+import typing as t
+import time
+import asyncio
+from abc import ABC, abstractmethod
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.service.contract.get_data import SmartContractAPI
+from app.types.contract import UserProfile
+
+
+class RegisteredUsersSnapshot:
+    """
+    Process wide snapshot of the registered users, read from the contract API at most once per
+    `REGISTERED_USERS_TTL_SECONDS` and shared by every index built from them.
+
+    Each refresh bumps `version`, so the indexes know when to rebuild. `invalidate` makes the
+    next reader refresh right away (e.g. when a new registration is noticed).
+
+    Usage:
+        ```python
+        users = await registered_users.get()
+        ```
+    """
+
+    def __init__(self, ttl_seconds: int = config.REGISTERED_USERS_TTL_SECONDS):
+        self.smart_contract_api = SmartContractAPI()
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+
+        self._users: t.List[UserProfile] = []
+        self._addresses: t.Set[str] = set()
+        self._refreshed_at: t.Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return self._refreshed_at is None or time.monotonic() - self._refreshed_at > self.ttl_seconds
+
+    def has_user(self, address: str) -> bool:
+        """
+        Whether a user is in the snapshot, by wallet address.
+        """
+        return address.lower() in self._addresses
+
+    async def get(self) -> t.List[UserProfile]:
+        """
+        Get the registered users, refreshing the snapshot if it is stale. If the refresh fails,
+        the previous snapshot keeps being used.
+
+        Raises:
+            Exception: If the refresh fails and there is no previous snapshot
+        """
+        if not self.is_stale:
+            return self._users
+
+        async with self._lock:
+            if self.is_stale:
+                try:
+                    self.update(await self.smart_contract_api.get_registered_users())
+                except Exception as e:
+                    if self.version == 0:
+                        raise
+                    logger.warning(f"Error refreshing registered users, using the previous snapshot: {e}")
+                    self._refreshed_at = time.monotonic()  # Don't retry on every read
+        return self._users
+
+    def update(self, users: t.List[UserProfile]) -> None:
+        """
+        Replace the snapshot with a fresh list of the registered users.
+        """
+        self._users = [user for user in users if user.exists]
+        self._addresses = {user.address.lower() for user in self._users}
+        self._refreshed_at = time.monotonic()
+        self.version += 1
+        logger.info(f"Refreshed registered users snapshot with {len(self._users)} users (version {self.version})")
+
+    def invalidate(self) -> None:
+        """
+        Mark the snapshot as stale, so it is refreshed by the next reader.
+        """
+        self._refreshed_at = None
+
+
+registered_users = RegisteredUsersSnapshot()
+
+
+class RegisteredUsersIndex(ABC):
+    """
+    Base of the in-memory indexes built from the registered users snapshot. An index is rebuilt
+    whenever the snapshot changed since it was built.
+    """
+
+    def __init__(self, snapshot: RegisteredUsersSnapshot = registered_users):
+        self.snapshot = snapshot
+        self._version: t.Optional[int] = None  # Version of the snapshot the index was built from
+
+    @property
+    def is_stale(self) -> bool:
+        return self._version != self.snapshot.version or self.snapshot.is_stale
+
+    @abstractmethod
+    async def rebuild(self, users: t.List[UserProfile]) -> None:
+        """
+        Rebuild the index from the registered users.
+        """
+        pass
+
+    async def refresh_if_stale(self) -> None:
+        """
+        Rebuild the index if the snapshot changed. If that fails, the previous index keeps being used.
+
+        Raises:
+            Exception: If it fails and the index was never built
+        """
+        try:
+            users = await self.snapshot.get()
+            version = self.snapshot.version
+            if version == self._version:
+                return
+            await self.rebuild(users)
+            self._version = version
+        except Exception as e:
+            if self._version is None:
+                raise
+            logger.warning(f"Error refreshing {type(self).__name__}, using the previous one: {e}")
+
+    def invalidate(self) -> None:
+        """
+        Refresh the registered users, and so rebuild every index, on the next match.
+        """
+        self.snapshot.invalidate()
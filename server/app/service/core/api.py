@@ -1,16 +1,27 @@
 import typing as t
 from enum import Enum
 import time
+import asyncio
 import requests
 import logging
 from abc import ABC, abstractmethod
+from urllib.parse import urlparse
 
+import httpx
 from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException, Timeout, ConnectionError
 from urllib3.util.retry import Retry
 
 from app.helpers.api import ApiError
+from app.service.core.rate_limiter import get_rate_limiter
 from app.core.logging import logger
+from app.config.settings import config
+
+try:
+    import h2  # noqa: F401 (enables HTTP/2 support in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
 
 
 # Define ApiRoute as a TypeVar that must be an Enum
@@ -103,9 +114,9 @@ class APIService(BaseAPIService[ApiRoute]):
             "status_codes": retry_status_codes
         }
         
-        # Rate limiting state
-        self.request_count = 0
-        self.last_request_time = 0
+        # Rate limiting state, shared by every service instance calling the same host
+        host = urlparse(self.base_url).netloc
+        self.rate_limiter = get_rate_limiter(f"{service_name}@{host}", max_requests_per_minute)
 
         # Initialize session with retries
         self.session = self._create_session()
@@ -130,21 +141,16 @@ class APIService(BaseAPIService[ApiRoute]):
         return session
 
     def _check_rate_limit(self) -> None:
-        """Check and enforce rate limiting"""
-        now = time.time()
-        time_window = 60  # 1 minute window
-
-        if now - self.last_request_time > time_window:
-            self.request_count = 0
-            self.last_request_time = now
-
-        if self.request_count >= self.max_requests_per_minute:
-            wait_time = self.last_request_time + time_window - now
-            logger.warning(f"Rate limit exceeded for {self.service_name}. Waiting {wait_time:.2f} seconds")
-            raise ApiError("RATE_LIMIT_EXCEEDED", "Rate limit exceeded", {"retry_after": wait_time})
+        """Wait until the request fits in the shared rate limit"""
+        waited = self.rate_limiter.acquire()
+        if waited > 0:
+            logger.warning(f"Rate limit reached for {self.service_name}. Waited {waited:.2f} seconds")
 
-        self.request_count += 1
-        self.last_request_time = now
+    async def _check_rate_limit_async(self) -> None:
+        """Wait until the request fits in the shared rate limit, without blocking the event loop"""
+        waited = await self.rate_limiter.acquire_async()
+        if waited > 0:
+            logger.warning(f"Rate limit reached for {self.service_name}. Waited {waited:.2f} seconds")
 
     def _handle_http_error(self, error: RequestException) -> ApiError:
         """
@@ -240,4 +246,193 @@ class APIService(BaseAPIService[ApiRoute]):
     def clear_auth_token(self) -> None:
         """Clear authentication token"""
         self.session.headers.pop("Authorization", None)
-        logger.info(f"Auth token cleared for {self.service_name}") 
\ No newline at end of file
+        logger.info(f"Auth token cleared for {self.service_name}")
+
+
+_async_clients: t.Dict[str, httpx.AsyncClient] = {}
+
+
+def get_async_client(base_url: str) -> httpx.AsyncClient:
+    """
+    Get the process wide async HTTP client of a host.
+
+    Clients are shared between all the services calling the same host, so their connections
+    are pooled and kept alive across service instances.
+
+    Args:
+        base_url: Any URL of the host
+
+    Returns:
+        The shared client of the host
+    """
+    url = httpx.URL(base_url)
+    key = f"{url.scheme}://{url.host}:{url.port}"
+
+    client = _async_clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(config.HTTP_TIMEOUT_SECONDS),
+            limits=httpx.Limits(
+                max_connections=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+                max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY_SECONDS
+            )
+        )
+        _async_clients[key] = client
+        logger.debug(f"Created async HTTP client for {key} (HTTP/2: {HTTP2_AVAILABLE})")
+    return client
+
+
+async def close_async_clients() -> None:
+    """Close all the shared async HTTP clients"""
+    for client in _async_clients.values():
+        await client.aclose()
+    _async_clients.clear()
+    logger.info("Closed all async HTTP clients")
+
+
+class AsyncAPIService(APIService[ApiRoute]):
+    """
+    Async variant of the API service which doesn't block the event loop.
+
+    Requests go through a shared, pooled `httpx.AsyncClient` per host (keep-alive, HTTP/2 where
+    available) with the same rate limiting, retry and error handling semantics as `APIService`.
+    All the request methods have to be awaited.
+
+    Type Parameters:
+        ApiRoute: An Enum type that defines the API routes for a specific service
+    """
+    MAX_RETRY_DELAY = 120  # seconds
+
+    def _create_session(self) -> httpx.AsyncClient:
+        """Get the shared pooled client for the base URL"""
+        return get_async_client(self.base_url)
+
+    def _get_retry_delay(self, attempt: int, response: t.Optional[httpx.Response] = None) -> float:
+        """
+        Get the delay before the next retry, honoring the Retry-After header when present
+
+        Args:
+            attempt: Number of the failed attempt (starting from 0)
+            response: The response of the failed attempt, if any
+        """
+        if response is not None:
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                return min(float(retry_after), self.MAX_RETRY_DELAY)
+        return min(self.retry_config["backoff_factor"] * (2 ** attempt), self.MAX_RETRY_DELAY)
+
+    def _handle_http_error(self, error: httpx.HTTPError) -> ApiError:
+        """
+        Handle HTTP errors and return appropriate ApiError
+
+        Args:
+            error: The httpx exception that occurred
+
+        Returns:
+            An ApiError instance with appropriate error details
+        """
+        if isinstance(error, httpx.TimeoutException):
+            logger.error(f"Request timeout for {self.service_name}")
+            return ApiError("TIMEOUT", "Request timed out")
+
+        if isinstance(error, httpx.NetworkError):
+            logger.error(f"Connection error for {self.service_name}")
+            return ApiError("CONNECTION_ERROR", "Connection error")
+
+        if isinstance(error, httpx.HTTPStatusError):
+            status = error.response.status_code
+            error_mapping = {
+                429: ("RATE_LIMIT_EXCEEDED", "Rate limit exceeded", {"retry_after": error.response.headers.get("Retry-After", "60")}),
+                401: ("UNAUTHORIZED", "Unauthorized"),
+                403: ("FORBIDDEN", "Forbidden"),
+                404: ("NOT_FOUND", "Resource not found"),
+            }
+
+            if status in error_mapping:
+                code, message, *extra = error_mapping[status]
+                logger.warning(f"{message} for {self.service_name}")
+                return ApiError(code, message, *extra)
+
+            if status >= 500:
+                logger.error(f"Server error for {self.service_name}: {status}")
+                return ApiError("SERVER_ERROR", "Internal server error")
+
+        logger.error(f"Unknown error for {self.service_name}: {str(error)}")
+        return ApiError("UNKNOWN_ERROR", "An unexpected error occurred")
+
+    async def _make_request(self, method: str, url: ApiRoute, **kwargs) -> dict:
+        """
+        Make an HTTP request with rate limiting, retries and error handling
+
+        Args:
+            method: HTTP method to use
+            url: API endpoint
+            **kwargs: Additional arguments to pass to httpx
+
+        Returns:
+            Response data as dictionary
+        """
+        await self._check_rate_limit_async()
+        full_url = f"{self.base_url}{url.value}"
+        attempts = self.retry_config["attempts"]
+
+        for attempt in range(attempts + 1):
+            try:
+                logger.debug(f"Making {method} request to {full_url}")
+                response = await self.session.request(
+                    method=method,
+                    url=full_url,
+                    headers=self.headers,
+                    **kwargs
+                )
+                if response.status_code in self.retry_config["status_codes"] and attempt < attempts:
+                    delay = self._get_retry_delay(attempt, response)
+                    logger.debug(f"Got {response.status_code} from {self.service_name}, retrying in {delay:.2f} seconds")
+                    await asyncio.sleep(delay)
+                    continue
+
+                response.raise_for_status()
+                return response.json()
+            except (httpx.TimeoutException, httpx.NetworkError) as error:
+                if attempt < attempts:
+                    delay = self._get_retry_delay(attempt)
+                    logger.debug(f"{type(error).__name__} for {self.service_name}, retrying in {delay:.2f} seconds")
+                    await asyncio.sleep(delay)
+                    continue
+                raise self._handle_http_error(error)
+            except httpx.HTTPError as error:
+                raise self._handle_http_error(error)
+
+    async def get(self, url: ApiRoute, params: dict | None = None) -> dict:
+        """Make a GET request to the API"""
+        return await self._make_request("GET", url, params=params)
+
+    async def post(self, url: ApiRoute, data: dict | None = None) -> dict:
+        """Make a POST request to the API"""
+        return await self._make_request("POST", url, json=data)
+
+    async def put(self, url: ApiRoute, data: dict | None = None) -> dict:
+        """Make a PUT request to the API"""
+        return await self._make_request("PUT", url, json=data)
+
+    async def delete(self, url: ApiRoute, params: dict | None = None) -> dict:
+        """Make a DELETE request to the API"""
+        return await self._make_request("DELETE", url, params=params)
+
+    async def patch(self, url: ApiRoute, data: dict | None = None) -> dict:
+        """Make a PATCH request to the API"""
+        return await self._make_request("PATCH", url, json=data)
+
+    def set_auth_token(self, token: str) -> None:
+        """Set authentication token for requests"""
+        # The client is shared between services, so the token is kept in this service's headers
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+            logger.info(f"Auth token set for {self.service_name}")
+
+    def clear_auth_token(self) -> None:
+        """Clear authentication token"""
+        self.headers.pop("Authorization", None)
+        logger.info(f"Auth token cleared for {self.service_name}")
@@ -0,0 +1,150 @@
+import typing as t
+import asyncio
+import hashlib
+import time
+
+import numpy as np
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.models.llm import LLMCallMetrics
+from app.repository.embedding_cache import EmbeddingCacheRepository
+from app.service.core.llm_clients import get_openai_client
+from app.service.core.metrics import record_llm_call
+from app.static.default import DEFAULT_EMBEDDING_MODEL
+from app.static.llm import OpenAIEmbeddingModel
+
+
+CACHE_CHUNK_SIZE = 1000  # Rows per cache statement, well below Postgres' bind parameter limit
+
+class EmbeddingService:
+    """
+    Computes text embeddings in batches, backed by a persistent cache.
+
+    Every text is keyed by a hash of (model, text): texts embedded before are read from the
+    cache, and the others are embedded `EMBEDDING_BATCH_SIZE` at a time, with at most
+    `EMBEDDING_MAX_CONCURRENT_REQUESTS` requests in flight. Embedding an unchanged corpus
+    again costs no API call.
+
+    Usage:
+        ```python
+        embedding_service = EmbeddingService()
+        vectors = await embedding_service.embed_many(["Hello", "world"])  # shape (2, 1536)
+        vector = await embedding_service.embed("Hello")  # shape (1536,)
+        ```
+
+    Args:
+        model (OpenAIEmbeddingModel): The embedding model
+        use_cache (bool): Whether to use the persistent embedding cache
+    """
+    _semaphore: t.Optional[asyncio.Semaphore] = None  # Shared by every instance
+
+    def __init__(self, model: OpenAIEmbeddingModel = DEFAULT_EMBEDDING_MODEL, use_cache: bool = config.EMBEDDING_CACHE_ENABLED):
+        self.model = model
+        self.use_cache = use_cache
+        self.repository = EmbeddingCacheRepository()
+
+    @property
+    def dimension(self) -> int:
+        return self.model.dimension
+
+    def make_key(self, text: str) -> str:
+        """
+        Build the cache key of a text.
+        """
+        return hashlib.sha256(f"{self.model.value}\n{text}".encode()).hexdigest()
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a single text.
+
+        Returns:
+            np.ndarray: The float32 vector, of shape (dimension,)
+        """
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: t.List[str]) -> np.ndarray:
+        """
+        Embed many texts, in as few API requests as possible.
+
+        Args:
+            texts (List[str]): The texts to embed
+
+        Returns:
+            np.ndarray: The float32 vectors, of shape (len(texts), dimension), in the order of `texts`
+        """
+        vectors: t.Dict[str, np.ndarray] = {}
+        unique_texts = list(dict.fromkeys(texts))
+        keys = {text: self.make_key(text) for text in unique_texts}
+
+        if self.use_cache and unique_texts:
+            vectors.update(await self._get_cached(keys))
+
+        missing = [text for text in unique_texts if text not in vectors]
+        if missing:
+            batches = [missing[i:i + config.EMBEDDING_BATCH_SIZE] for i in range(0, len(missing), config.EMBEDDING_BATCH_SIZE)]
+            results = await asyncio.gather(*(self._embed_batch(batch) for batch in batches))
+            computed = {text: vector for batch, batch_vectors in zip(batches, results) for text, vector in zip(batch, batch_vectors)}
+            vectors.update(computed)
+
+            if self.use_cache:
+                await self._set_cached({keys[text]: vector for text, vector in computed.items()})
+
+        logger.info(f"Embedded {len(unique_texts)} texts: {len(unique_texts) - len(missing)} cached, {len(missing)} computed")
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        return np.stack([vectors[text] for text in texts])
+
+    async def _embed_batch(self, texts: t.List[str]) -> np.ndarray:
+        """Embed a batch of texts in a single API request"""
+        if EmbeddingService._semaphore is None:
+            EmbeddingService._semaphore = asyncio.Semaphore(config.EMBEDDING_MAX_CONCURRENT_REQUESTS)
+
+        async with EmbeddingService._semaphore:
+            outcome = "error"
+            prompt_tokens = None
+            started_at = time.perf_counter()
+            try:
+                response = await get_openai_client().embeddings.create(model=self.model.value, input=texts)
+                prompt_tokens = response.usage.prompt_tokens if response.usage else None
+                outcome = "success"
+            finally:
+                record_llm_call(LLMCallMetrics(
+                    call_site="embeddings",
+                    model=self.model.value,
+                    outcome=outcome,
+                    latency_seconds=time.perf_counter() - started_at,
+                    prompt_tokens=prompt_tokens
+                ))
+
+        data = sorted(response.data, key=lambda item: item.index)
+        return np.array([item.embedding for item in data], dtype=np.float32)
+
+    async def _get_cached(self, keys: t.Dict[str, str]) -> t.Dict[str, np.ndarray]:
+        """Read the cached vectors of the texts, by text"""
+        all_keys = list(keys.values())
+        by_key: t.Dict[str, np.ndarray] = {}
+        for i in range(0, len(all_keys), CACHE_CHUNK_SIZE):
+            try:
+                entries = await self.repository.get_by_keys(all_keys[i:i + CACHE_CHUNK_SIZE])
+            except Exception as e:
+                logger.error(f"Error reading embedding cache: {e}")
+                continue
+
+            by_key.update(
+                (entry.key, np.frombuffer(entry.vector, dtype=np.float32))
+                for entry in entries if entry.dimension == self.dimension
+            )
+        return {text: by_key[key] for text, key in keys.items() if key in by_key}
+
+    async def _set_cached(self, vectors: t.Dict[str, np.ndarray]) -> None:
+        """Store the vectors by key"""
+        entries = [
+            {"key": key, "model": self.model.value, "dimension": self.dimension, "vector": vector.astype(np.float32).tobytes()}
+            for key, vector in vectors.items()
+        ]
+        try:
+            for i in range(0, len(entries), CACHE_CHUNK_SIZE):
+                await self.repository.insert_many(entries[i:i + CACHE_CHUNK_SIZE])
+        except Exception as e:
+            logger.error(f"Error writing embedding cache: {e}")
@@ -1,61 +1,90 @@
 import typing as t
+import asyncio
+import time
 
-from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletion
-from google import genai
 from google.genai import types as genai_types
 
 from app.core.logging import logger
+from app.config.settings import config
 from app.types.llm import LLMModelType
 
 from app.static.llm import OpenAIModel, GeminiModel
-from app.models.llm import LLMResponse
+from app.models.llm import LLMResponse, LLMCallMetrics
+from app.service.core.llm_budget import get_llm_budget
+from app.service.core.llm_clients import get_openai_client, get_gemini_client, get_model_semaphore, get_fallback_models
+from app.service.core.metrics import record_llm_call
+from app.utils.text_utils import count_tokens
 
 
 
 class LLM(t.Generic[LLMModelType]):
     """
     A generic LLM client that supports different LLM models.
-    
+
     This class provides a unified interface for interacting with different LLM models.
     It uses type hints to ensure type safety when working with different model types.
-    
+
+    Instances are cheap: the provider clients are shared by the whole process (see `llm_clients`),
+    and every model is limited to its `max_concurrent_requests` in-flight requests. Every request,
+    including the fallback and hedged ones, then waits for the request/token budget of the
+    provider it is actually sent to (see `LLMBudget`).
+
+    When the model fails, the request is retried on the fallback models in order. With
+    `hedge_after_seconds` set, the next fallback model is also asked when the current one hasn't
+    answered after that time, and the first answer wins.
+
+    Every request to a provider is timed and its token usage recorded in the metrics sinks,
+    labelled by `call_site`.
+
     Usage:
         ```python
         # Initialize with OpenAI model
-        llm = LLM(OpenAIModel.GPT_4O)
-        
+        llm = LLM(OpenAIModel.GPT_4O, call_site="ask_question")
+
         # Make a chat completion request
         response = await llm.chat_completion([
             {"role": "system", "content": "You are a helpful assistant"},
             {"role": "user", "content": "Hello!"}
         ])
         ```
-        
+
     Args:
         model (LLMModelType): The LLM model to use for completions
-        
+        call_site (str): What the requests are for, used to label their metrics (e.g. "ask_question")
+        fallback_models (List[LLMModelType], optional): Models to use when `model` fails (Default: `LLM_FALLBACK_MODELS`)
+        hedge_after_seconds (float, optional): Seconds before hedging on the next model, 0 to disable (Default: `LLM_HEDGE_AFTER_SECONDS`)
+
     Raises:
         ValueError: If the model type is not supported
     """
-    def __init__(self, model: LLMModelType):
+    def __init__(
+        self,
+        model: LLMModelType,
+        call_site: str = "default",
+        fallback_models: t.Optional[t.List[LLMModelType]] = None,
+        hedge_after_seconds: t.Optional[float] = None
+    ):
         self.model = model
+        self.call_site = call_site
+        self.fallback_models = fallback_models if fallback_models is not None else get_fallback_models(model)
+        self.hedge_after_seconds = hedge_after_seconds if hedge_after_seconds is not None else config.LLM_HEDGE_AFTER_SECONDS
 
-        self.openai_client = None
-        self.gemini_client = None
-        
         self._validate_model()
         self.model._validate_env_var()
 
+    @property
+    def models(self) -> t.List[LLMModelType]:
+        """The model followed by its fallback models, in the order they are tried"""
+        return [self.model] + self.fallback_models
+
     def _validate_model(self) -> None:
         """
-        Validate the model type and initialize the clients.
+        Validate the model type.
         """
         match self.model:
-            case OpenAIModel.GPT_4O | OpenAIModel.GPT_4O_MINI:
-                self.openai_client = AsyncOpenAI()
-            case GeminiModel.GEMINI_1_5_PRO | GeminiModel.GEMINI_1_5_FLASH | GeminiModel.GEMINI_2_0_FLASH:
-                self.gemini_client = genai.Client()
+            case OpenAIModel() | GeminiModel():
+                pass
             case _:
                 logger.debug(f"Unsupported model: {self.model}")
                 raise ValueError(f"Unsupported model: {self.model}")
@@ -63,76 +92,314 @@ class LLM(t.Generic[LLMModelType]):
     async def chat_completion(self, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> LLMResponse:
         """
         Make a chat completion request to the appropriate LLM API based on the model type.
-        
+
+        The keyword arguments follow the OpenAI API. For Gemini models, the supported ones
+        (`temperature`, `max_tokens`, `response_format`) are translated and the others are ignored.
+
         Args:
             messages (List[Dict[str, Any]]): List of message dictionaries with 'role' and 'content' keys
             *args: Additional positional arguments to pass to the underlying API call
             **kwargs: Additional keyword arguments to pass to the underlying API call
-            
+
         Returns:
             LLMResponse: Dictionary containing the API response with at least a 'content' key
-            
+
+        Raises:
+            ValueError: If the model type is not supported
+            Exception: If every model failed, the error of the last one
+        """
+        async def call(model: LLMModelType) -> LLMResponse:
+            return await self._measured_chat_completion(model, messages, *args, **kwargs)
+
+        pending: t.Dict[asyncio.Task, LLMModelType] = {}
+        remaining = list(self.models)
+        last_error: t.Optional[BaseException] = None
+
+        def launch() -> None:
+            model = remaining.pop(0)
+            pending[asyncio.create_task(call(model))] = model
+
+        launch()
+        try:
+            while pending:
+                # Hedge only while a single request is in flight, and a model is left to hedge on
+                hedge = self.hedge_after_seconds > 0 and len(pending) == 1 and remaining
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_after_seconds if hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    logger.info(f"No answer from {next(iter(pending.values())).value} after {self.hedge_after_seconds}s, hedging on {remaining[0].value}")
+                    launch()
+                    continue
+
+                for task in done:
+                    model = pending.pop(task)
+                    if task.exception() is None:
+                        if model != self.model:
+                            logger.info(f"Answered by {model.value} instead of {self.model.value}")
+                        return task.result()
+
+                    last_error = task.exception()
+                    logger.warning(f"Chat completion with {model.value} failed: {last_error}")
+
+                if not pending and remaining:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise last_error
+
+    async def stream_chat_completion(self, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> t.AsyncIterator[str]:
+        """
+        Make a streaming chat completion request to the appropriate LLM API based on the model type.
+
+        The request falls back to the next model only if the current one fails before sending
+        anything. Streams aren't hedged.
+
+        Usage:
+            ```python
+            async for delta in llm.stream_chat_completion(messages):
+                print(delta, end="")
+            ```
+
+        Args:
+            messages (List[Dict[str, Any]]): List of message dictionaries with 'role' and 'content' keys
+            *args: Additional positional arguments to pass to the underlying API call
+            **kwargs: Additional keyword arguments to pass to the underlying API call
+
+        Yields:
+            str: The pieces of the response content, as soon as the API sends them
+
         Raises:
             ValueError: If the model type is not supported
             Exception: If there is an error in the API call
         """
-        match self.model:
-            case OpenAIModel.GPT_4O | OpenAIModel.GPT_4O_MINI:
-                return await self._openai_chat_completion(messages, *args, **kwargs)
-            case GeminiModel.GEMINI_1_5_PRO | GeminiModel.GEMINI_1_5_FLASH | GeminiModel.GEMINI_2_0_FLASH:
-                return await self._gemini_chat_completion(messages, *args, **kwargs)
+        models = self.models
+        for index, model in enumerate(models):
+            usage: t.Dict[str, int] = {}
+            outcome = "error"
+            started_at = time.perf_counter()
+            first_token_at: t.Optional[float] = None
+            try:
+                async with get_model_semaphore(model):
+                    await get_llm_budget(model).acquire(self._estimate_tokens(model, messages, kwargs))
+                    started_at = time.perf_counter()
+                    async for delta in self._stream_chat_completion(model, messages, usage, *args, **kwargs):
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                        yield delta
+                outcome = "success"
+                return
+            except (asyncio.CancelledError, GeneratorExit):
+                outcome = "cancelled"
+                raise
+            except Exception as e:
+                if first_token_at is not None or index == len(models) - 1:
+                    raise e
+                logger.warning(f"Streaming chat completion with {model.value} failed, falling back to {models[index + 1].value}: {e}")
+            finally:
+                record_llm_call(LLMCallMetrics(
+                    call_site=self.call_site,
+                    model=model.value,
+                    outcome=outcome,
+                    streamed=True,
+                    latency_seconds=time.perf_counter() - started_at,
+                    time_to_first_token_seconds=first_token_at - started_at if first_token_at is not None else None,
+                    **usage
+                ))
+
+    async def _measured_chat_completion(self, model: LLMModelType, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> LLMResponse:
+        """Make a chat completion request within the model's concurrency limit and provider budget, and record its metrics"""
+        response: t.Optional[LLMResponse] = None
+        outcome = "error"
+        queued_at = started_at = time.perf_counter()
+        try:
+            async with get_model_semaphore(model):
+                await get_llm_budget(model).acquire(self._estimate_tokens(model, messages, kwargs))
+                started_at = time.perf_counter()
+                response = await self._chat_completion(model, messages, *args, **kwargs)
+            response.model = model.value
+            response.wait_seconds = started_at - queued_at
+            response.latency_seconds = time.perf_counter() - started_at
+            outcome = "success"
+            return response
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            record_llm_call(LLMCallMetrics(
+                call_site=self.call_site,
+                model=model.value,
+                outcome=outcome,
+                latency_seconds=time.perf_counter() - started_at,
+                prompt_tokens=response.prompt_tokens if response else None,
+                completion_tokens=response.completion_tokens if response else None
+            ))
+
+    @staticmethod
+    def _estimate_tokens(model: LLMModelType, messages: t.List[t.Dict[str, t.Any]], kwargs: t.Dict[str, t.Any]) -> int:
+        """
+        Estimate the tokens a request will consume, to reserve them in the provider budget.
+        Without `max_tokens`, the response is assumed to be as large as the prompt.
+        """
+        prompt_tokens = sum(count_tokens(str(message.get("content") or ""), model.value) for message in messages)
+        return prompt_tokens + (kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") or prompt_tokens)
+
+    async def _chat_completion(self, model: LLMModelType, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> LLMResponse:
+        match model:
+            case OpenAIModel():
+                return await self._openai_chat_completion(model, messages, *args, **kwargs)
+            case GeminiModel():
+                return await self._gemini_chat_completion(model, messages, *args, **kwargs)
             case _:
-                logger.debug(f"Unsupported model: {self.model}")
-                raise ValueError(f"Unsupported model: {self.model}")
+                logger.debug(f"Unsupported model: {model}")
+                raise ValueError(f"Unsupported model: {model}")
+
+    def _stream_chat_completion(self, model: LLMModelType, messages: t.List[t.Dict[str, t.Any]], usage: t.Dict[str, int], *args, **kwargs) -> t.AsyncIterator[str]:
+        match model:
+            case OpenAIModel():
+                return self._openai_stream_chat_completion(model, messages, usage, *args, **kwargs)
+            case GeminiModel():
+                return self._gemini_stream_chat_completion(model, messages, usage, *args, **kwargs)
+            case _:
+                logger.debug(f"Unsupported model: {model}")
+                raise ValueError(f"Unsupported model: {model}")
 
-    async def _openai_chat_completion(self, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> LLMResponse:
+    async def _openai_chat_completion(self, model: OpenAIModel, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> LLMResponse:
         """
         Make a chat completion request to OpenAI API.
-        
+
         Args:
+            model: The OpenAI model to use
             messages: List of message dictionaries with 'role' and 'content' keys
             *args: Additional positional arguments
             **kwargs: Additional keyword arguments for the API call
-            
+
         Returns:
             LLMResponse: Dictionary containing the API response with at least a 'content' key
         """
         try:
-            logger.info("Making OpenAI API request")
-            response: ChatCompletion = await self.openai_client.chat.completions.create(
-                model=self.model.value,
+            logger.info(f"Making OpenAI API request ({model.value})")
+            response: ChatCompletion = await get_openai_client().chat.completions.create(
+                model=model.value,
                 messages=messages,
                 *args,
                 **kwargs
             )
-            
-            return LLMResponse(content=response.choices[0].message.content)
-            
+
+            return LLMResponse(
+                content=response.choices[0].message.content,
+                prompt_tokens=response.usage.prompt_tokens if response.usage else None,
+                completion_tokens=response.usage.completion_tokens if response.usage else None
+            )
+
         except Exception as e:
             logger.error(f"Error in OpenAI API call: {str(e)}")
             raise e
-        
-    async def _gemini_chat_completion(self, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> LLMResponse:
+
+    async def _openai_stream_chat_completion(self, model: OpenAIModel, messages: t.List[t.Dict[str, t.Any]], usage: t.Dict[str, int], *args, **kwargs) -> t.AsyncIterator[str]:
+        """
+        Make a streaming chat completion request to OpenAI API. The token usage is written to `usage` at the end.
+        """
+        try:
+            logger.info(f"Making OpenAI API streaming request ({model.value})")
+            kwargs.setdefault("stream_options", {"include_usage": True})
+            stream = await get_openai_client().chat.completions.create(
+                model=model.value,
+                messages=messages,
+                stream=True,
+                *args,
+                **kwargs
+            )
+
+            async for chunk in stream:
+                if chunk.usage:
+                    usage.update(prompt_tokens=chunk.usage.prompt_tokens, completion_tokens=chunk.usage.completion_tokens)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+        except Exception as e:
+            logger.error(f"Error in OpenAI API streaming call: {str(e)}")
+            raise e
+
+    @staticmethod
+    def _to_gemini_chat(messages: t.List[t.Dict[str, t.Any]], **kwargs) -> t.Tuple[t.List[genai_types.Content], str, genai_types.GenerateContentConfig]:
+        """
+        Convert OpenAI style messages and options to a Gemini chat history, user message and config.
+        """
+        system_instruction = "\n\n".join(message["content"] for message in messages if message["role"] == "system")
+        history = [
+            genai_types.Content(
+                role="model" if message["role"] == "assistant" else "user",
+                parts=[genai_types.Part(text=message["content"])]
+            )
+            for message in messages[:-1] if message["role"] != "system"
+        ]
+        response_format = kwargs.get("response_format") or {}
+
+        chat_config = genai_types.GenerateContentConfig(
+            system_instruction=system_instruction or None,
+            temperature=kwargs.get("temperature"),
+            max_output_tokens=kwargs.get("max_tokens"),
+            response_mime_type="application/json" if response_format.get("type") == "json_object" else None
+        )
+        return history, messages[-1]["content"], chat_config
+
+    async def _gemini_chat_completion(self, model: GeminiModel, messages: t.List[t.Dict[str, t.Any]], *args, **kwargs) -> LLMResponse:
         """
         Make a chat completion request to Gemini API.
         """
         try:
             # Convert messages to Gemini format
-            user_message = messages[-1]["content"]
-            gemini_messages = [genai_types.Content(parts=[genai_types.Part(text=message["content"])]) for message in messages[:-1]]
+            history, user_message, chat_config = self._to_gemini_chat(messages, **kwargs)
 
-            logger.info("Making Gemini API request")
-            chat = await self.gemini_client.aio.chats.create(
-                model=self.model.value,
-                history=gemini_messages,
-                *args,
-                **kwargs
+            logger.info(f"Making Gemini API request ({model.value})")
+            chat = get_gemini_client().aio.chats.create(
+                model=model.value,
+                history=history,
+                config=chat_config
             )
 
             response = await chat.send_message(user_message)
 
-            return LLMResponse(content=response.text)
-            
+            return LLMResponse(
+                content=response.text,
+                prompt_tokens=response.usage_metadata.prompt_token_count if response.usage_metadata else None,
+                completion_tokens=response.usage_metadata.candidates_token_count if response.usage_metadata else None
+            )
+
         except Exception as e:
             logger.error(f"Error in Gemini API call: {str(e)}")
             raise e
+
+    async def _gemini_stream_chat_completion(self, model: GeminiModel, messages: t.List[t.Dict[str, t.Any]], usage: t.Dict[str, int], *args, **kwargs) -> t.AsyncIterator[str]:
+        """
+        Make a streaming chat completion request to Gemini API. The token usage is written to `usage` at the end.
+        """
+        try:
+            # Convert messages to Gemini format
+            history, user_message, chat_config = self._to_gemini_chat(messages, **kwargs)
+
+            logger.info(f"Making Gemini API streaming request ({model.value})")
+            chat = get_gemini_client().aio.chats.create(
+                model=model.value,
+                history=history,
+                config=chat_config
+            )
+
+            async for chunk in await chat.send_message_stream(user_message):
+                if chunk.usage_metadata:
+                    usage.update(
+                        prompt_tokens=chunk.usage_metadata.prompt_token_count,
+                        completion_tokens=chunk.usage_metadata.candidates_token_count
+                    )
+                if chunk.text:
+                    yield chunk.text
+
+        except Exception as e:
+            logger.error(f"Error in Gemini API streaming call: {str(e)}")
+            raise e
@@ -0,0 +1,101 @@
+import typing as t
+import asyncio
+import time
+from collections import deque
+
+from app.core.logging import logger
+from app.types.llm import LLMModelType
+
+
+class LLMBudget:
+    """
+    Sliding one minute request/token budget for a single LLM provider.
+
+    `LLM` awaits `acquire` before sending every request, with the budget of the model
+    the request is actually sent to. Instead of failing when the provider limits are
+    reached, the call waits until enough of the window has expired for the request to fit.
+
+    Usage:
+        ```python
+        budget = get_llm_budget(OpenAIModel.GPT_4O)
+        waited = await budget.acquire(tokens=1200)
+        ```
+
+    Args:
+        name (str): Name of the provider (used for logging)
+        max_requests_per_minute (int): Maximum requests allowed in any 60 second window
+        max_tokens_per_minute (int): Maximum tokens allowed in any 60 second window
+    """
+    WINDOW_SECONDS = 60
+
+    def __init__(self, name: str, max_requests_per_minute: int, max_tokens_per_minute: int):
+        self.name = name
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_tokens_per_minute = max_tokens_per_minute
+
+        self._events: t.Deque[t.Tuple[float, int]] = deque()  # (timestamp, tokens)
+        self._tokens_in_window = 0
+        self._lock = asyncio.Lock()
+
+    def _expire(self, now: float) -> None:
+        """Drop the events which are out of the current window"""
+        while self._events and now - self._events[0][0] >= self.WINDOW_SECONDS:
+            _, tokens = self._events.popleft()
+            self._tokens_in_window -= tokens
+
+    def _fits(self, tokens: int) -> bool:
+        if len(self._events) >= self.max_requests_per_minute:
+            return False
+        # A single request larger than the whole token budget is let through on an empty window,
+        # otherwise it would wait forever.
+        return not self._events or self._tokens_in_window + tokens <= self.max_tokens_per_minute
+
+    async def acquire(self, tokens: int = 0) -> float:
+        """
+        Wait until a request of `tokens` tokens fits in the budget and reserve it.
+
+        Args:
+            tokens (int): Estimated number of tokens the request will consume
+
+        Returns:
+            float: Seconds spent waiting for the budget
+        """
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._expire(now)
+                if self._fits(tokens):
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    break
+
+                wait_time = self.WINDOW_SECONDS - (now - self._events[0][0])
+                logger.debug(f"LLM budget for {self.name} exhausted. Waiting {wait_time:.2f} seconds")
+                await asyncio.sleep(max(wait_time, 0.01))
+
+        return time.monotonic() - started
+
+
+_budgets: t.Dict[t.Type, LLMBudget] = {}
+
+
+def get_llm_budget(model: LLMModelType) -> LLMBudget:
+    """
+    Get the budget shared by every model of the same provider as `model`.
+
+    Args:
+        model (LLMModelType): The LLM model which is going to be called
+
+    Returns:
+        LLMBudget: The provider wide budget
+    """
+    provider = type(model)
+    if provider not in _budgets:
+        _budgets[provider] = LLMBudget(
+            name=provider.__name__,
+            max_requests_per_minute=model.max_requests_per_minute,
+            max_tokens_per_minute=model.max_tokens_per_minute
+        )
+        logger.info(f"Initialized LLM budget for {provider.__name__}")
+    return _budgets[provider]
@@ -0,0 +1,111 @@
+import typing as t
+import asyncio
+
+import httpx
+from openai import AsyncOpenAI
+from google import genai
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.static.llm import OpenAIModel, GeminiModel
+from app.types.llm import LLMModelType
+
+
+_openai_client: t.Optional[AsyncOpenAI] = None
+_gemini_client: t.Optional[genai.Client] = None
+_semaphores: t.Dict[t.Any, asyncio.Semaphore] = {}
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Get the process wide OpenAI client.
+
+    Its connections are pooled and kept alive across all the `LLM` instances.
+    """
+    global _openai_client
+    if _openai_client is None:
+        _openai_client = AsyncOpenAI(
+            timeout=config.LLM_TIMEOUT_SECONDS,
+            http_client=httpx.AsyncClient(
+                timeout=httpx.Timeout(config.LLM_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=config.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=config.HTTP_KEEPALIVE_EXPIRY_SECONDS
+                )
+            )
+        )
+        logger.info("Initialized OpenAI client")
+    return _openai_client
+
+
+def get_gemini_client() -> genai.Client:
+    """
+    Get the process wide Gemini client.
+
+    Its connections are pooled and kept alive across all the `LLM` instances.
+    """
+    global _gemini_client
+    if _gemini_client is None:
+        _gemini_client = genai.Client()
+        logger.info("Initialized Gemini client")
+    return _gemini_client
+
+
+def get_model_semaphore(model: LLMModelType) -> asyncio.Semaphore:
+    """
+    Get the semaphore limiting the in-flight requests of a model to its `max_concurrent_requests`.
+
+    Args:
+        model (LLMModelType): The LLM model which is going to be called
+
+    Returns:
+        asyncio.Semaphore: The process wide semaphore of the model
+    """
+    if model not in _semaphores:
+        _semaphores[model] = asyncio.Semaphore(model.max_concurrent_requests)
+        logger.info(f"Initialized concurrency limit of {model.max_concurrent_requests} requests for {model.value}")
+    return _semaphores[model]
+
+
+def get_llm_model(name: str) -> LLMModelType:
+    """
+    Get the model of any provider by its name (e.g. "gpt-4o", "gemini-2.0-flash").
+
+    Raises:
+        ValueError: If no provider has a model with this name
+    """
+    for provider in (OpenAIModel, GeminiModel):
+        try:
+            return provider(name)
+        except ValueError:
+            continue
+    raise ValueError(f"Unsupported model: {name}")
+
+
+def get_fallback_models(model: LLMModelType) -> t.List[LLMModelType]:
+    """
+    Get the configured `LLM_FALLBACK_MODELS` to use when `model` fails, leaving out `model` itself,
+    unknown models and models whose API key isn't set.
+    """
+    fallback_models = []
+    for name in config.LLM_FALLBACK_MODELS:
+        try:
+            fallback_model = get_llm_model(name)
+            fallback_model._validate_env_var()
+        except ValueError as e:
+            logger.warning(f"Ignoring fallback model {name}: {e}")
+            continue
+        if fallback_model != model and fallback_model not in fallback_models:
+            fallback_models.append(fallback_model)
+    return fallback_models
+
+
+async def close_llm_clients() -> None:
+    """Close the shared LLM clients"""
+    global _openai_client, _gemini_client
+    if _openai_client is not None:
+        await _openai_client.close()
+        _openai_client = None
+    _gemini_client = None
+    logger.info("Closed LLM clients")
@@ -0,0 +1,148 @@
+import typing as t
+import json
+from abc import ABC, abstractmethod
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.models.llm import LLMCacheMetrics, LLMCallMetrics
+
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+TOKEN_BUCKETS = (50, 100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+
+class BaseMetricsSink(ABC):
+    """
+    Abstract destination of the application metrics.
+    """
+
+    @abstractmethod
+    def record_llm_call(self, metrics: LLMCallMetrics) -> None:
+        """
+        Record the metrics of a single request to an LLM provider.
+        """
+        pass
+
+    def record_llm_cache_lookup(self, metrics: LLMCacheMetrics) -> None:
+        """
+        Record the metrics of a lookup in a cache of LLM results. Ignored unless overridden.
+        """
+        pass
+
+
+class LogMetricsSink(BaseMetricsSink):
+    """
+    Writes every metric as a single line JSON log entry, e.g.
+    `{"event": "llm_call", "call_site": "ask_question", "model": "gpt-4o", ...}`
+    """
+
+    def record_llm_call(self, metrics: LLMCallMetrics) -> None:
+        logger.info(json.dumps({"event": "llm_call", **metrics.model_dump()}))
+
+    def record_llm_cache_lookup(self, metrics: LLMCacheMetrics) -> None:
+        logger.info(json.dumps({"event": "llm_cache_lookup", **metrics.model_dump()}))
+
+
+class PrometheusMetricsSink(BaseMetricsSink):
+    """
+    Aggregates the metrics in the process wide Prometheus registry, exposed by `GET /metrics`.
+    Every metric is labelled by call site (or cache) and model.
+    """
+
+    def __init__(self):
+        labels = ["call_site", "model"]
+        self.requests = Counter("llm_requests", "LLM requests by outcome", labels + ["outcome"])
+        self.latency = Histogram("llm_request_duration_seconds", "Duration of the LLM requests", labels + ["outcome"], buckets=LATENCY_BUCKETS)
+        self.time_to_first_token = Histogram("llm_time_to_first_token_seconds", "Time to the first token of the streamed LLM requests", labels, buckets=LATENCY_BUCKETS)
+        self.prompt_tokens = Histogram("llm_prompt_tokens", "Prompt tokens of the LLM requests", labels, buckets=TOKEN_BUCKETS)
+        self.completion_tokens = Histogram("llm_completion_tokens", "Completion tokens of the LLM requests", labels, buckets=TOKEN_BUCKETS)
+        self.tokens = Counter("llm_tokens", "Tokens consumed by the LLM requests", labels + ["type"])
+        self.cache_lookups = Counter("llm_cache_lookups", "Items looked up in the LLM result caches by result", ["cache", "model", "result"])
+        self.cache_tokens_saved = Counter("llm_cache_tokens_saved", "Estimated prompt tokens saved by the LLM result caches", ["cache", "model"])
+
+    def record_llm_call(self, metrics: LLMCallMetrics) -> None:
+        labels = {"call_site": metrics.call_site, "model": metrics.model}
+        self.requests.labels(**labels, outcome=metrics.outcome).inc()
+        self.latency.labels(**labels, outcome=metrics.outcome).observe(metrics.latency_seconds)
+
+        if metrics.time_to_first_token_seconds is not None:
+            self.time_to_first_token.labels(**labels).observe(metrics.time_to_first_token_seconds)
+        if metrics.prompt_tokens is not None:
+            self.prompt_tokens.labels(**labels).observe(metrics.prompt_tokens)
+            self.tokens.labels(**labels, type="prompt").inc(metrics.prompt_tokens)
+        if metrics.completion_tokens is not None:
+            self.completion_tokens.labels(**labels).observe(metrics.completion_tokens)
+            self.tokens.labels(**labels, type="completion").inc(metrics.completion_tokens)
+
+    def record_llm_cache_lookup(self, metrics: LLMCacheMetrics) -> None:
+        labels = {"cache": metrics.cache, "model": metrics.model}
+        self.cache_lookups.labels(**labels, result="hit").inc(metrics.hits)
+        self.cache_lookups.labels(**labels, result="miss").inc(metrics.misses)
+        self.cache_tokens_saved.labels(**labels).inc(metrics.tokens_saved)
+
+
+METRICS_SINKS: t.Dict[str, t.Type[BaseMetricsSink]] = {
+    "log": LogMetricsSink,
+    "prometheus": PrometheusMetricsSink,
+}
+
+_sinks: t.Optional[t.List[BaseMetricsSink]] = None
+
+
+def get_metrics_sinks() -> t.List[BaseMetricsSink]:
+    """
+    Get the metrics sinks enabled by `METRICS_SINKS`.
+    """
+    global _sinks
+    if _sinks is None:
+        _sinks = []
+        for name in config.METRICS_SINKS:
+            if name not in METRICS_SINKS:
+                logger.warning(f"Ignoring unknown metrics sink: {name}")
+                continue
+            _sinks.append(METRICS_SINKS[name]())
+        logger.info(f"Initialized metrics sinks: {', '.join(config.METRICS_SINKS) or 'none'}")
+    return _sinks
+
+
+def register_metrics_sink(sink: BaseMetricsSink) -> None:
+    """
+    Send the metrics to an additional sink.
+    """
+    get_metrics_sinks().append(sink)
+
+
+def record_llm_call(metrics: LLMCallMetrics) -> None:
+    """
+    Record the metrics of a single request to an LLM provider in every sink.
+    A failing sink never fails the request.
+    """
+    for sink in get_metrics_sinks():
+        try:
+            sink.record_llm_call(metrics)
+        except Exception as e:
+            logger.error(f"Error recording LLM call metrics in {type(sink).__name__}: {e}")
+
+
+def record_llm_cache_lookup(metrics: LLMCacheMetrics) -> None:
+    """
+    Record the metrics of a lookup in a cache of LLM results in every sink.
+    A failing sink never fails the lookup.
+    """
+    for sink in get_metrics_sinks():
+        try:
+            sink.record_llm_cache_lookup(metrics)
+        except Exception as e:
+            logger.error(f"Error recording LLM cache metrics in {type(sink).__name__}: {e}")
+
+
+def export_prometheus_metrics() -> t.Tuple[bytes, str]:
+    """
+    Render the Prometheus registry in the text exposition format.
+
+    Returns:
+        Tuple[bytes, str]: The metrics and their content type
+    """
+    return generate_latest(), CONTENT_TYPE_LATEST
@@ -8,7 +8,7 @@ class BaseNotificationService(ABC):
     """
 
     @abstractmethod
-    def send_notification(self, message: str) -> None:
+    async def send_notification(self, message: str) -> None:
         """
         Send a notification
         """
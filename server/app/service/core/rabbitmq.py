@@ -1,20 +1,22 @@
 import json
 import asyncio
-from typing import Any, Callable, Optional
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, List, Optional
 
-from aio_pika import connect_robust, Message, Exchange, Channel, Connection
+from aio_pika import connect_robust, Message, Exchange, Channel, Connection, DeliveryMode
 from aio_pika.pool import Pool
 
 from app.core.logging import logger
-from app.models.rabbitmq import RabbitMQConfig, RabbitMQMessage
+from app.config.settings import config as app_config
+from app.models.rabbitmq import RabbitMQConfig, RabbitMQMessage, RabbitMQPoolStats
 
 
 class RabbitMQService:
     """RabbitMQ service for handling message queue operations.
 
     This service provides a robust interface for interacting with RabbitMQ, including:
-    - Connection pooling for efficient resource management
-    - Channel pooling for concurrent operations
+    - A single robust connection, shared by all the channels
+    - Channel pooling for concurrent operations (a channel is held for the whole publish/consume)
     - Exchange declaration and management
     - Message publishing and consumption
 
@@ -45,29 +47,66 @@ class RabbitMQService:
     def __init__(self, config: Optional[RabbitMQConfig] = None):
         """Initialize RabbitMQ service"""
         self.config = config or RabbitMQConfig()
-        self.connection_pool: Optional[Pool[Connection]] = None
+        self.connection: Optional[Connection] = None
         self.channel_pool: Optional[Pool[Channel]] = None
-        self.exchange: Optional[Exchange] = None
+        self._connection_lock = asyncio.Lock()
+        self._exchange_declared = False
+
+        # Pool utilization
+        self._channels_created = 0
+        self._channels_in_use = 0
+        self._channels_waiting = 0
 
     async def _get_connection(self) -> Connection:
-        """Get a connection from the pool"""
-        if not self.connection_pool:
-            self.connection_pool = Pool(
-                self._create_connection,
-                max_size=5
-            )
-        async with self.connection_pool.acquire() as connection:
-            return connection
+        """Get the robust connection shared by all the channels, opening it on first use"""
+        async with self._connection_lock:
+            if self.connection is None or self.connection.is_closed:
+                self.connection = await self._create_connection()
+                logger.info("Opened RabbitMQ connection")
+        return self.connection
+
+    @asynccontextmanager
+    async def acquire_channel(self) -> AsyncIterator[Channel]:
+        """
+        Hold a channel of the pool for the duration of the block.
 
-    async def _get_channel(self) -> Channel:
-        """Get a channel from the pool"""
+        Example:
+            async with rabbitmq.acquire_channel() as channel:
+                await channel.declare_queue("queue_name", durable=True)
+        """
         if not self.channel_pool:
             self.channel_pool = Pool(
                 self._create_channel,
-                max_size=5
+                max_size=self.config.channel_pool_size
             )
-        async with self.channel_pool.acquire() as channel:
-            return channel
+
+        self._channels_waiting += 1
+        acquired = False
+        try:
+            async with self.channel_pool.acquire() as channel:
+                self._channels_waiting -= 1
+                acquired = True
+                self._channels_in_use += 1
+                try:
+                    if channel.is_closed:
+                        await channel.reopen()
+                    yield channel
+                finally:
+                    self._channels_in_use -= 1
+        finally:
+            if not acquired:
+                self._channels_waiting -= 1
+
+    @property
+    def pool_stats(self) -> RabbitMQPoolStats:
+        """Utilization of the channel pool"""
+        return RabbitMQPoolStats(
+            connection_open=self.connection is not None and not self.connection.is_closed,
+            max_channels=self.config.channel_pool_size,
+            channels_created=self._channels_created,
+            channels_in_use=self._channels_in_use,
+            channels_waiting=self._channels_waiting
+        )
 
     async def _create_connection(self) -> Connection:
         """Create a new RabbitMQ connection"""
@@ -80,20 +119,23 @@ class RabbitMQService:
         )
 
     async def _create_channel(self) -> Channel:
-        """Create a new channel"""
+        """Create a new channel with publisher confirms enabled"""
         connection = await self._get_connection()
-        return await connection.channel()
+        channel = await connection.channel(publisher_confirms=True)
+        self._channels_created += 1
+        return channel
 
-    async def _get_exchange(self) -> Exchange:
-        """Get or create the exchange"""
-        if not self.exchange:
-            channel = await self._get_channel()
-            self.exchange = await channel.declare_exchange(
+    async def _get_exchange(self, channel: Channel) -> Exchange:
+        """Get the exchange on the given channel, declaring it on first use"""
+        if not self._exchange_declared:
+            exchange = await channel.declare_exchange(
                 self.config.exchange_name,
                 self.config.exchange_type,
                 durable=True
             )
-        return self.exchange
+            self._exchange_declared = True
+            return exchange
+        return await channel.get_exchange(self.config.exchange_name, ensure=False)
 
     async def publish(self, message: RabbitMQMessage) -> None:
         """
@@ -114,19 +156,61 @@ class RabbitMQService:
             await rabbitmq.publish(message)
         """
         try:
-            exchange = await self._get_exchange()
-            await exchange.publish(
-                Message(
-                    body=json.dumps(message.body).encode(),
-                    headers=message.headers or {}
-                ),
-                routing_key=message.routing_key
-            )
+            async with self.acquire_channel() as channel:
+                exchange = await self._get_exchange(channel)
+                await exchange.publish(self._build_message(message), routing_key=message.routing_key)
             logger.debug(f"Published message: {message.body}")
         except Exception as e:
             logger.error(f"Error publishing message: {str(e)}")
             raise
 
+    async def publish_many(self, messages: List[RabbitMQMessage]) -> List[RabbitMQMessage]:
+        """
+        Publish many messages to the RabbitMQ exchange in one pass.
+
+        Messages of a batch are published without waiting for each other, then their publisher
+        confirms are awaited together. At most `RABBITMQ_PUBLISH_BATCH_SIZE` messages are in flight.
+
+        Args:
+            messages (List[RabbitMQMessage]): Messages to publish
+
+        Returns:
+            List[RabbitMQMessage]: Messages the broker did not confirm (empty when all were published)
+
+        Example:
+            failed = await rabbitmq.publish_many([
+                RabbitMQMessage(body={"user_id": user_id}, routing_key="user.events")
+                for user_id in user_ids
+            ])
+        """
+        batch_size = app_config.RABBITMQ_PUBLISH_BATCH_SIZE
+        failed: List[RabbitMQMessage] = []
+
+        async with self.acquire_channel() as channel:
+            exchange = await self._get_exchange(channel)
+            for start in range(0, len(messages), batch_size):
+                batch = messages[start:start + batch_size]
+                results = await asyncio.gather(
+                    *(exchange.publish(self._build_message(message), routing_key=message.routing_key) for message in batch),
+                    return_exceptions=True
+                )
+                for message, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        logger.error(f"Error publishing message to {message.routing_key}: {str(result)}")
+                        failed.append(message)
+
+        logger.debug(f"Published {len(messages) - len(failed)}/{len(messages)} messages")
+        return failed
+
+    @staticmethod
+    def _build_message(message: RabbitMQMessage) -> Message:
+        """Build the persistent AMQP message of a RabbitMQMessage"""
+        return Message(
+            body=json.dumps(message.body).encode(),
+            headers=message.headers or {},
+            delivery_mode=DeliveryMode.PERSISTENT
+        )
+
     async def consume(self, queue_name: str, callback: Callable[[Any], None]) -> None:
         """
         Consume messages from a RabbitMQ queue and process them with callback.
@@ -147,24 +231,24 @@ class RabbitMQService:
             - Exceptions in callback will be logged and re-raised
         """
         try:
-            channel = await self._get_channel()
-            exchange = await self._get_exchange()
-
-            # Declare queue
-            queue = await channel.declare_queue(queue_name, durable=True)
-            await queue.bind(exchange, queue_name)
-
-            logger.info(f"Started consuming from queue: {queue_name}")
-
-            async with queue.iterator() as queue_iter:
-                async for message in queue_iter:
-                    async with message.process():
-                        try:
-                            body = json.loads(message.body.decode())
-                            await callback(body)
-                        except Exception as e:
-                            logger.error(f"Error processing message: {str(e)}")
-                            raise
+            async with self.acquire_channel() as channel:
+                exchange = await self._get_exchange(channel)
+
+                # Declare queue
+                queue = await channel.declare_queue(queue_name, durable=True)
+                await queue.bind(exchange, queue_name)
+
+                logger.info(f"Started consuming from queue: {queue_name}")
+
+                async with queue.iterator() as queue_iter:
+                    async for message in queue_iter:
+                        async with message.process():
+                            try:
+                                body = json.loads(message.body.decode())
+                                await callback(body)
+                            except Exception as e:
+                                logger.error(f"Error processing message: {str(e)}")
+                                raise
         except Exception as e:
             logger.error(f"Error consuming messages: {str(e)}")
             raise
@@ -174,8 +258,12 @@ class RabbitMQService:
         try:
             if self.channel_pool:
                 await self.channel_pool.close()
-            if self.connection_pool:
-                await self.connection_pool.close()
+                self.channel_pool = None
+            if self.connection:
+                await self.connection.close()
+                self.connection = None
+            self._exchange_declared = False
+            self._channels_created = 0
             logger.info("Closed all RabbitMQ connections")
         except Exception as e:
             logger.error(f"Error closing connections: {str(e)}")
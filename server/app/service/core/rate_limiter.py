@@ -0,0 +1,184 @@
+import typing as t
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from app.core.logging import logger
+from app.config.settings import config
+
+
+class BaseTokenBucket(ABC):
+    """
+    Abstract token bucket, refilled continuously at `rate` tokens per second up to `capacity`.
+
+    Callers wait for a token instead of failing when the bucket is empty, so bursts are smoothed
+    out to the configured rate.
+
+    Args:
+        key (str): Key of the bucket (e.g. "superteam_bounty_listing@earn.superteam.fun")
+        rate (float): Tokens added per second
+        capacity (float): Maximum number of tokens, i.e. the allowed burst
+    """
+
+    def __init__(self, key: str, rate: float, capacity: float):
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity
+
+    @abstractmethod
+    def try_acquire(self, tokens: float = 1) -> float:
+        """
+        Take `tokens` tokens from the bucket if they are available.
+
+        Returns:
+            float: 0 if the tokens were taken, otherwise the seconds to wait before they are available
+        """
+        pass
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Block until `tokens` tokens are taken from the bucket.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        started = time.monotonic()
+        while (wait_time := self.try_acquire(tokens)) > 0:
+            logger.debug(f"Rate limit reached for {self.key}. Waiting {wait_time:.2f} seconds")
+            time.sleep(wait_time)
+        return time.monotonic() - started
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """
+        Wait without blocking the event loop until `tokens` tokens are taken from the bucket.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        started = time.monotonic()
+        while (wait_time := await self._try_acquire_async(tokens)) > 0:
+            logger.debug(f"Rate limit reached for {self.key}. Waiting {wait_time:.2f} seconds")
+            await asyncio.sleep(wait_time)
+        return time.monotonic() - started
+
+    async def _try_acquire_async(self, tokens: float) -> float:
+        return self.try_acquire(tokens)
+
+    def _refill(self, tokens: float, updated_at: float, now: float) -> float:
+        return min(self.capacity, tokens + (now - updated_at) * self.rate)
+
+    def _wait_time(self, available: float, tokens: float) -> float:
+        # A request larger than the whole bucket only has to wait for a full bucket
+        return (min(tokens, self.capacity) - available) / self.rate
+
+
+class LocalTokenBucket(BaseTokenBucket):
+    """
+    Token bucket kept in memory, shared by everything in the current process.
+    """
+
+    def __init__(self, key: str, rate: float, capacity: float):
+        super().__init__(key, rate, capacity)
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = self._refill(self._tokens, self._updated_at, now)
+            self._updated_at = now
+
+            if self._tokens >= min(tokens, self.capacity):
+                self._tokens -= tokens
+                return 0
+            return self._wait_time(self._tokens, tokens)
+
+
+class SQLiteTokenBucket(BaseTokenBucket):
+    """
+    Token bucket stored in a local SQLite database, shared by every process using the same file.
+
+    Each acquisition is a short `BEGIN IMMEDIATE` transaction, so concurrent processes never
+    take the same tokens. It may wait for the database lock, so `acquire_async` runs it in a
+    worker thread rather than on the event loop.
+
+    Args:
+        path (str): Path of the SQLite database
+    """
+
+    def __init__(self, key: str, rate: float, capacity: float, path: str):
+        super().__init__(key, rate, capacity)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=10, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS token_buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def try_acquire(self, tokens: float = 1) -> float:
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                now = time.time()  # Wall clock, since the state is shared between processes
+                row = cursor.execute("SELECT tokens, updated_at FROM token_buckets WHERE key = ?", (self.key,)).fetchone()
+                available = self._refill(*row, now) if row else self.capacity
+
+                wait_time = 0.0
+                if available >= min(tokens, self.capacity):
+                    available -= tokens
+                else:
+                    wait_time = self._wait_time(available, tokens)
+
+                cursor.execute(
+                    "INSERT INTO token_buckets (key, tokens, updated_at) VALUES (?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at",
+                    (self.key, available, now)
+                )
+                cursor.execute("COMMIT")
+                return wait_time
+            except Exception:
+                cursor.execute("ROLLBACK")
+                raise
+
+    async def _try_acquire_async(self, tokens: float) -> float:
+        return await asyncio.to_thread(self.try_acquire, tokens)
+
+
+_buckets: t.Dict[str, BaseTokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, max_requests_per_minute: int, burst: t.Optional[int] = None) -> BaseTokenBucket:
+    """
+    Get the token bucket shared by every caller using the same key.
+
+    The backend is chosen by `RATE_LIMITER_BACKEND`: "memory" shares the bucket within the process,
+    "sqlite" shares it with every process using the `RATE_LIMITER_SQLITE_PATH` database.
+    The limits of the first caller of a key are used.
+
+    Args:
+        key (str): Key of the bucket, usually "<service name>@<host>"
+        max_requests_per_minute (int): Sustained number of requests allowed per minute
+        burst (Optional[int]): Maximum number of requests allowed at once (Default: max_requests_per_minute)
+
+    Returns:
+        BaseTokenBucket: The shared bucket
+    """
+    with _buckets_lock:
+        if key not in _buckets:
+            rate = max_requests_per_minute / 60
+            capacity = burst or max_requests_per_minute
+
+            if config.RATE_LIMITER_BACKEND == "sqlite":
+                os.makedirs(os.path.dirname(os.path.abspath(config.RATE_LIMITER_SQLITE_PATH)), exist_ok=True)
+                _buckets[key] = SQLiteTokenBucket(key, rate, capacity, config.RATE_LIMITER_SQLITE_PATH)
+            else:
+                _buckets[key] = LocalTokenBucket(key, rate, capacity)
+            logger.info(f"Initialized {config.RATE_LIMITER_BACKEND} rate limiter for {key} ({max_requests_per_minute} requests/minute)")
+        return _buckets[key]
@@ -12,7 +12,7 @@ class BaseResourceHub(ABC):
     """
     
     @abstractmethod
-    def fetch(self) -> t.List[t.Dict]:
+    async def fetch(self) -> t.List[t.Dict]:
         """
         Fetch opportunities from the platform
         
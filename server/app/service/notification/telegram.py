@@ -1,8 +1,9 @@
 import typing as t
+import asyncio
 
 from app.core.logging import logger
 
-from app.service.core.api import APIService
+from app.service.core.api import AsyncAPIService
 from app.service.core.notification import BaseNotificationService
 from app.service.notification.routes import TelegramAPIRoutes
 
@@ -14,28 +15,35 @@ class TelegramNotificationService(BaseNotificationService):
 
     def __init__(self, username: str):
         self.username = username
-        self.api = APIService[TelegramAPIRoutes](
+        self.api = AsyncAPIService[TelegramAPIRoutes](
             service_name="telegram",
             base_url=TelegramAPIRoutes.BASE
         )
-        
-        self.chat_id = self._get_chat_id_from_username(username)
+        self.chat_id: t.Optional[int] = None
+
+    async def initialize(self) -> None:
+        """
+        Resolve the chat ID of the user. Must be awaited before sending notifications.
+        """
+        self.chat_id = await self._get_chat_id_from_username(self.username)
         if self.chat_id is None:
-            logger.error(f"Chat ID not found for username: {username}. Might be the user has not started the bot yet.")
-            raise ValueError(f"Chat ID not found for username: {username}. Might be the user has not started the bot yet.")
+            logger.error(f"Chat ID not found for username: {self.username}. Might be the user has not started the bot yet.")
+            raise ValueError(f"Chat ID not found for username: {self.username}. Might be the user has not started the bot yet.")
 
-    def send_notification(self, message: str) -> None:
-        self.api.post(TelegramAPIRoutes.SEND_MESSAGE, data={"chat_id": self.chat_id, "text": message, "parse_mode": "Markdown"})
+    async def send_notification(self, message: str) -> None:
+        if self.chat_id is None:
+            await self.initialize()
+        await self.api.post(TelegramAPIRoutes.SEND_MESSAGE, data={"chat_id": self.chat_id, "text": message, "parse_mode": "Markdown"})
         logger.info(f"Sent notification to {self.username}: {message}")
 
-    def get_updates(self) -> t.List[t.Dict]:
-        return self.api.get(TelegramAPIRoutes.GET_UPDATES)
+    async def get_updates(self) -> t.List[t.Dict]:
+        return await self.api.get(TelegramAPIRoutes.GET_UPDATES)
 
-    def get_me(self) -> t.Dict:
-        return self.api.get(TelegramAPIRoutes.GET_ME)
+    async def get_me(self) -> t.Dict:
+        return await self.api.get(TelegramAPIRoutes.GET_ME)
     
-    def _get_chat_id_from_username(self, username: str) -> t.Optional[int]:
-        response = self.get_updates()
+    async def _get_chat_id_from_username(self, username: str) -> t.Optional[int]:
+        response = await self.get_updates()
         messages = response["result"]
         for message in messages:
             if message["message"]["from"]["username"] == username:
@@ -45,10 +53,11 @@ class TelegramNotificationService(BaseNotificationService):
 
 
 if __name__ == "__main__":
-    def main():
+    async def main():
         notification_service = TelegramNotificationService(username="thatsmeadarsh")
-        notification_service.send_notification("Hello world! *bold* _italic_ [link](https://www.google.com)")
+        await notification_service.initialize()
+        await notification_service.send_notification("Hello world! *bold* _italic_ [link](https://www.google.com)")
 
-    main()
+    asyncio.run(main())
 
 
@@ -1,6 +1,7 @@
 import typing as t
 import asyncio
 
+from app.core.logging import logger
 from app.models.repository.opportunity import OpportunityOrm
 from app.models.opportunity import Opportunity as OpportunitySchema
 from app.models.core.pageable import PageRequestSchema, PageResponseSchema
@@ -26,35 +27,78 @@ class OpportunityService:
             OpportunitySchema: The saved opportunity.
         """
         await self.opportunity_repository.save(opportunity.to_orm())
+
+    async def save_many(self, opportunities: t.List[OpportunitySchema]) -> t.List[OpportunitySchema]:
+        """
+        Save a batch of opportunities to the database in a single transaction.
+        Opportunities which already exist (same platform name and platform ID) are skipped.
+        So are the ones without a platform ID: NULLs never conflict, so they would be saved, and
+        their users notified, again on every run.
+
+        Args:
+            opportunities (List[OpportunitySchema]): The opportunities to save.
+
+        Returns:
+            List[OpportunitySchema]: Only the opportunities which were newly saved.
+        """
+        identified = [opportunity for opportunity in opportunities if opportunity.platform_id is not None]
+        if len(identified) != len(opportunities):
+            logger.warning(f"Skipping {len(opportunities) - len(identified)} opportunities without a platform ID")
+
+        saved = await self.opportunity_repository.save_many(
+            [opportunity.to_orm() for opportunity in identified],
+            conflict_columns=["platform_name", "platform_id"]
+        )
+        return [self._to_schema(opportunity) for opportunity in saved]
+
+    async def get_opportunity_ids(self) -> t.List[int]:
+        """
+        Get the IDs of all the saved opportunities.
+        """
+        return await self.opportunity_repository.get_ids()
+
+    async def get_opportunities_by_ids(self, ids: t.List[int]) -> t.List[OpportunitySchema]:
+        """
+        Get opportunities by their IDs, in a single query.
+
+        Args:
+            ids (List[int]): The IDs of the opportunities
+
+        Returns:
+            List[OpportunitySchema]: The opportunities which exist, in the order of `ids`
+        """
+        if not ids:
+            return []
+
+        opportunities = {opportunity.id: opportunity for opportunity in await self.opportunity_repository.get_by_ids(ids)}
+        return [self._to_schema(opportunities[id]) for id in ids if id in opportunities]
+
+    @staticmethod
+    def _to_schema(opportunity: OpportunityOrm) -> OpportunitySchema:
+        """
+        Convert an opportunity ORM instance into its schema.
+        """
+        return OpportunitySchema(
+            id=opportunity.id,
+            title=opportunity.title,
+            description=opportunity.description,
+            platform_name=opportunity.platform_name,
+            deadline=opportunity.deadline,
+            key_skills=[skill.strip() for skill in opportunity.key_skills.split(",")] if opportunity.key_skills else [],
+            opportunity_type=opportunity.opportunity_type,
+            location=opportunity.location,
+            compensation=opportunity.compensation,
+            know_more_link=opportunity.know_more_link,
+            platform_id=opportunity.platform_id,
+            created_at=opportunity.created_at,
+            updated_at=opportunity.updated_at
+        )
     
     async def get_paged_opportunities(self, pageable: PageRequestSchema) -> PageResponseSchema[OpportunitySchema]:
         """
         Get a paginated list of opportunities.
         """
         opportunities, total_count = await self.opportunity_repository.get_paged_items(pageable, {})
-        opportunities_schema_list = []
-        for opportunity in opportunities:
-            schema = OpportunitySchema(
-                id=opportunity.id,
-                title=opportunity.title,
-                description=opportunity.description,
-                platform_name=opportunity.platform_name,
-                deadline=opportunity.deadline,
-                key_skills=opportunity.key_skills.split(","),
-                opportunity_type=opportunity.opportunity_type,
-                location=opportunity.location,
-                compensation=opportunity.compensation,
-                know_more_link=opportunity.know_more_link,
-                platform_id=opportunity.platform_id,
-                created_at=opportunity.created_at,
-                updated_at=opportunity.updated_at
-            )
-            opportunities_schema_list.append(schema)
-
-        total_pages = (total_count + pageable.size - 1) // pageable.size
-        return PageResponseSchema[OpportunitySchema](
-            data=opportunities_schema_list,
-            total_count=total_count,
-            page_size=pageable.size,
-            total_pages=total_pages
-        )
\ No newline at end of file
+        opportunities_schema_list = [self._to_schema(opportunity) for opportunity in opportunities]
+
+        return PageResponseSchema[OpportunitySchema].from_page(opportunities_schema_list, total_count, pageable)
\ No newline at end of file
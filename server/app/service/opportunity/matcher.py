@@ -1,7 +1,11 @@
 import typing as t
 
 from app.core.logging import logger
-from app.service.contract.get_data import SmartContractAPI
+from app.config.settings import config
+from app.service.opportunity.scoring import UserScoringIndex, user_scoring_index
+from app.service.opportunity.skill_index import SkillIndex, skill_index
+from app.service.opportunity.user_embedding_index import UserEmbeddingIndex, user_embedding_index
+from app.service.opportunity.vector_index import OpportunityVectorIndex, opportunity_vector_index
 from app.static.key_skills import AVAILABLE_KEY_SKILLS
 from app.types.contract import UserProfile
 from app.models.opportunity import Opportunity
@@ -9,26 +13,78 @@ from app.models.opportunity import Opportunity
 
 class OpportunityMatcher:
     """
-    Service for matching opportunities with capable users based on skills
+    Service for matching opportunities with capable users, either on their key skills, on the
+    similarity of their profile with the opportunity, or on weighted criteria scored for a whole
+    batch of opportunities at once (see `OPPORTUNITY_MATCHING_MODE`)
     """
-    
-    def __init__(self):
-        self.smart_contract_api = SmartContractAPI()
-        logger.info("Initialized OpportunityMatcher")
 
-    def match_opportunity_with_users(self, opportunity: Opportunity) -> t.List[UserProfile]:
+    def __init__(
+        self,
+        index: SkillIndex = skill_index,
+        user_index: UserEmbeddingIndex = user_embedding_index,
+        opportunity_index: OpportunityVectorIndex = opportunity_vector_index,
+        scoring_index: UserScoringIndex = user_scoring_index,
+        mode: str = config.OPPORTUNITY_MATCHING_MODE
+    ):
+        if mode not in ("skills", "embedding", "scoring"):
+            raise ValueError(f"Unsupported opportunity matching mode: {mode}")
+
+        self.skill_index = index
+        self.user_index = user_index
+        self.opportunity_index = opportunity_index
+        self.scoring_index = scoring_index
+        self.mode = mode
+        logger.info(f"Initialized OpportunityMatcher ({mode} mode)")
+
+    async def match_opportunity_with_users(self, opportunity: Opportunity) -> t.List[UserProfile]:
         """
-        Match an opportunity with capable users based on key skills
-        
+        Match an opportunity with capable users
+
         Args:
             opportunity (Opportunity): The opportunity to match
-            
+
         Returns:
-            List[UserProfile]: List of capable users
+            List[UserProfile]: List of capable users (without duplicates, best matches first)
         """
         logger.info(f"Matching opportunity '{opportunity.title}' with users")
-        capable_users = []
-        
+
+        if self.mode == "embedding":
+            capable_users = await self._match_by_embedding(opportunity)
+        elif self.mode == "scoring":
+            capable_users = (await self._match_by_scoring([opportunity]))[0]
+        else:
+            capable_users = await self._match_by_skills(opportunity)
+
+        logger.info(f"Found {len(capable_users)} capable users for opportunity '{opportunity.title}'")
+        return capable_users
+
+    async def match_opportunities_with_users(self, opportunities: t.List[Opportunity]) -> t.List[t.List[UserProfile]]:
+        """
+        Match a batch of opportunities with capable users. In scoring mode, the whole batch is scored at once.
+
+        Args:
+            opportunities (List[Opportunity]): The opportunities to match
+
+        Returns:
+            List[List[UserProfile]]: For each opportunity, its capable users (best matches first)
+        """
+        if self.mode != "scoring":
+            matches = []
+            for opportunity in opportunities:
+                try:
+                    matches.append(await self.match_opportunity_with_users(opportunity))
+                except Exception as e:
+                    logger.error(f"Error matching opportunity {opportunity.title}: {e}")
+                    matches.append([])
+            return matches
+
+        logger.info(f"Matching {len(opportunities)} opportunities with users")
+        matches = await self._match_by_scoring(opportunities)
+        logger.info(f"Found {sum(len(users) for users in matches)} capable users for {len(opportunities)} opportunities")
+        return matches
+
+    async def _match_by_skills(self, opportunity: Opportunity) -> t.List[UserProfile]:
+        """Match on the key skills of the opportunity"""
         # Validate and normalize key skills
         validated_key_skills = []
         for skill in opportunity.key_skills:
@@ -39,15 +95,41 @@ class OpportunityMatcher:
                 validated_key_skills.append(skill)
         opportunity.key_skills = validated_key_skills
 
-        # Get users for each key skill
-        for key_skill in opportunity.key_skills:
-            try:
-                users = self.smart_contract_api.get_users_by_skill(key_skill)
-                capable_users.extend(users)
-                logger.debug(f"Found {len(users)} users for key skill '{key_skill}'")
-            except Exception as e:
-                logger.error(f"Error fetching users for key skill '{key_skill}': {e}")
-                continue
+        # Get users for all key skills from the skill index
+        try:
+            await self.skill_index.refresh_if_stale()
+        except Exception as e:
+            logger.error(f"Error building skill index: {e}")
+            return []
 
-        logger.info(f"Found {len(capable_users)} capable users for opportunity '{opportunity.title}'")
-        return capable_users 
\ No newline at end of file
+        return self.skill_index.match(opportunity.key_skills)
+
+    async def _match_by_embedding(self, opportunity: Opportunity) -> t.List[UserProfile]:
+        """Match on the similarity of the users' profiles with the opportunity"""
+        try:
+            await self.user_index.refresh_if_stale()
+        except Exception as e:
+            logger.error(f"Error building user embedding index: {e}")
+            return []
+
+        # Same text as in the opportunity vector index, so its embedding is already cached
+        vector = await self.opportunity_index.embedding_service.embed(self.opportunity_index.to_text(opportunity))
+        matches = self.user_index.match(vector)
+
+        for user, similarity in matches:
+            logger.debug(f"User {user.telegramUsername} matched opportunity '{opportunity.title}' with similarity {similarity:.3f}")
+        return [user for user, _ in matches]
+
+    async def _match_by_scoring(self, opportunities: t.List[Opportunity]) -> t.List[t.List[UserProfile]]:
+        """Match on the weighted criteria of every user, for a batch of opportunities"""
+        try:
+            await self.scoring_index.refresh_if_stale()
+        except Exception as e:
+            logger.error(f"Error building user scoring index: {e}")
+            return [[] for _ in opportunities]
+
+        matches = self.scoring_index.match(opportunities)
+        for opportunity, users in zip(opportunities, matches):
+            for user, score in users:
+                logger.debug(f"User {user.telegramUsername} matched opportunity '{opportunity.title}' with score {score:.3f}")
+        return [[user for user, _ in users] for users in matches]
@@ -0,0 +1,209 @@
+import typing as t
+import re
+import datetime
+
+import numpy as np
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.models.opportunity import Opportunity
+from app.service.contract.registered_users import RegisteredUsersIndex, RegisteredUsersSnapshot, registered_users
+from app.static.key_skills import AVAILABLE_KEY_SKILLS
+from app.static.matching import (
+    OPPORTUNITY_EXPERIENCE_RANGES,
+    OPPORTUNITY_STATUS_AFFINITY,
+    PROFESSIONAL_STATUSES,
+    REMOTE_LOCATIONS,
+)
+from app.types.contract import UserProfile
+
+
+SKILL_BITS = {skill: 1 << i for i, skill in enumerate(AVAILABLE_KEY_SKILLS)}
+SCORING_CRITERIA = ("skills", "location", "experience", "status", "deadline")
+
+
+class UserScoringIndex(RegisteredUsersIndex):
+    """
+    Columnar snapshot of the registered users, scoring batches of opportunities against every
+    user with NumPy array operations rather than Python loops.
+
+    Each user is packed into a few arrays: primary and secondary skill bitmasks, location and
+    professional status codes, and years of experience. Each criterion of a batch of opportunities
+    is then scored for every user at once as an (opportunities, users) matrix:
+
+    - skills: 1 for the primary skill, 0.5 for the secondary one, among the opportunity's key skills
+    - location: 1 if the opportunity is remote or in the user's location
+    - experience: 1 inside the range suiting the opportunity type, decaying with the distance to it
+    - status: affinity of the opportunity type with the professional status
+    - deadline: grows as the deadline gets closer than `OPPORTUNITY_SCORING_DEADLINE_HORIZON_DAYS`
+
+    The final score is their average weighted by `OPPORTUNITY_SCORING_WEIGHTS`, in [0, 1]. Users
+    are never matched with an opportunity whose deadline passed.
+
+    The index is rebuilt whenever the shared registered users snapshot is refreshed (every
+    `REGISTERED_USERS_TTL_SECONDS`, or right away after `invalidate` is called).
+
+    Usage:
+        ```python
+        await user_scoring_index.refresh_if_stale()
+        matches = user_scoring_index.match(opportunities)  # best users of each opportunity
+        ```
+    """
+    UNKNOWN = -1
+
+    def __init__(
+        self,
+        snapshot: RegisteredUsersSnapshot = registered_users,
+        weights: t.Optional[t.Dict[str, float]] = None
+    ):
+        super().__init__(snapshot)
+        self.weights = self._validate_weights(weights if weights is not None else config.OPPORTUNITY_SCORING_WEIGHTS)
+
+        self._users: t.List[UserProfile] = []
+        self._locations: t.List[str] = []  # location code -> location
+        self._primary_skills = np.zeros(0, dtype=np.int64)
+        self._secondary_skills = np.zeros(0, dtype=np.int64)
+        self._location_codes = np.zeros(0, dtype=np.int64)
+        self._status_codes = np.zeros(0, dtype=np.int64)
+        self._experience = np.zeros(0, dtype=np.int64)
+
+    def build(self, users: t.List[UserProfile]) -> None:
+        """
+        Build the index from a snapshot of the registered users.
+
+        Args:
+            users (List[UserProfile]): All the registered users
+        """
+        users = [user for user in users if user.exists]
+        locations = sorted({self._normalize(user.location) for user in users if user.location})
+        location_codes = {location: code for code, location in enumerate(locations)}
+        status_codes = {status: code for code, status in enumerate(PROFESSIONAL_STATUSES)}
+
+        self._users = users
+        self._locations = locations
+        self._primary_skills = np.array([SKILL_BITS.get(user.primarySkill, 0) for user in users], dtype=np.int64)
+        self._secondary_skills = np.array([SKILL_BITS.get(user.secondarySkill, 0) for user in users], dtype=np.int64)
+        self._location_codes = np.array([location_codes.get(self._normalize(user.location), self.UNKNOWN) for user in users], dtype=np.int64)
+        self._status_codes = np.array([status_codes.get(self._normalize(user.professionalStatus), self.UNKNOWN) for user in users], dtype=np.int64)
+        self._experience = np.array([max(user.yearsOfExperience, 0) for user in users], dtype=np.int64)
+        logger.info(f"Built user scoring index with {len(users)} users and {len(locations)} locations")
+
+    async def rebuild(self, users: t.List[UserProfile]) -> None:
+        self.build(users)
+
+    def score(self, opportunities: t.List[Opportunity], now: t.Optional[datetime.datetime] = None) -> np.ndarray:
+        """
+        Score every user against a batch of opportunities.
+
+        Args:
+            opportunities (List[Opportunity]): The opportunities to score
+            now (Optional[datetime]): Reference time of the deadlines (now by default)
+
+        Returns:
+            np.ndarray: Scores in [0, 1], of shape (opportunities, users), 0 for the opportunities whose deadline passed
+        """
+        criteria = {
+            "skills": self._score_skills(opportunities),
+            "location": self._score_location(opportunities),
+            "experience": self._score_experience(opportunities),
+            "status": self._score_status(opportunities),
+        }
+        days_left = self._days_left(opportunities, now)
+        horizon = config.OPPORTUNITY_SCORING_DEADLINE_HORIZON_DAYS
+        criteria["deadline"] = np.clip(1 - days_left / horizon, 0, 1)[:, None]
+
+        scores = sum(weight * criteria[name] for name, weight in self.weights.items()) / sum(self.weights.values())
+        scores = np.broadcast_to(scores, (len(opportunities), len(self._users)))
+        return np.where((days_left >= 0)[:, None], scores, 0.0)
+
+    def match(
+        self,
+        opportunities: t.List[Opportunity],
+        min_score: float = config.OPPORTUNITY_SCORING_MIN_SCORE,
+        max_users: int = config.OPPORTUNITY_MATCHING_MAX_USERS
+    ) -> t.List[t.List[t.Tuple[UserProfile, float]]]:
+        """
+        Get the best users of each opportunity of a batch.
+
+        Args:
+            opportunities (List[Opportunity]): The opportunities to match
+            min_score (float): Users scoring less than this are left out
+            max_users (int): Maximum number of users per opportunity
+
+        Returns:
+            List[List[Tuple[UserProfile, float]]]: For each opportunity, the matched users and their score, best first
+        """
+        if not opportunities or not self._users:
+            return [[] for _ in opportunities]
+
+        scores = self.score(opportunities)
+        matches = []
+        for row in scores:
+            candidates = np.flatnonzero(row >= min_score)
+            if len(candidates) > max_users:
+                candidates = candidates[np.argpartition(-row[candidates], max_users - 1)[:max_users]]
+            ranked = candidates[np.argsort(-row[candidates], kind="stable")]
+            matches.append([(self._users[i], float(row[i])) for i in ranked])
+        return matches
+
+    def _score_skills(self, opportunities: t.List[Opportunity]) -> np.ndarray:
+        masks = np.array([
+            np.bitwise_or.reduce([SKILL_BITS.get(skill, 0) for skill in opportunity.key_skills], initial=0)
+            for opportunity in opportunities
+        ], dtype=np.int64)[:, None]
+        primary = (self._primary_skills[None, :] & masks) != 0
+        secondary = (self._secondary_skills[None, :] & masks) != 0
+        return np.maximum(primary * 1.0, secondary * 0.5)
+
+    def _score_location(self, opportunities: t.List[Opportunity]) -> np.ndarray:
+        # (opportunities, locations + 1) lookup table, whose last column is the unknown location
+        accepted = np.zeros((len(opportunities), len(self._locations) + 1), dtype=bool)
+        for row, opportunity in enumerate(opportunities):
+            # e.g. "Berlin, Germany / Remote"
+            parts = {self._normalize(part) for part in re.split(r"[,/;|()]", opportunity.location or "")} - {""}
+            if not parts or any(remote in part for part in parts for remote in REMOTE_LOCATIONS):
+                accepted[row, :] = True
+                continue
+            accepted[row, :-1] = [name in parts for name in self._locations]
+        return accepted[:, self._location_codes].astype(np.float64)
+
+    def _score_experience(self, opportunities: t.List[Opportunity]) -> np.ndarray:
+        ranges = [OPPORTUNITY_EXPERIENCE_RANGES.get(opportunity.opportunity_type, (None, None)) for opportunity in opportunities]
+        minimum = np.array([low if low is not None else 0 for low, _ in ranges], dtype=np.float64)[:, None]
+        maximum = np.array([high if high is not None else np.inf for _, high in ranges], dtype=np.float64)[:, None]
+        experience = self._experience[None, :]
+        distance = np.maximum(minimum - experience, 0) + np.maximum(experience - maximum, 0)
+        return 1 / (1 + distance)
+
+    def _score_status(self, opportunities: t.List[Opportunity]) -> np.ndarray:
+        # (opportunities, statuses + 1) lookup table, whose last column is the unknown status
+        affinity = np.array([
+            [OPPORTUNITY_STATUS_AFFINITY.get(opportunity.opportunity_type, {}).get(status, 1.0) for status in PROFESSIONAL_STATUSES] + [0.5]
+            for opportunity in opportunities
+        ], dtype=np.float64)
+        return affinity[:, self._status_codes]
+
+    @staticmethod
+    def _days_left(opportunities: t.List[Opportunity], now: t.Optional[datetime.datetime]) -> np.ndarray:
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        deadlines = [
+            opportunity.deadline if opportunity.deadline.tzinfo else opportunity.deadline.replace(tzinfo=datetime.timezone.utc)
+            for opportunity in opportunities
+        ]
+        return np.array([(deadline - now).total_seconds() / 86400 for deadline in deadlines], dtype=np.float64)
+
+    @staticmethod
+    def _normalize(value: t.Optional[str]) -> str:
+        return (value or "").strip().lower().replace(" ", "_")
+
+    @staticmethod
+    def _validate_weights(weights: t.Dict[str, float]) -> t.Dict[str, float]:
+        unknown = set(weights) - set(SCORING_CRITERIA)
+        if unknown:
+            raise ValueError(f"Unknown scoring criteria: {', '.join(sorted(unknown))}")
+        if any(weight < 0 for weight in weights.values()) or sum(weights.values()) <= 0:
+            raise ValueError("Scoring weights must be non-negative, and at least one of them positive")
+        return dict(weights)
+
+
+user_scoring_index = UserScoringIndex()
@@ -0,0 +1,97 @@
+import typing as t
+
+from app.core.logging import logger
+from app.service.contract.registered_users import RegisteredUsersIndex, RegisteredUsersSnapshot, registered_users
+from app.types.contract import UserProfile
+
+
+class SkillIndex(RegisteredUsersIndex):
+    """
+    In-memory inverted index of skill -> users, built from a single snapshot of the registered users.
+
+    Matching an opportunity becomes a union over the index entries of its key skills, with no
+    network I/O. Each user appears once in the result, ranked by the sum of the weights of the
+    skills they matched (primary skills weigh more than secondary ones).
+
+    The index is rebuilt whenever the shared registered users snapshot is refreshed (every
+    `REGISTERED_USERS_TTL_SECONDS`, or right away after `invalidate` is called).
+
+    Usage:
+        ```python
+        await skill_index.refresh_if_stale()
+        users = skill_index.match(["blockchain", "full_stack_development"])
+        ```
+    """
+    PRIMARY_SKILL_WEIGHT = 1.0
+    SECONDARY_SKILL_WEIGHT = 0.5
+
+    def __init__(self, snapshot: RegisteredUsersSnapshot = registered_users):
+        super().__init__(snapshot)
+
+        self._users: t.Dict[str, UserProfile] = {}  # address -> user
+        self._skills: t.Dict[str, t.Dict[str, float]] = {}  # skill -> {address: weight}
+
+    def build(self, users: t.List[UserProfile]) -> None:
+        """
+        Build the index from a snapshot of the registered users.
+
+        Args:
+            users (List[UserProfile]): All the registered users
+        """
+        users_by_address: t.Dict[str, UserProfile] = {}
+        skills: t.Dict[str, t.Dict[str, float]] = {}
+
+        for user in users:
+            if not user.exists:
+                continue
+            address = user.address.lower()
+            users_by_address[address] = user
+
+            for skill, weight in (
+                (user.primarySkill, self.PRIMARY_SKILL_WEIGHT),
+                (user.secondarySkill, self.SECONDARY_SKILL_WEIGHT),
+            ):
+                if not skill:
+                    continue
+                weights = skills.setdefault(skill, {})
+                weights[address] = max(weights.get(address, 0.0), weight)
+
+        self._users = users_by_address
+        self._skills = skills
+        logger.info(f"Built skill index with {len(users_by_address)} users and {len(skills)} skills")
+
+    async def rebuild(self, users: t.List[UserProfile]) -> None:
+        self.build(users)
+
+    def score(self, skills: t.Iterable[str]) -> t.Dict[str, float]:
+        """
+        Score the users having any of the given skills.
+
+        Args:
+            skills (Iterable[str]): The skills to match
+
+        Returns:
+            Dict[str, float]: Sum of the matched skill weights by user address
+        """
+        scores: t.Dict[str, float] = {}
+        for skill in set(skills):
+            for address, weight in self._skills.get(skill, {}).items():
+                scores[address] = scores.get(address, 0.0) + weight
+        return scores
+
+    def match(self, skills: t.Iterable[str]) -> t.List[UserProfile]:
+        """
+        Get the users having any of the given skills, without duplicates, best matches first.
+
+        Args:
+            skills (Iterable[str]): The skills to match
+
+        Returns:
+            List[UserProfile]: The matched users
+        """
+        scores = self.score(skills)
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return [self._users[address] for address, _ in ranked]
+
+
+skill_index = SkillIndex()
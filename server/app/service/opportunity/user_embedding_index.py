@@ -0,0 +1,124 @@
+import typing as t
+
+import numpy as np
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.service.contract.registered_users import RegisteredUsersIndex, RegisteredUsersSnapshot, registered_users
+from app.service.core.embeddings import EmbeddingService
+from app.types.contract import UserProfile
+
+
+class UserEmbeddingIndex(RegisteredUsersIndex):
+    """
+    In-memory matrix of the embeddings of the registered users' profiles (skills, experience,
+    status and location), built from a single snapshot of the registered users.
+
+    Each profile is embedded once: unchanged profiles reuse their vector from the previous
+    snapshot, and new profiles are read from the persistent embedding cache when possible.
+    Matching an opportunity is a single matrix-vector product against every user, so it stays
+    in the milliseconds for thousands of users. Users are ranked by the cosine similarity of
+    their profile with the opportunity.
+
+    The index is rebuilt whenever the shared registered users snapshot is refreshed (every
+    `REGISTERED_USERS_TTL_SECONDS`, or right away after `invalidate` is called).
+
+    Usage:
+        ```python
+        await user_embedding_index.refresh_if_stale()
+        users = user_embedding_index.match(opportunity_vector, min_similarity=0.3, max_users=200)
+        ```
+    """
+
+    def __init__(self, snapshot: RegisteredUsersSnapshot = registered_users, embedding_service: t.Optional[EmbeddingService] = None):
+        super().__init__(snapshot)
+        self.embedding_service = embedding_service or EmbeddingService()
+
+        self._users: t.List[UserProfile] = []
+        self._texts: t.List[str] = []
+        self._vectors = np.empty((0, self.embedding_service.dimension), dtype=np.float32)  # One normalized row per user
+
+    @staticmethod
+    def to_text(user: UserProfile) -> str:
+        """
+        Build the text embedded for a user's profile.
+        """
+        skills = [skill.replace("_", " ") for skill in (user.primarySkill, user.secondarySkill) if skill]
+        return "\n".join([
+            f"Skills: {', '.join(skills)}",
+            f"Years of experience: {user.yearsOfExperience}",
+            f"Professional status: {user.professionalStatus}",
+            f"Location: {user.location}",
+        ])
+
+    async def build(self, users: t.List[UserProfile]) -> None:
+        """
+        Build the index from a snapshot of the registered users.
+
+        Args:
+            users (List[UserProfile]): All the registered users
+        """
+        users = [user for user in users if user.exists]
+        texts = [self.to_text(user) for user in users]
+
+        # Only embed the profiles which changed since the previous snapshot
+        previous = {text: vector for text, vector in zip(self._texts, self._vectors)}
+        missing = [text for text in dict.fromkeys(texts) if text not in previous]
+        if missing:
+            previous.update(zip(missing, self._normalize(await self.embedding_service.embed_many(missing))))
+
+        self._users = users
+        self._texts = texts
+        self._vectors = np.stack([previous[text] for text in texts]) if texts else np.empty((0, self.embedding_service.dimension), dtype=np.float32)
+        logger.info(f"Built user embedding index with {len(users)} users ({len(missing)} profiles embedded)")
+
+    async def rebuild(self, users: t.List[UserProfile]) -> None:
+        await self.build(users)
+
+    def score(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Score every user against a batch of opportunities.
+
+        Args:
+            vectors (np.ndarray): Embeddings of the opportunities, of shape (opportunities, dimension)
+
+        Returns:
+            np.ndarray: Cosine similarities, of shape (opportunities, users)
+        """
+        return self._normalize(vectors) @ self._vectors.T
+
+    def match(
+        self,
+        vector: np.ndarray,
+        min_similarity: float = config.OPPORTUNITY_MATCHING_MIN_SIMILARITY,
+        max_users: int = config.OPPORTUNITY_MATCHING_MAX_USERS
+    ) -> t.List[t.Tuple[UserProfile, float]]:
+        """
+        Get the users whose profile is the most similar to an opportunity, best matches first.
+
+        Args:
+            vector (np.ndarray): Embedding of the opportunity, of shape (dimension,)
+            min_similarity (float): Users less similar than this are left out
+            max_users (int): Maximum number of users
+
+        Returns:
+            List[Tuple[UserProfile, float]]: The matched users and their similarity
+        """
+        if not self._users:
+            return []
+
+        scores = self.score(vector.reshape(1, -1))[0]
+        candidates = np.flatnonzero(scores >= min_similarity)
+        if len(candidates) > max_users:
+            candidates = candidates[np.argpartition(-scores[candidates], max_users - 1)[:max_users]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self._users[i], float(scores[i])) for i in ranked]
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+user_embedding_index = UserEmbeddingIndex()
@@ -0,0 +1,322 @@
+import typing as t
+import asyncio
+import datetime
+from collections import OrderedDict
+
+import numpy as np
+
+from app.core.logging import logger
+from app.config.settings import config
+from app.models.opportunity import Opportunity, OpportunitySearchResult
+from app.models.vector_store import PersistentVectorStore
+from app.service.core.embeddings import EmbeddingService
+from app.service.opportunity.data import OpportunityService
+from app.static.default import DEFAULT_EMBEDDING_CHUNK_SIZE
+from app.utils.text_utils import truncate_to_tokens
+
+
+class OpportunityVectorIndex:
+    """
+    Persistent semantic index of the saved opportunities, keyed by their database ID.
+
+    The index lives in `OPPORTUNITY_INDEX_DIR` and is loaded lazily (on startup, or by the first
+    caller). Once loaded, it catches up with the database: the saved opportunities which aren't
+    indexed are embedded and the deleted ones dropped; the first load of an empty directory indexes
+    the whole table. New opportunities are then added as the scheduler saves them, in O(new): they
+    are appended to the log of the index, which is compacted into a new snapshot every
+    `OPPORTUNITY_INDEX_COMPACT_AFTER_UPDATES` updates. If adding fails, the next add catches up first.
+
+    Every opportunity is stored with a compact document of the fields used to filter the
+    search results: its type, deadline (as a UNIX timestamp) and key skills.
+
+    Search queries are free text, so they bypass the persistent embedding cache: the last
+    `OPPORTUNITY_SEARCH_QUERY_CACHE_SIZE` of them are kept in memory instead.
+
+    Usage:
+        ```python
+        await opportunity_vector_index.ensure_loaded()
+        await opportunity_vector_index.add(new_opportunities)
+        results = await opportunity_vector_index.search("solana hackathon", opportunity_types=["hackathon"])
+        ```
+    """
+
+    def __init__(self, directory: str = config.OPPORTUNITY_INDEX_DIR, embedding_service: t.Optional[EmbeddingService] = None):
+        self.directory = directory
+        self.embedding_service = embedding_service or EmbeddingService()
+        self.query_embedding_service = EmbeddingService(self.embedding_service.model, use_cache=False)
+        self.opportunity_service = OpportunityService()
+
+        self._store: t.Optional[PersistentVectorStore] = None
+        self._load_task: t.Optional[asyncio.Task] = None
+        self._query_vectors: OrderedDict[str, np.ndarray] = OrderedDict()  # LRU of the query embeddings
+        self._needs_sync = False  # Set when an update failed, so the index may miss opportunities
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._store is not None
+
+    @property
+    def store(self) -> PersistentVectorStore:
+        if self._store is None:
+            raise RuntimeError("Opportunity vector index is not loaded, call ensure_loaded first")
+        return self._store
+
+    def to_text(self, opportunity: Opportunity) -> str:
+        """
+        Build the text embedded for an opportunity.
+        """
+        text = "\n".join([
+            opportunity.title,
+            f"Type: {opportunity.opportunity_type}",
+            f"Skills: {', '.join(opportunity.key_skills)}",
+            f"Location: {opportunity.location or 'remote'}",
+            opportunity.description,
+        ])
+        return truncate_to_tokens(text, DEFAULT_EMBEDDING_CHUNK_SIZE, self.embedding_service.model.value)
+
+    @staticmethod
+    def to_document(opportunity: Opportunity) -> t.Dict[str, t.Any]:
+        """
+        Build the document stored alongside the vector of an opportunity.
+        """
+        return {
+            "type": opportunity.opportunity_type,
+            "deadline": int(opportunity.deadline.timestamp()),
+            "skills": opportunity.key_skills,
+        }
+
+    async def ensure_loaded(self) -> None:
+        """
+        Load the index from disk, or create it, and catch up with the database. Does nothing once loaded.
+        """
+        if self._store is not None:
+            return
+
+        async with self._lock:
+            if self._store is not None:
+                return
+            store = await asyncio.to_thread(self._load_store)
+            await self._sync(store)
+            self._store = store
+
+    async def warm_up(self) -> None:
+        """
+        Load the index in the background on startup. Errors are logged, and loading is tried again by the next caller.
+        """
+        try:
+            await self.ensure_loaded()
+        except Exception as e:
+            logger.error(f"Error loading opportunity vector index: {e}")
+
+    def load_in_background(self) -> asyncio.Task:
+        """
+        Start loading the index in the background, unless it is already loading.
+
+        Returns:
+            asyncio.Task: The loading task
+        """
+        if self._load_task is None or self._load_task.done():
+            self._load_task = asyncio.create_task(self.warm_up())
+        return self._load_task
+
+    async def add(self, opportunities: t.List[Opportunity]) -> int:
+        """
+        Index newly saved opportunities. Opportunities already indexed are skipped.
+
+        Args:
+            opportunities (List[Opportunity]): Saved opportunities, with their ID
+
+        Returns:
+            int: The number of indexed opportunities
+        """
+        await self.ensure_loaded()
+        async with self._lock:
+            try:
+                if self._needs_sync:
+                    await self._sync(self.store)
+                new_opportunities = [opportunity for opportunity in self._with_id(opportunities) if opportunity.id not in self.store]
+                added = await self._add(self.store, new_opportunities)
+                await self._persist(self.store)
+            except Exception:
+                self._needs_sync = True
+                raise
+            return added
+
+    async def upsert(self, opportunities: t.List[Opportunity]) -> None:
+        """
+        Index saved opportunities, replacing the ones already indexed (e.g. after they were updated).
+        """
+        await self.ensure_loaded()
+        async with self._lock:
+            opportunities = self._with_id(opportunities)
+            if not opportunities:
+                return
+            vectors = await self.embedding_service.embed_many([self.to_text(opportunity) for opportunity in opportunities])
+            self.store.upsert(
+                [opportunity.id for opportunity in opportunities],
+                vectors,
+                [self.to_document(opportunity) for opportunity in opportunities]
+            )
+            await self._persist(self.store)
+            logger.info(f"Upserted {len(opportunities)} opportunities in the vector index")
+
+    async def remove(self, ids: t.List[int]) -> int:
+        """
+        Remove opportunities from the index (e.g. after they were deleted).
+
+        Returns:
+            int: The number of removed opportunities
+        """
+        await self.ensure_loaded()
+        async with self._lock:
+            removed = self.store.remove(ids)
+            if removed:
+                await self._persist(self.store)
+                logger.info(f"Removed {removed} opportunities from the vector index")
+            return removed
+
+    async def search(
+        self,
+        query: str,
+        top_k: int = config.OPPORTUNITY_SEARCH_DEFAULT_TOP_K,
+        opportunity_types: t.Optional[t.List[str]] = None,
+        deadline_after: t.Optional[datetime.datetime] = None,
+        deadline_before: t.Optional[datetime.datetime] = None,
+        skills: t.Optional[t.List[str]] = None
+    ) -> t.List[OpportunitySearchResult]:
+        """
+        Search for the opportunities most relevant to a query.
+
+        The query is embedded once, the filters are applied to the documents of the index and
+        the best matches are read from the database in a single query. The index must be loaded
+        (see `is_loaded`), searching never waits for it.
+
+        Args:
+            query (str): What to search for, in natural language
+            top_k (int): Maximum number of results
+            opportunity_types (Optional[List[str]]): Only keep opportunities of these types
+            deadline_after (Optional[datetime]): Only keep opportunities ending after this date
+            deadline_before (Optional[datetime]): Only keep opportunities ending before this date
+            skills (Optional[List[str]]): Only keep opportunities requiring any of these key skills
+
+        Returns:
+            List[OpportunitySearchResult]: The matched opportunities, most relevant first
+
+        Raises:
+            RuntimeError: If the index is not loaded
+        """
+        store = self.store
+
+        candidate_ids = None
+        if opportunity_types or deadline_after or deadline_before or skills:
+            candidate_ids = self._filter(opportunity_types, deadline_after, deadline_before, skills)
+            if not candidate_ids:
+                return []
+
+        vector = await self._embed_query(query)
+        matches = store.search(vector, top_k, candidate_ids)
+
+        opportunities = await self.opportunity_service.get_opportunities_by_ids([id for id, _ in matches])
+        scores = dict(matches)
+        return [OpportunitySearchResult(opportunity=opportunity, score=scores[opportunity.id]) for opportunity in opportunities]
+
+    def _filter(
+        self,
+        opportunity_types: t.Optional[t.List[str]],
+        deadline_after: t.Optional[datetime.datetime],
+        deadline_before: t.Optional[datetime.datetime],
+        skills: t.Optional[t.List[str]]
+    ) -> t.List[int]:
+        """Get the IDs of the indexed opportunities matching every filter"""
+        types = set(opportunity_types or [])
+        skills = set(skills or [])
+        after = deadline_after.timestamp() if deadline_after else None
+        before = deadline_before.timestamp() if deadline_before else None
+
+        return [
+            id for id, document in self.store.documents.items()
+            if (not types or document["type"] in types)
+            and (after is None or document["deadline"] >= after)
+            and (before is None or document["deadline"] <= before)
+            and (not skills or not skills.isdisjoint(document["skills"]))
+        ]
+
+    async def _embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query, through the in-memory LRU of the recent queries"""
+        vector = self._query_vectors.get(query)
+        if vector is None:
+            vector = await self.query_embedding_service.embed(query)
+            self._query_vectors[query] = vector
+            if len(self._query_vectors) > config.OPPORTUNITY_SEARCH_QUERY_CACHE_SIZE:
+                self._query_vectors.popitem(last=False)
+        else:
+            self._query_vectors.move_to_end(query)
+        return vector
+
+    def _load_store(self) -> PersistentVectorStore:
+        """Load the saved store, or create an empty one if there is none or it can't be used"""
+        model = self.embedding_service.model.value
+        try:
+            store = PersistentVectorStore.load(self.directory)
+        except Exception as e:
+            logger.error(f"Error loading opportunity vector index from {self.directory}, rebuilding it: {e}")
+            store = None
+
+        if store is not None and store.metadata.get("model") != model:
+            logger.warning(f"Opportunity vector index was built with {store.metadata.get('model')}, rebuilding it with {model}")
+            store = None
+
+        if store is None:
+            return PersistentVectorStore(self.embedding_service.dimension, {"model": model})
+
+        logger.info(f"Loaded opportunity vector index with {len(store)} opportunities")
+        return store
+
+    async def _sync(self, store: PersistentVectorStore) -> None:
+        """Index the saved opportunities which aren't indexed yet, and drop the deleted ones"""
+        saved_ids = set(await self.opportunity_service.get_opportunity_ids())
+        indexed_ids = set(store.ids)
+
+        removed = store.remove(list(indexed_ids - saved_ids))
+        missing_ids = sorted(saved_ids - indexed_ids)
+        added = 0
+        for i in range(0, len(missing_ids), config.OPPORTUNITY_INDEX_SYNC_BATCH_SIZE):
+            batch_ids = missing_ids[i:i + config.OPPORTUNITY_INDEX_SYNC_BATCH_SIZE]
+            added += await self._add(store, await self.opportunity_service.get_opportunities_by_ids(batch_ids))
+
+        await self._persist(store)
+        self._needs_sync = False
+        logger.info(f"Opportunity vector index caught up: {added} opportunities added, {removed} removed ({len(store)} in total)")
+
+    async def _add(self, store: PersistentVectorStore, opportunities: t.List[Opportunity]) -> int:
+        """Embed and add opportunities which aren't indexed yet"""
+        opportunities = self._with_id(opportunities)
+        if not opportunities:
+            return 0
+
+        vectors = await self.embedding_service.embed_many([self.to_text(opportunity) for opportunity in opportunities])
+        store.add(
+            [opportunity.id for opportunity in opportunities],
+            vectors,
+            [self.to_document(opportunity) for opportunity in opportunities]
+        )
+        logger.info(f"Added {len(opportunities)} opportunities to the vector index")
+        return len(opportunities)
+
+    async def _persist(self, store: PersistentVectorStore) -> None:
+        """Append the updates to the log of the saved index, or write a new snapshot when the log is long enough"""
+        if not PersistentVectorStore.exists(self.directory) or store.log_size + store.pending_size >= config.OPPORTUNITY_INDEX_COMPACT_AFTER_UPDATES:
+            await asyncio.to_thread(store.save, self.directory)
+            logger.info(f"Saved a snapshot of the opportunity vector index with {len(store)} opportunities")
+        else:
+            await asyncio.to_thread(store.flush, self.directory)
+
+    @staticmethod
+    def _with_id(opportunities: t.List[Opportunity]) -> t.List[Opportunity]:
+        """Keep the opportunities which were saved, once each"""
+        by_id = {opportunity.id: opportunity for opportunity in opportunities if opportunity.id is not None}
+        return list(by_id.values())
+
+
+opportunity_vector_index = OpportunityVectorIndex()
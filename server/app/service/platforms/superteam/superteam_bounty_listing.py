@@ -4,7 +4,7 @@ import datetime
 
 from app.core.logging import logger
 
-from app.service.core.api import APIService
+from app.service.core.api import AsyncAPIService
 from app.service.core.resource_hub import ResourceHub
 from app.service.platforms.superteam.routes import SuperteamAPIRoutes
 from app.repository.opportunity import OpportunityRepository
@@ -20,7 +20,7 @@ class SuperteamBountyListingResourceHub(ResourceHub):
         """
         Initialize the resource hub with API service and default values
         """
-        self.api = APIService[SuperteamAPIRoutes](
+        self.api = AsyncAPIService[SuperteamAPIRoutes](
             service_name="superteam_bounty_listing",
             base_url=SuperteamAPIRoutes.BASE
         )
@@ -35,7 +35,7 @@ class SuperteamBountyListingResourceHub(ResourceHub):
         """Get the interval time for fetching resources (in seconds)"""
         return 60 * 60 * 24  # 24 hours
 
-    def fetch(self) -> t.List[t.Dict]:
+    async def fetch(self) -> t.List[t.Dict]:
         """
         Fetch bounty listings from Superteam API
         
@@ -47,7 +47,7 @@ class SuperteamBountyListingResourceHub(ResourceHub):
         """
         try:
             logger.info("Fetching Superteam bounty listings")
-            data = self.api.get(SuperteamAPIRoutes.SUPERTEAM_BOUNTY_LISTINGS)
+            data = await self.api.get(SuperteamAPIRoutes.SUPERTEAM_BOUNTY_LISTINGS)
             if not isinstance(data, list):
                 logger.error(f"Unexpected response format: {type(data)}")
                 return []
@@ -63,15 +63,24 @@ class SuperteamBountyListingResourceHub(ResourceHub):
         """
         Check and remove existing opportunities (which has already been fetched and saved in the database before) from the list.
         """
-        count = 0
-        
+        platform_ids = list({str(item["id"]) for item in self.raw_resource_data if item.get("id") is not None})
+        existing_ids = await self.opportunity_repository.get_existing_platform_ids(self.platform_name, platform_ids)
+
+        remaining = []
+        seen_ids = set()
         for item in self.raw_resource_data:
-            opportunity = await self.opportunity_repository.get_by_platform_name_and_platform_id(self.platform_name, item["id"])
-            if opportunity:
-                logger.debug(f"Removing existing opportunity: {item['title']}")
-                self.raw_resource_data.remove(item)
-                count += 1
-        logger.info(f"Removed {count} existing opportunities from the list")
+            item_id = str(item.get("id"))
+            if item_id in existing_ids:
+                logger.debug(f"Removing existing opportunity: {item.get('title')}")
+                continue
+            if item.get("id") is not None and item_id in seen_ids:
+                logger.debug(f"Removing duplicate opportunity: {item.get('title')}")
+                continue
+            seen_ids.add(item_id)
+            remaining.append(item)
+
+        logger.info(f"Removed {len(self.raw_resource_data) - len(remaining)} existing opportunities from the list")
+        self.raw_resource_data = remaining
         return self.raw_resource_data
 
     @property
@@ -130,7 +139,7 @@ if __name__ == "__main__":
             opportunity_service = OpportunityService()
             superteam_bounty_listing = SuperteamBountyListingResourceHub()
 
-            superteam_bounty_listing.fetch()
+            await superteam_bounty_listing.fetch()
             await superteam_bounty_listing.remove_existing_opportunities()
             
             # Generate opportunities
@@ -139,8 +148,8 @@ if __name__ == "__main__":
                 print("\nNo opportunities found\n")
                 return
             
-            for opportunity in opportunities:
-                await opportunity_service.save(opportunity)
+            saved_opportunities = await opportunity_service.save_many(opportunities)
+            for opportunity in saved_opportunities:
                 print(f"\nSaved opportunity: {opportunity.title}")
 
             opportunities_dict = [opp.model_dump() for opp in opportunities] 
@@ -6,13 +6,16 @@ from app.config.settings import config
 from app.helpers.notification.telegram_message import format_opportunity
 
 from app.service.core.resource_hub import ResourceHub
+from app.service.chat.data import ChatService
 from app.service.opportunity.data import OpportunityService
 from app.service.opportunity.matcher import OpportunityMatcher
-from app.utils.telegram_publisher import TelegramPublisher
+from app.service.opportunity.vector_index import opportunity_vector_index
+from app.utils.telegram_publisher import telegram_publisher
 
 
 opportunity_matcher = OpportunityMatcher()
 opportunity_service = OpportunityService()
+chat_service = ChatService()
 
 async def create_resource_hub_background_job(resource_hub_class: t.Type[ResourceHub]):
     """
@@ -28,7 +31,7 @@ async def create_resource_hub_background_job(resource_hub_class: t.Type[Resource
         hub = resource_hub_class()
 
         # Fetch and generate opportunities - remove existing opportunities from the list.
-        hub.fetch()
+        await hub.fetch()
         await hub.remove_existing_opportunities()
 
         opportunities = await hub.generate_opportunity()
@@ -38,15 +41,26 @@ async def create_resource_hub_background_job(resource_hub_class: t.Type[Resource
         
         logger.info(f"Generated {len(opportunities)} opportunities")
 
-        # Process each opportunity
-        for opportunity in opportunities:
-            try:
-                # Save opportunity to database
-                await opportunity_service.save(opportunity)
+        # Save all opportunities at once, only the new ones are notified
+        new_opportunities = await opportunity_service.save_many(opportunities)
+        logger.info(f"Saved {len(new_opportunities)} new opportunities ({len(opportunities) - len(new_opportunities)} already existed or had no platform ID)")
+
+        # Append the new opportunities to the search index, the existing ones aren't embedded again
+        try:
+            await opportunity_vector_index.add(new_opportunities)
+        except Exception as e:
+            logger.error(f"Error indexing new opportunities, they will be indexed by the next run or on the next load: {e}")
 
-                # Match opportunity with capable users
-                capable_users = opportunity_matcher.match_opportunity_with_users(opportunity)
+        # Match all the new opportunities with capable users
+        try:
+            matches = await opportunity_matcher.match_opportunities_with_users(new_opportunities)
+        except Exception as e:
+            logger.error(f"Error matching opportunities with users: {e}")
+            matches = [[] for _ in new_opportunities]
 
+        # Process each opportunity
+        for opportunity, capable_users in zip(new_opportunities, matches):
+            try:
                 if config.ENVIRONMENT == "development":
                     print("-"*100)
                     print("Opportunity Title: ", opportunity.title)
@@ -57,20 +71,22 @@ async def create_resource_hub_background_job(resource_hub_class: t.Type[Resource
                         print(" - " * 20)
                     print("-"*100)
                 
-                # Publish opportunity data to Telegram Bot Server
-                for user in capable_users:
-                    publisher = TelegramPublisher()
-
+                # Publish opportunity data to Telegram Bot Server, to all the capable users at once
+                if capable_users:
+                    usernames = [user.telegramUsername for user in capable_users]
                     try:
-                        await publisher.send_notification(
-                            username=user.telegramUsername,
-                            message=format_opportunity(opportunity)
-                        )
+                        chat_ids = await chat_service.get_chat_ids_by_usernames(usernames)
                     except Exception as e:
-                        logger.error(f"Error sending notification to {user.telegramUsername}: {e}")
+                        logger.error(f"Error resolving chat IDs, the bot will resolve them: {e}")
+                        chat_ids = {}
 
-                    finally:
-                        await publisher.close()
+                    failed_usernames = await telegram_publisher.send_notifications(
+                        usernames=usernames,
+                        message=format_opportunity(opportunity),
+                        chat_ids=chat_ids
+                    )
+                    for username in failed_usernames:
+                        logger.error(f"Error sending notification to {username}")
                 
                 logger.debug(f"Processed opportunity: {opportunity.title}")
                 logger.debug(f"Found {len(capable_users)} capable users")
@@ -0,0 +1,49 @@
+import typing as t
+from dataclasses import dataclass, field
+
+
+@dataclass(frozen=True)
+class CompactionProfile:
+    """
+    How the raw listings of a platform are compacted before being sent to the LLM.
+
+    Attributes:
+        fields: Fields kept from every listing, nested fields as dotted paths (None keeps them all)
+        html_fields: Fields converted from HTML to plain text
+        max_tokens: Token budget of string fields, the others get `LLM_COMPACTION_FIELD_MAX_TOKENS`
+    """
+    fields: t.Optional[t.Tuple[str, ...]] = None
+    html_fields: t.Tuple[str, ...] = ()
+    max_tokens: t.Dict[str, int] = field(default_factory=dict)
+
+
+# Used for the platforms without their own profile
+DEFAULT_COMPACTION_PROFILE = CompactionProfile(html_fields=("description",))
+
+
+# Compaction profiles by platform name
+COMPACTION_PROFILES: t.Dict[str, CompactionProfile] = {
+    "superteam": CompactionProfile(
+        fields=(
+            "id",
+            "title",
+            "description",
+            "type",
+            "status",
+            "deadline",
+            "reward",
+            "rewardAmount",
+            "token",
+            "compensationType",
+            "minRewardAsk",
+            "maxRewardAsk",
+            "region",
+            "skills",
+            "sponsor.name",
+            "bounty_link",
+            "platform_name",
+            "fetched_at",
+        ),
+        html_fields=("description",),
+    ),
+}
@@ -21,6 +21,21 @@ class BaseLLMModelEnum(Enum, metaclass=ABCEnumMeta):
     @abstractmethod
     def env_var(self) -> str:
         ...
+
+    @property
+    @abstractmethod
+    def max_requests_per_minute(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def max_tokens_per_minute(self) -> int:
+        ...
+
+    @property
+    @abstractmethod
+    def max_concurrent_requests(self) -> int:
+        ...
         
 
 class LLMModelEnum(BaseLLMModelEnum):
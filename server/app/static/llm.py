@@ -1,6 +1,8 @@
 import os
+from enum import Enum
 
 from app.core.logging import logger
+from app.config.settings import config
 from app.static.core.llm import LLMModelEnum
 
 
@@ -11,7 +13,19 @@ class OpenAIModel(LLMModelEnum):
     @property
     def env_var(self) -> str:
         return "OPENAI_API_KEY"
-    
+
+    @property
+    def max_requests_per_minute(self) -> int:
+        return config.OPENAI_MAX_REQUESTS_PER_MINUTE
+
+    @property
+    def max_tokens_per_minute(self) -> int:
+        return config.OPENAI_MAX_TOKENS_PER_MINUTE
+
+    @property
+    def max_concurrent_requests(self) -> int:
+        return config.OPENAI_MAX_CONCURRENT_REQUESTS
+
 
 class GeminiModel(LLMModelEnum):
     GEMINI_1_5_PRO = "gemini-1.5-pro"
@@ -22,5 +36,29 @@ class GeminiModel(LLMModelEnum):
     def env_var(self) -> str:
         return "GOOGLE_API_KEY"
 
+    @property
+    def max_requests_per_minute(self) -> int:
+        return config.GEMINI_MAX_REQUESTS_PER_MINUTE
+
+    @property
+    def max_tokens_per_minute(self) -> int:
+        return config.GEMINI_MAX_TOKENS_PER_MINUTE
 
+    @property
+    def max_concurrent_requests(self) -> int:
+        return config.GEMINI_MAX_CONCURRENT_REQUESTS
 
+
+class OpenAIEmbeddingModel(Enum):
+    TEXT_EMBEDDING_3_SMALL = "text-embedding-3-small"
+    TEXT_EMBEDDING_3_LARGE = "text-embedding-3-large"
+    TEXT_EMBEDDING_ADA_002 = "text-embedding-ada-002"
+
+    @property
+    def dimension(self) -> int:
+        """Size of the vectors produced by the model"""
+        return {
+            OpenAIEmbeddingModel.TEXT_EMBEDDING_3_SMALL: 1536,
+            OpenAIEmbeddingModel.TEXT_EMBEDDING_3_LARGE: 3072,
+            OpenAIEmbeddingModel.TEXT_EMBEDDING_ADA_002: 1536,
+        }[self]
@@ -0,0 +1,30 @@
+import typing as t
+
+
+# Professional statuses of the registration form, in the order of the contract enum
+PROFESSIONAL_STATUSES = [
+    'student',
+    'employed',
+    'freelancer',
+    'job_seeker',
+]
+
+# Opportunity locations open to users from anywhere
+REMOTE_LOCATIONS = ['remote', 'global', 'worldwide', 'anywhere', 'online']
+
+# How well each opportunity type suits each professional status (1.0 if missing)
+OPPORTUNITY_STATUS_AFFINITY: t.Dict[str, t.Dict[str, float]] = {
+    'job': {'student': 0.4, 'employed': 0.7, 'freelancer': 0.7, 'job_seeker': 1.0},
+    'internship': {'student': 1.0, 'employed': 0.2, 'freelancer': 0.4, 'job_seeker': 0.9},
+    'freelance': {'student': 0.6, 'employed': 0.5, 'freelancer': 1.0, 'job_seeker': 0.8},
+    'scholarship': {'student': 1.0, 'employed': 0.3, 'freelancer': 0.3, 'job_seeker': 0.5},
+    'fellowship': {'student': 0.9, 'employed': 0.6, 'freelancer': 0.8, 'job_seeker': 0.9},
+}
+
+# Years of experience suiting each opportunity type, as (min, max) with None for no bound
+OPPORTUNITY_EXPERIENCE_RANGES: t.Dict[str, t.Tuple[t.Optional[int], t.Optional[int]]] = {
+    'job': (1, None),
+    'internship': (0, 2),
+    'scholarship': (0, 4),
+    'fellowship': (0, 8),
+}
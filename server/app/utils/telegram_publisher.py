@@ -1,3 +1,4 @@
+import typing as t
 import asyncio
 
 from app.service.core.rabbitmq import RabbitMQService, RabbitMQMessage
@@ -6,7 +7,11 @@ from app.models.rabbitmq import OpportunityNotification
 
 
 class TelegramPublisher:
-    """Publisher for sending Telegram notifications via RabbitMQ"""
+    """Publisher for sending Telegram notifications via RabbitMQ
+
+    Meant to be long-lived: use the process wide `telegram_publisher`, which keeps a single
+    connection open until `close` is called on shutdown.
+    """
     
     def __init__(self):
         self.rabbitmq = RabbitMQService()
@@ -20,31 +25,68 @@ class TelegramPublisher:
             message (str): The message content to send
         """
         try:
-            data = OpportunityNotification(
-                username=username,
-                message=message
-            )
-            notification = RabbitMQMessage(
-                body=data.model_dump(),
-                routing_key=self.queue_name,
-                headers={
-                    "type": "telegram_notification",
-                    "priority": "high"
-                }
-            )
-            
-            await self.rabbitmq.publish(notification)
+            await self.rabbitmq.publish(self._build_notification(username, message))
             logger.info(f"Published Telegram notification for username: {username}")
             
         except Exception as e:
             logger.error(f"Error publishing Telegram notification: {str(e)}")
             raise
 
+    async def send_notifications(
+        self,
+        usernames: t.List[str],
+        message: str,
+        chat_ids: t.Optional[t.Dict[str, int]] = None,
+        priority: str = "normal"
+    ) -> t.List[str]:
+        """Send the same notification to many Telegram users via RabbitMQ, in one pass
+
+        Broadcasts default to the "normal" send lane of the bot, so they never hold back the
+        notifications of a single user.
+
+        Args:
+            usernames (List[str]): Telegram usernames to send the message to
+            message (str): The message content to send
+            chat_ids (Optional[Dict[str, int]]): Already resolved chat IDs by lowercased username
+            priority (str): Send lane of the notifications in the bot ("high", "normal" or "low")
+
+        Returns:
+            List[str]: Usernames whose notification could not be published
+        """
+        chat_ids = chat_ids or {}
+        notifications = [
+            self._build_notification(username, message, chat_ids.get(username.lower()), priority)
+            for username in usernames
+        ]
+        failed = await self.rabbitmq.publish_many(notifications)
+
+        failed_usernames = [notification.body["username"] for notification in failed]
+        logger.info(f"Published {len(usernames) - len(failed_usernames)}/{len(usernames)} Telegram notifications")
+        return failed_usernames
+
+    def _build_notification(self, username: str, message: str, chat_id: t.Optional[int] = None, priority: str = "high") -> RabbitMQMessage:
+        data = OpportunityNotification(
+            username=username,
+            message=message,
+            chat_id=chat_id
+        )
+        return RabbitMQMessage(
+            body=data.model_dump(),
+            routing_key=self.queue_name,
+            headers={
+                "type": "telegram_notification",
+                "priority": priority
+            }
+        )
+
     async def close(self) -> None:
         """Close RabbitMQ connections"""
         await self.rabbitmq.close()
 
 
+telegram_publisher = TelegramPublisher()
+
+
 # Example usage
 async def main():
     publisher = TelegramPublisher()
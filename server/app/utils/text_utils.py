@@ -1,7 +1,80 @@
 import typing as t
+import html
+import re
+from functools import lru_cache
+
 import tiktoken
 
-from app.config.settings import config
+from app.static.default import DEFAULT_EMBEDDING_MODEL
+
+
+FALLBACK_ENCODING = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str) -> tiktoken.Encoding:
+    """Get the tokenizer for the model, falling back to a generic one for non OpenAI models"""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding(FALLBACK_ENCODING)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Count the number of tokens in the text for the given model.
+
+    Args:
+        text: The input text
+        model: Name of the model whose tokenizer should be used (e.g. "gpt-4o")
+
+    Returns:
+        Number of tokens in the text
+
+    Example:
+        >>> count_tokens("Hello world", "gpt-4o")
+        2
+    """
+    return len(_get_encoding(model).encode(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """Truncate text to its first max_tokens tokens, followed by an ellipsis when anything was cut.
+
+    Args:
+        text: The input text
+        max_tokens: Maximum number of tokens to keep
+        model: Name of the model whose tokenizer should be used (e.g. "gpt-4o")
+
+    Returns:
+        The text itself if it fits, otherwise its truncated version
+
+    Example:
+        >>> truncate_to_tokens("Hello wonderful world", 2, "gpt-4o")
+        'Hello wonderful…'
+    """
+    encoding = _get_encoding(model)
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]).rstrip() + "…"
+
+
+def strip_html(text: str) -> str:
+    """Convert HTML to plain text, collapsing the whitespace.
+
+    Args:
+        text: The HTML text
+
+    Returns:
+        The plain text
+
+    Example:
+        >>> strip_html("<p>Build a <b>dApp</b>&nbsp;&amp; win</p>")
+        'Build a dApp & win'
+    """
+    text = re.sub(r"<(script|style)\b.*?</\1>", " ", text, flags=re.IGNORECASE | re.DOTALL)
+    text = re.sub(r"<[^>]+>", " ", text)
+    return re.sub(r"\s+", " ", html.unescape(text)).strip()
 
 
 def chunk_text(text: str, max_tokens: int) -> t.List[str]:
@@ -18,7 +91,7 @@ def chunk_text(text: str, max_tokens: int) -> t.List[str]:
         >>> chunk_text("Hello world", 2)
         ['Hello', 'world']
     """
-    enc = tiktoken.encoding_for_model(config.DEFAULT_EMBEDDING_MODEL)
+    enc = _get_encoding(DEFAULT_EMBEDDING_MODEL.value)
     words = text.split()
     chunks, chunk, total_tokens = [], [], 0
 
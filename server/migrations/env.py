@@ -0,0 +1,68 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import pool
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import async_engine_from_config
+
+from app.config.settings import config as app_config
+from app.models.core.base import BaseOrm
+
+# Import all models to ensure they are registered with the metadata
+from app.models.repository.chat import ChatOrm  # noqa: F401
+from app.models.repository.opportunity import OpportunityOrm  # noqa: F401
+from app.models.repository.llm_cache import LLMCacheOrm  # noqa: F401
+from app.models.repository.telegram_user import TelegramUserOrm  # noqa: F401
+from app.models.repository.embedding_cache import EmbeddingCacheOrm  # noqa: F401
+
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# '%' has to be escaped in the ini style config
+config.set_main_option("sqlalchemy.url", app_config.get_async_database_url().replace("%", "%%"))
+
+target_metadata = BaseOrm.metadata
+
+
+def run_migrations_offline() -> None:
+    """Emit the migrations as SQL, without connecting to the database"""
+    context.configure(
+        url=config.get_main_option("sqlalchemy.url"),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        compare_type=True,
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_async_migrations() -> None:
+    """Run the migrations through the async engine used by the application"""
+    connectable = async_engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix="sqlalchemy.",
+        poolclass=pool.NullPool,
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_async_migrations())
@@ -0,0 +1,66 @@
+"""Initial schema, as created by the former scripts/repository/init_db.py
+
+Databases created by init_db already have these tables: mark them as migrated with `alembic stamp 0001`.
+The tables and constraints added since (opportunity uniqueness, llm_cache, telegram_users) come in 0004.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+
+"""
+import typing as t
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: t.Union[str, None] = None
+branch_labels: t.Union[str, t.Sequence[str], None] = None
+depends_on: t.Union[str, t.Sequence[str], None] = None
+
+
+def _base_columns() -> t.List[sa.Column]:
+    """Columns of BaseOrm"""
+    return [
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    op.create_table(
+        "chats",
+        *_base_columns(),
+        sa.Column("chat_id", sa.BigInteger(), nullable=False),
+        sa.Column("user_id", sa.BigInteger(), nullable=False),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("message_id", sa.BigInteger(), nullable=False),
+        sa.Column("message_content", sa.Text(), nullable=False),
+        sa.Column("timestamp", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("chat_type", sa.String(), nullable=False),
+        sa.Column("media", sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_chats")),
+    )
+
+    op.create_table(
+        "opportunities",
+        *_base_columns(),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("platform_name", sa.String(), nullable=False),
+        sa.Column("deadline", sa.DateTime(), nullable=False),
+        sa.Column("key_skills", sa.Text(), nullable=True),
+        sa.Column("opportunity_type", sa.String(), nullable=False),
+        sa.Column("location", sa.String(), nullable=True),
+        sa.Column("compensation", sa.String(), nullable=True),
+        sa.Column("know_more_link", sa.String(), nullable=False),
+        sa.Column("platform_id", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_opportunities")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("opportunities")
+    op.drop_table("chats")
@@ -0,0 +1,68 @@
+"""Indexes of the chat history hot paths and unique (chat_id, message_id)
+
+The indexes are built concurrently, so the chats table stays writable while they are created.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+
+"""
+import typing as t
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: t.Union[str, None] = "0001"
+branch_labels: t.Union[str, t.Sequence[str], None] = None
+depends_on: t.Union[str, t.Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the latest copy of messages which were saved more than once
+    op.execute(
+        """
+        DELETE FROM chats AS older
+        USING chats AS newer
+        WHERE older.chat_id = newer.chat_id
+          AND older.message_id = newer.message_id
+          AND older.id < newer.id
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chats_chat_id_created_at",
+            "chats",
+            ["chat_id", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_chats_username_created_at",
+            "chats",
+            ["username", sa.text("created_at DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "uq_chats_chat_id_message_id",
+            "chats",
+            ["chat_id", "message_id"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    # Promote the unique index to a constraint without rebuilding it
+    op.execute(
+        "ALTER TABLE chats ADD CONSTRAINT uq_chats_chat_id_message_id UNIQUE USING INDEX uq_chats_chat_id_message_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint("uq_chats_chat_id_message_id", "chats", type_="unique")
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_chats_username_created_at", table_name="chats", postgresql_concurrently=True, if_exists=True)
+        op.drop_index("ix_chats_chat_id_created_at", table_name="chats", postgresql_concurrently=True, if_exists=True)
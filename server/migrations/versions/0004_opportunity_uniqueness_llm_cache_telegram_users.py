@@ -0,0 +1,89 @@
+"""Unique (platform_name, platform_id) opportunities, LLM cache and Telegram users
+
+The baseline only has the tables created by the former init_db. Databases created by an earlier
+version of 0001 may already have some of these objects, so each one is only created if missing.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 00:00:00
+
+"""
+import typing as t
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: t.Union[str, None] = "0003"
+branch_labels: t.Union[str, t.Sequence[str], None] = None
+depends_on: t.Union[str, t.Sequence[str], None] = None
+
+
+def _base_columns() -> t.List[sa.Column]:
+    """Columns of BaseOrm"""
+    return [
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.text("CURRENT_TIMESTAMP"), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    opportunity_constraints = {constraint["name"] for constraint in inspector.get_unique_constraints("opportunities")}
+    if "uq_opportunities_platform_name_platform_id" not in opportunity_constraints:
+        # Keep the first copy of listings which were saved more than once
+        op.execute(
+            """
+            DELETE FROM opportunities AS newer
+            USING opportunities AS older
+            WHERE newer.platform_name = older.platform_name
+              AND newer.platform_id = older.platform_id
+              AND newer.id > older.id
+            """
+        )
+        op.create_unique_constraint(
+            "uq_opportunities_platform_name_platform_id", "opportunities", ["platform_name", "platform_id"]
+        )
+
+    if not inspector.has_table("llm_cache"):
+        op.create_table(
+            "llm_cache",
+            *_base_columns(),
+            sa.Column("key", sa.String(length=64), nullable=False),
+            sa.Column("model", sa.String(), nullable=False),
+            sa.Column("prompt_version", sa.String(), nullable=False),
+            sa.Column("value", sa.Text(), nullable=False),
+            sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_llm_cache")),
+        )
+        op.create_index(op.f("ix_llm_cache_key"), "llm_cache", ["key"], unique=True)
+        op.create_index(op.f("ix_llm_cache_expires_at"), "llm_cache", ["expires_at"], unique=False)
+        op.create_index(op.f("ix_llm_cache_last_accessed_at"), "llm_cache", ["last_accessed_at"], unique=False)
+
+    if not inspector.has_table("telegram_users"):
+        op.create_table(
+            "telegram_users",
+            *_base_columns(),
+            sa.Column("username", sa.String(), nullable=False),
+            sa.Column("chat_id", sa.BigInteger(), nullable=False),
+            sa.Column("user_id", sa.BigInteger(), nullable=False),
+            sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=False),
+            sa.PrimaryKeyConstraint("id", name=op.f("pk_telegram_users")),
+        )
+        op.create_index(op.f("ix_telegram_users_username"), "telegram_users", ["username"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_telegram_users_username"), table_name="telegram_users")
+    op.drop_table("telegram_users")
+
+    op.drop_index(op.f("ix_llm_cache_last_accessed_at"), table_name="llm_cache")
+    op.drop_index(op.f("ix_llm_cache_expires_at"), table_name="llm_cache")
+    op.drop_index(op.f("ix_llm_cache_key"), table_name="llm_cache")
+    op.drop_table("llm_cache")
+
+    op.drop_constraint("uq_opportunities_platform_name_platform_id", "opportunities", type_="unique")
@@ -0,0 +1,43 @@
+"""Backfill the Telegram username -> chat mapping from the chat history
+
+Users are added to the mapping whenever one of their messages is saved. This adds the users who
+only wrote before the mapping existed, once, so notifications never scan the chat history.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+import typing as t
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config.settings import config
+
+
+revision: str = "0005"
+down_revision: t.Union[str, None] = "0004"
+branch_labels: t.Union[str, t.Sequence[str], None] = None
+depends_on: t.Union[str, t.Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Latest chat of every username, the users already in the mapping are up to date
+    op.execute(
+        sa.text(
+            """
+            INSERT INTO telegram_users (username, chat_id, user_id, last_seen_at)
+            SELECT DISTINCT ON (lower(username)) lower(username), chat_id, user_id, created_at
+            FROM chats
+            WHERE username IS NOT NULL AND username <> :bot_username
+            ORDER BY lower(username), created_at DESC
+            ON CONFLICT (username) DO NOTHING
+            """
+        ).bindparams(bot_username=config.BOT_USERNAME)
+    )
+
+
+def downgrade() -> None:
+    # The backfilled rows can't be told apart from the others, and are harmless
+    pass
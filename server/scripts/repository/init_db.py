@@ -1,62 +1,43 @@
-import asyncio
-from sqlalchemy.ext.asyncio import create_async_engine
-from app.models.core.base import BaseOrm
-from app.config.settings import config
+import os
+
+from alembic import command
+from alembic.config import Config
+
 from app.core.logging import logger
 
-# Import all models to ensure they are registered with the metadata
-from app.models.repository.chat import ChatOrm
-from app.models.repository.opportunity import OpportunityOrm
+
+ALEMBIC_INI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "alembic.ini")
 
 
-async def init_db():
+def init_db(revision: str = "head"):
     """
-    Initialize the database by recreating all tables.
-    
+    Initialize the database by applying the Alembic migrations.
+
     This function performs the following operations:
-    1. Verifies the environment is development
-    2. Creates an async database engine using the configured database URL
-    3. Drops all existing tables to ensure a clean slate
-    4. Creates all tables defined in the application's models
-    5. Logs the progress and completion of the operation
-    
+    1. Loads the Alembic configuration of the server (alembic.ini)
+    2. Applies every migration up to the given revision, using the configured database URL
+    3. Logs the progress and completion of the operation
+
     Use Cases:
-    - Setting up a new development environment
-    - Resetting the database during testing
-    - Recreating tables after schema changes
-    - Database migration and version control
-    
-    Note: This function should only be used in development environments
-    as it will delete all existing data.
-    
-    Example:
-        >>> asyncio.run(init_db())
-        INFO: Dropped all existing tables
-        INFO: Created all tables
-        INFO: Database tables recreated successfully!
-    """
-    # Safety check - only allow in development
-    if config.ENVIRONMENT != "development":
-        logger.error("This script can only be run in development environment!")
-        return
+    - Setting up a new environment
+    - Upgrading an existing database after schema changes
 
-    # Create engine with connection pooling and health checks
-    engine = create_async_engine(
-        config.get_async_database_url(),
-        pool_pre_ping=True
-    )
+    Note: Unlike the former drop/create script, this keeps the existing data and is safe in every
+    environment. A database created by the former script has to be marked as migrated to the
+    baseline once, with `alembic stamp 0001`.
 
-    # Drop all existing tables to ensure clean state
-    async with engine.begin() as conn:
-        await conn.run_sync(BaseOrm.metadata.drop_all)
-        logger.info("Dropped all existing tables")
+    Example:
+        >>> init_db()
+        INFO: Applying database migrations up to head
+        INFO: Database is up to date!
+    """
+    alembic_config = Config(ALEMBIC_INI_PATH)
+    alembic_config.set_main_option("script_location", os.path.join(os.path.dirname(ALEMBIC_INI_PATH), "migrations"))
 
-    # Create all tables based on current model definitions
-    async with engine.begin() as conn:
-        await conn.run_sync(BaseOrm.metadata.create_all)
-        logger.info("Created all tables")
+    logger.info(f"Applying database migrations up to {revision}")
+    command.upgrade(alembic_config, revision)
+    logger.info("Database is up to date!")
 
-    logger.info("Database tables recreated successfully!")
 
 if __name__ == "__main__":
-    asyncio.run(init_db()) 
\ No newline at end of file
+    init_db()
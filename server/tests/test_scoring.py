@@ -0,0 +1,115 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from app.config.settings import Config
+from app.models.opportunity import Opportunity
+from app.service.opportunity.scoring import UserScoringIndex
+from app.types.contract import UserProfile
+
+
+DEFAULT_WEIGHTS = Config.model_fields["OPPORTUNITY_SCORING_WEIGHTS"].default
+DEFAULT_MIN_SCORE = Config.model_fields["OPPORTUNITY_SCORING_MIN_SCORE"].default
+NOW = datetime.datetime.now(datetime.timezone.utc)
+
+
+def user(name, primary_skill, secondary_skill, location, professional_status, years_of_experience, exists=True):
+    return UserProfile(
+        address=f"0x{name}",
+        location=location,
+        primarySkill=primary_skill,
+        secondarySkill=secondary_skill,
+        status="active",
+        language="english",
+        yearsOfExperience=years_of_experience,
+        exists=exists,
+        professionalStatus=professional_status,
+        fullName=name,
+        email=f"{name}@example.com",
+        telegramUsername=name,
+    )
+
+
+def opportunity(key_skills, location, deadline, opportunity_type="job"):
+    return Opportunity(
+        title="Opportunity",
+        description="An opportunity",
+        platform_name="test",
+        deadline=deadline,
+        key_skills=key_skills,
+        opportunity_type=opportunity_type,
+        location=location,
+        know_more_link="https://example.com",
+    )
+
+
+@pytest.fixture
+def index():
+    index = UserScoringIndex(weights=DEFAULT_WEIGHTS)
+    index.build([
+        user("alice", "blockchain", "data_science", "Berlin", "employed", 3),
+        user("bob", "ui_ux_design", "blockchain", "Lagos", "student", 0),
+        user("carol", "data_science", "cybersecurity", "", "", 1),  # Unknown location and status
+        user("dave", "blockchain", "data_science", "Berlin", "employed", 3, exists=False),
+    ])
+    return index
+
+
+def names(matches):
+    return [matched_user.fullName for matched_user, _ in matches]
+
+
+def test_unknown_location_and_status(index):
+    opportunities = [
+        opportunity(["blockchain"], "Lagos, Nigeria", NOW + datetime.timedelta(days=10)),
+        opportunity(["blockchain"], "Remote", NOW + datetime.timedelta(days=10)),
+    ]
+    # Unknown codes are -1, so they pick the extra last column rather than the last known location or status
+    location = index._score_location(opportunities)
+    assert location.tolist() == [[0.0, 1.0, 0.0], [1.0, 1.0, 1.0]]
+    status = index._score_status(opportunities)
+    assert status.tolist() == [[0.7, 0.4, 0.5], [0.7, 0.4, 0.5]]
+
+
+def test_ranking(index):
+    berlin = opportunity(["blockchain"], "Berlin, Germany", NOW + datetime.timedelta(days=10))
+    scores = index.score([berlin], now=NOW)[0]
+    deadline = 1 - 10 / 30
+    assert scores == pytest.approx([
+        0.5 + 0.15 + 0.15 + 0.1 * 0.7 + 0.1 * deadline,  # alice: primary skill, location and experience
+        0.5 * 0.5 + 0.15 * 0.5 + 0.1 * 0.4 + 0.1 * deadline,  # bob: secondary skill, a year short of experience
+        0.15 + 0.1 * 0.5 + 0.1 * deadline,  # carol: experience only
+    ])
+
+    [matches] = index.match([berlin], min_score=0.1, max_users=200)
+    assert names(matches) == ["alice", "bob", "carol"]
+    assert [score for _, score in matches] == pytest.approx(sorted(scores, reverse=True))  # match scores against the current time
+
+
+def test_expired_deadline_scores_zero(index):
+    expired = opportunity(["blockchain"], "Remote", NOW - datetime.timedelta(days=1))
+    assert not index.score([expired]).any()
+    assert index.match([expired], min_score=0.01) == [[]]
+
+
+def test_min_score_and_top_n(index):
+    berlin = opportunity(["blockchain"], "Berlin", NOW + datetime.timedelta(days=10))
+    assert names(index.match([berlin], min_score=DEFAULT_MIN_SCORE)[0]) == ["alice"]
+    assert names(index.match([berlin], min_score=0.1, max_users=2)[0]) == ["alice", "bob"]
+    assert names(index.match([berlin], min_score=0.1, max_users=1)[0]) == ["alice"]
+    assert index.match([berlin], min_score=1.01) == [[]]
+
+
+def test_skill_match_required_with_default_weights():
+    # Everything but the skills at its best: a remote internship closing now, for a student with no experience
+    index = UserScoringIndex(weights=DEFAULT_WEIGHTS)
+    index.build([
+        user("erin", "video_editing", "graphic_design", "Paris", "student", 0),
+        user("frank", "video_editing", "blockchain", "Paris", "student", 0),
+    ])
+    internship = opportunity(["blockchain"], "Remote", NOW, opportunity_type="internship")
+    scores = index.score([internship], now=NOW)[0]
+    assert scores[0] == pytest.approx(1 - DEFAULT_WEIGHTS["skills"])
+    assert scores[0] < DEFAULT_MIN_SCORE <= scores[1]
+    assert np.all(scores <= 1)
@@ -0,0 +1,138 @@
+import os
+
+import numpy as np
+import pytest
+
+from app.models.vector_store import PersistentVectorStore
+
+
+DIMENSION = 4
+
+
+def vectors(*rows):
+    return np.asarray(rows, dtype=np.float32)
+
+
+def make_store():
+    store = PersistentVectorStore(DIMENSION, metadata={"model": "test"})
+    store.add(
+        [1, 2, 3],
+        vectors([1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]),
+        [{"title": "one"}, {"title": "two"}, {"title": "three"}]
+    )
+    return store
+
+
+def log_path(directory):
+    return os.path.join(directory, PersistentVectorStore.LOG_FILENAME)
+
+
+def read_log(directory):
+    with open(log_path(directory), encoding="utf-8") as file:
+        return file.read()
+
+
+def test_add_remove_upsert():
+    store = make_store()
+    assert len(store) == 3
+    assert sorted(store.ids) == [1, 2, 3]
+    assert store.search(vectors([0, 2, 0, 0])[0], top_k=1)[0][0] == 2
+
+    with pytest.raises(ValueError):
+        store.add([1], vectors([1, 1, 0, 0]), [{"title": "duplicate"}])
+
+    assert store.remove([2, 42]) == 1
+    assert 2 not in store and len(store) == 2
+
+    store.upsert([1, 4], vectors([0, 0, 0, 1], [0, 1, 0, 0]), [{"title": "one again"}, {"title": "four"}])
+    assert len(store) == 3
+    assert store.documents[1] == {"title": "one again"}
+    assert store.search(vectors([0, 0, 0, 1])[0], top_k=1)[0][0] == 1
+    assert store.search(vectors([0, 0, 0, 1])[0], top_k=3, ids=[3, 4])[0][0] in (3, 4)
+    assert store.pending_size == 7  # An update per added document, and one per remove
+
+
+def test_flush_then_load(tmp_path):
+    directory = str(tmp_path)
+    store = make_store()
+    store.save(directory)
+    assert store.pending_size == 0
+
+    store.remove([3])
+    store.add([4], vectors([0, 0, 0, 1]), [{"title": "four"}])
+    assert store.flush(directory) == 2
+    assert store.flush(directory) == 0
+    assert store.log_size == 2
+
+    loaded = PersistentVectorStore.load(directory)
+    assert loaded.metadata == {"model": "test"}
+    assert loaded.log_size == 2
+    assert loaded.documents == store.documents
+    assert loaded.search(vectors([0, 0, 0, 1])[0], top_k=1)[0][0] == 4
+
+
+def test_load_drops_truncated_last_line(tmp_path):
+    directory = str(tmp_path)
+    store = make_store()
+    store.save(directory)
+    store.remove([1])
+    store.flush(directory)
+    with open(log_path(directory), "a", encoding="utf-8") as file:
+        file.write('{"op":"remove","ids":[2')  # Cut by a crash while appending
+
+    loaded = PersistentVectorStore.load(directory)
+    assert sorted(loaded.ids) == [2, 3]
+    assert loaded.log_size == 1
+    assert read_log(directory).endswith("\n")
+
+    # The next flush starts on a line of its own
+    loaded.remove([2])
+    loaded.flush(directory)
+    assert sorted(PersistentVectorStore.load(directory).ids) == [3]
+
+
+def test_write_after_mmapped_load(tmp_path):
+    directory = str(tmp_path)
+    make_store().save(directory)
+
+    loaded = PersistentVectorStore.load(directory)
+    assert loaded._mmapped
+    mmapped_index = loaded.index
+
+    loaded.add([4], vectors([0, 0, 0, 1]), [{"title": "four"}])
+    assert not loaded._mmapped
+    assert loaded.index is not mmapped_index
+    assert len(loaded) == 4
+    assert mmapped_index.ntotal == 3  # The file on disk is left untouched
+
+    # Saving over the memory-mapped files keeps the loaded store usable
+    loaded.save(directory)
+    assert loaded.search(vectors([0, 0, 0, 1])[0], top_k=1)[0][0] == 4
+    assert len(PersistentVectorStore.load(directory)) == 4
+
+
+def test_save_empties_log_and_replay_is_idempotent(tmp_path):
+    directory = str(tmp_path)
+    store = make_store()
+    store.save(directory)
+    store.upsert([2], vectors([0, 0, 0, 1]), [{"title": "two again"}])
+    store.remove([3])
+    store.flush(directory)
+    log = read_log(directory)
+
+    store.save(directory)
+    assert store.log_size == 0
+    assert read_log(directory) == ""
+
+    # A crash between the snapshot and emptying the log: the log is replayed over the new snapshot
+    with open(log_path(directory), "w", encoding="utf-8") as file:
+        file.write(log)
+    loaded = PersistentVectorStore.load(directory)
+    assert loaded.documents == store.documents
+    assert len(loaded) == len(store) == 2
+    assert loaded.search(vectors([0, 0, 0, 1])[0], top_k=1)[0][0] == 2
+
+
+def test_load_missing_store(tmp_path):
+    assert not PersistentVectorStore.exists(str(tmp_path))
+    assert PersistentVectorStore.load(str(tmp_path)) is None
@@ -43,24 +43,11 @@ class AutoAnswerMiddleware(BaseMiddleware):
         log_bot_outgoing_message(message, result)
 
         if result is not None:
-            bot_response = "\n".join(result) if isinstance(result, list) else result
-            
-            bot_chat: ChatSchema = ChatSchema(
-                message_content=str(bot_response),
-                chat_id=int(message.chat.id),
-                chat_type=str(message.chat.type),
-                username="avasara_bot",
-                user_id=7259245296,
-                message_id=int(message.message_id) + 1,
-            )
-            await chat_service.save_message(bot_chat)
-            
-            if isinstance(result, list):
-                for item in result:
-                    await message.answer(text=item, disable_web_page_preview=False)
-            else:
-                await message.answer(text=result, disable_web_page_preview=False)
-            
+            # Saved once sent, under the IDs Telegram gave the replies
+            for item in (result if isinstance(result, list) else [result]):
+                reply = await message.answer(text=item, disable_web_page_preview=False)
+                await chat_service.save_reply(reply, item)
+
             return None
 
 
@@ -20,10 +20,27 @@ class Config(BaseSettings):
     RABBITMQ_EXCHANGE_NAME: str = "default_exchange"
     RABBITMQ_EXCHANGE_TYPE: str = "direct"
     RABBITMQ_URL: str = ""  # For CloudAMQP or other managed services
+    RABBITMQ_CHANNEL_POOL_SIZE: int = 10 # Channels are held for a whole publish/consume, so consumers count too
+    RABBITMQ_PREFETCH_COUNT: int = 50 # Max unacknowledged deliveries per consumer
+    RABBITMQ_CONSUMER_CONCURRENCY: int = 10 # Messages processed at once per consumer
+    RABBITMQ_MAX_RETRIES: int = 3 # Retries of a failed message before it goes to the dead letter queue
+    RABBITMQ_RETRY_DELAY_SECONDS: float = 30.0
 
     # Server Configuration
     API_URL: str = "http://localhost:8000/"
 
+    # Agent Configuration
+    AGENT_STREAM_TIMEOUT_SECONDS: float = 120.0 # Max duration of a streamed answer
+    AGENT_STREAM_EDIT_INTERVAL_SECONDS: float = 1.0 # Min time between two edits of a streamed answer
+
+    # Notification Configuration
+    CHAT_ID_CACHE_SIZE: int = 10000
+    CHAT_ID_CACHE_TTL_SECONDS: int = 60 * 60 # Username -> chat ID resolutions are reused for this time
+    CHAT_ID_LOOKUP_TIMEOUT_SECONDS: float = 10.0 # Max duration of a username -> chat ID lookup on the server
+    TELEGRAM_GLOBAL_MESSAGES_PER_SECOND: float = 30 # Telegram's global flood limit of a bot
+    TELEGRAM_PER_CHAT_INTERVAL_SECONDS: float = 1.0 # Telegram's flood limit of a single chat
+    TELEGRAM_MAX_FLOOD_RETRIES: int = 10 # Flood waits (429) a message goes through before failing
+
     # Frontend Configuration
     FRONTEND_URL: str = "http://localhost:3000"
 
@@ -1,12 +1,17 @@
 from aiogram import types
+from aiogram.enums import ChatAction
 
 from app.bot_controller.router import Router
 from app.core.config import config
+from app.core.logging import logger
+from app.helpers.message_stream import TelegramMessageStream
 from app.services.server.agent import AgentService
+from app.services.server.chat import ChatService
 
 
 question_router = Router(name=__name__)
 agent_service = AgentService()
+chat_service = ChatService()
 
 
 # Default handler for all messages
@@ -15,5 +20,22 @@ async def ask_question(message: types.Message):
     chat_id = message.chat.id
     question = message.text
 
-    answer = agent_service.ask_question(chat_id, question)
-    return answer
+    # The answer is sent while it is streamed, and saved under the IDs of its replies, so nothing is returned
+    await message.bot.send_chat_action(chat_id=chat_id, action=ChatAction.TYPING)
+    stream = TelegramMessageStream(message)
+    try:
+        async for delta in agent_service.stream_answer(chat_id, question):
+            await stream.append(delta)
+        await stream.finish()
+    except Exception as e:
+        logger.error(f"Error streaming answer to chat {chat_id}: {e}")
+        if not stream.is_started:
+            return "Sorry, I couldn't answer your question right now. Please try again later."
+        await stream.interrupt()
+
+    for reply, text in stream.replies:
+        try:
+            await chat_service.save_reply(reply, text)
+        except Exception as e:
+            logger.error(f"Error saving answer to chat {chat_id}: {e}")
+    return None
@@ -0,0 +1,49 @@
+import typing as t
+import time
+from collections import OrderedDict
+
+
+K = t.TypeVar("K")
+V = t.TypeVar("V")
+
+
+class LRUTTLCache(t.Generic[K, V]):
+    """In-memory cache keeping at most `max_size` least recently used entries, each alive for `ttl_seconds`.
+
+    Usage:
+        ```python
+        cache = LRUTTLCache[str, int](max_size=1000, ttl_seconds=3600)
+        cache.set("john_doe", 123)
+        cache.get("john_doe")  # 123, or None once expired or evicted
+        ```
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[K, t.Tuple[float, V]]" = OrderedDict()  # key -> (expires at, value)
+
+    def get(self, key: K) -> t.Optional[V]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,97 @@
+import asyncio
+import time
+import typing as t
+
+from aiogram import types
+from aiogram.exceptions import TelegramRetryAfter
+
+from app.core.config import config
+from app.core.logging import logger
+
+
+class TelegramMessageStream:
+    """Reply to a message with a text which arrives in pieces, by progressively editing the reply.
+
+    The first piece is sent right away, then the reply is edited at most once every
+    `edit_interval_seconds` (Telegram limits the edits of a chat). A text longer than a Telegram
+    message continues in a new reply. `replies` holds every reply sent, with the text it shows,
+    e.g. to save them under the IDs Telegram gave them.
+
+    Usage:
+        ```python
+        stream = TelegramMessageStream(message)
+        async for delta in agent_service.stream_answer(chat_id, question):
+            await stream.append(delta)
+        await stream.finish()  # or stream.interrupt() if the text stopped arriving midway
+        ```
+    """
+    MAX_MESSAGE_LENGTH = 4096
+    INTERRUPTED_NOTICE = "\n\n[Answer interrupted, please ask again]"
+
+    def __init__(self, message: types.Message, edit_interval_seconds: float = config.AGENT_STREAM_EDIT_INTERVAL_SECONDS):
+        self.message = message
+        self.edit_interval_seconds = edit_interval_seconds
+        self.text = ""  # Whole text received so far
+
+        self.replies: t.List[t.Tuple[types.Message, str]] = []  # Every reply sent, with the text it shows
+
+        self._reply: t.Optional[types.Message] = None
+        self._reply_text = ""  # Text of the current reply, once shown
+        self._shown_text = ""  # Text Telegram currently shows in the current reply
+        self._shown_at = 0.0
+
+    @property
+    def is_started(self) -> bool:
+        return self._reply is not None
+
+    async def append(self, delta: str) -> None:
+        """
+        Add a piece of text, and show it if the reply wasn't edited recently.
+        """
+        self.text += delta
+        self._reply_text += delta
+
+        while len(self._reply_text) > self.MAX_MESSAGE_LENGTH:
+            await self._show(self._reply_text[:self.MAX_MESSAGE_LENGTH], wait=True)
+            self._reply_text = self._reply_text[self.MAX_MESSAGE_LENGTH:]
+            self._reply, self._shown_text = None, ""
+
+        if time.monotonic() - self._shown_at >= self.edit_interval_seconds:
+            await self._show(self._reply_text)
+
+    async def finish(self) -> None:
+        """
+        Show the whole text once every piece has arrived.
+        """
+        await self._show(self._reply_text, wait=True)
+
+    async def interrupt(self) -> None:
+        """
+        Show the text received so far, followed by a notice that it is incomplete.
+        """
+        await self.append(self.INTERRUPTED_NOTICE)
+        await self.finish()
+
+    async def _show(self, text: str, wait: bool = False) -> None:
+        """Send or edit the reply. Flood limited updates are skipped, unless `wait` is set"""
+        if not text.strip() or text == self._shown_text:
+            return
+
+        while True:
+            try:
+                if self._reply is None:
+                    self._reply = await self.message.answer(text=text)
+                    self.replies.append((self._reply, text))
+                else:
+                    await self._reply.edit_text(text=text)
+                    self.replies[-1] = (self._reply, text)
+                self._shown_text = text
+                break
+            except TelegramRetryAfter as e:
+                logger.warning(f"Flood limit reached while streaming to chat {self.message.chat.id}, retry after {e.retry_after} seconds")
+                if not wait:
+                    self._shown_at = time.monotonic() + e.retry_after - self.edit_interval_seconds
+                    return
+                await asyncio.sleep(e.retry_after)
+
+        self._shown_at = time.monotonic()
@@ -1,6 +1,7 @@
 import asyncio
 
 from app.core.logging import logger
+from app.handlers.question import agent_service
 from app.provider.bot_controller import get_bot_controller
 from app.utils.server_consumer import ServerConsumer
 
@@ -11,7 +12,10 @@ async def start_bot() -> None:
 
 async def start_server_consumer() -> None:
     server_consumer = ServerConsumer()
-    await server_consumer.start_consuming()
+    try:
+        await server_consumer.start_consuming()
+    finally:
+        await server_consumer.close()
 
 
 async def main() -> None:
@@ -24,6 +28,8 @@ async def main() -> None:
         logger.info("Shutting down gracefully...")
     except Exception as e:
         logger.error(f"An error occurred: {e}")
+    finally:
+        await agent_service.close()
 
 
 if __name__ == "__main__":
@@ -16,6 +16,11 @@ class RabbitMQConfig:
     virtual_host: str = config.RABBITMQ_VIRTUAL_HOST
     exchange_name: str = config.RABBITMQ_EXCHANGE_NAME
     exchange_type: ExchangeType = ExchangeType.DIRECT
+    channel_pool_size: int = config.RABBITMQ_CHANNEL_POOL_SIZE
+    prefetch_count: int = config.RABBITMQ_PREFETCH_COUNT
+    consumer_concurrency: int = config.RABBITMQ_CONSUMER_CONCURRENCY
+    max_retries: int = config.RABBITMQ_MAX_RETRIES
+    retry_delay_seconds: float = config.RABBITMQ_RETRY_DELAY_SECONDS
 
     def __post_init__(self):
         """Convert exchange_type string to ExchangeType enum"""
@@ -23,6 +28,16 @@ class RabbitMQConfig:
             self.exchange_type = ExchangeType[self.exchange_type.upper()]
 
 
+@dataclass
+class RabbitMQPoolStats:
+    """Utilization of the RabbitMQ channel pool"""
+    connection_open: bool
+    max_channels: int
+    channels_created: int
+    channels_in_use: int
+    channels_waiting: int
+
+
 @dataclass
 class RabbitMQMessage:
     """RabbitMQ message structure"""
@@ -36,4 +51,5 @@ class OpportunityNotification(BaseModel):
     """Opportunity notification data"""
     username: str
     message: str
+    chat_id: Optional[int] = None  # Resolved by the server when known
     timestamp: datetime = datetime.utcnow().isoformat()
\ No newline at end of file
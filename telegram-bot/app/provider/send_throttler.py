@@ -0,0 +1,33 @@
+"""Send throttler provider
+
+This module provides a send throttler instance for the application, so every notification shares the same
+flood limits. (Telegram's limits apply to the bot as a whole, not to a single sender)
+"""
+
+import typing as t
+
+from app.core.logging import logger
+from app.core.config import config
+from app.provider.bot import get_bot
+from app.services.notification.throttler import TelegramSendThrottler
+
+
+_send_throttler: t.Optional[TelegramSendThrottler] = None
+
+
+def get_send_throttler() -> TelegramSendThrottler:
+    """Lazy initialization of the send throttler instance using a singleton pattern.
+
+    Returns:
+        TelegramSendThrottler: The singleton send throttler instance
+    """
+    global _send_throttler
+    if _send_throttler is None:
+        logger.info("Initializing the TelegramSendThrottler instance, first time.")
+        _send_throttler = TelegramSendThrottler(
+            bot=get_bot(),
+            global_rate=config.TELEGRAM_GLOBAL_MESSAGES_PER_SECOND,
+            per_chat_interval=config.TELEGRAM_PER_CHAT_INTERVAL_SECONDS,
+            max_flood_retries=config.TELEGRAM_MAX_FLOOD_RETRIES
+        )
+    return _send_throttler
@@ -8,8 +8,8 @@ class BaseNotificationService(ABC):
     """
 
     @abstractmethod
-    def send_notification(self, message: str) -> None:
+    async def send_notification(self, username: str, message: str) -> None:
         """
-        Send a notification
+        Send a notification to a user
         """
         pass
@@ -1,18 +1,22 @@
 import json
-from typing import Any, Callable, Optional
-from aio_pika import connect_robust, Message, Exchange, Channel, Connection
+import asyncio
+import inspect
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Hashable, Optional, Set
+from aio_pika import connect_robust, Message, Exchange, Channel, Connection, DeliveryMode
+from aio_pika.abc import AbstractIncomingMessage
 from aio_pika.pool import Pool
 
 from app.core.logging import logger
-from app.models.rabbitmq import RabbitMQConfig, RabbitMQMessage
+from app.models.rabbitmq import RabbitMQConfig, RabbitMQMessage, RabbitMQPoolStats
 
 
 class RabbitMQService:
     """RabbitMQ service for handling message queue operations.
 
     This service provides a robust interface for interacting with RabbitMQ, including:
-    - Connection pooling for efficient resource management
-    - Channel pooling for concurrent operations
+    - A single robust connection, shared by all the channels
+    - Channel pooling for concurrent operations (a channel is held for the whole publish/consume)
     - Exchange declaration and management
     - Message publishing and consumption
 
@@ -43,29 +47,67 @@ class RabbitMQService:
     def __init__(self, config: Optional[RabbitMQConfig] = None):
         """Initialize RabbitMQ service"""
         self.config = config or RabbitMQConfig()
-        self.connection_pool: Optional[Pool[Connection]] = None
+        self.connection: Optional[Connection] = None
         self.channel_pool: Optional[Pool[Channel]] = None
-        self.exchange: Optional[Exchange] = None
+        self._connection_lock = asyncio.Lock()
+        self._exchange_declared = False
+        self._settlements: Set[asyncio.Task] = set()  # Acknowledgements waiting for the deliveries returned by the callbacks
+
+        # Pool utilization
+        self._channels_created = 0
+        self._channels_in_use = 0
+        self._channels_waiting = 0
 
     async def _get_connection(self) -> Connection:
-        """Get a connection from the pool"""
-        if not self.connection_pool:
-            self.connection_pool = Pool(
-                self._create_connection,
-                max_size=5
-            )
-        async with self.connection_pool.acquire() as connection:
-            return connection
+        """Get the robust connection shared by all the channels, opening it on first use"""
+        async with self._connection_lock:
+            if self.connection is None or self.connection.is_closed:
+                self.connection = await self._create_connection()
+                logger.info("Opened RabbitMQ connection")
+        return self.connection
 
-    async def _get_channel(self) -> Channel:
-        """Get a channel from the pool"""
+    @asynccontextmanager
+    async def acquire_channel(self) -> AsyncIterator[Channel]:
+        """
+        Hold a channel of the pool for the duration of the block.
+
+        Example:
+            async with rabbitmq.acquire_channel() as channel:
+                await channel.declare_queue("queue_name", durable=True)
+        """
         if not self.channel_pool:
             self.channel_pool = Pool(
                 self._create_channel,
-                max_size=5
+                max_size=self.config.channel_pool_size
             )
-        async with self.channel_pool.acquire() as channel:
-            return channel
+
+        self._channels_waiting += 1
+        acquired = False
+        try:
+            async with self.channel_pool.acquire() as channel:
+                self._channels_waiting -= 1
+                acquired = True
+                self._channels_in_use += 1
+                try:
+                    if channel.is_closed:
+                        await channel.reopen()
+                    yield channel
+                finally:
+                    self._channels_in_use -= 1
+        finally:
+            if not acquired:
+                self._channels_waiting -= 1
+
+    @property
+    def pool_stats(self) -> RabbitMQPoolStats:
+        """Utilization of the channel pool"""
+        return RabbitMQPoolStats(
+            connection_open=self.connection is not None and not self.connection.is_closed,
+            max_channels=self.config.channel_pool_size,
+            channels_created=self._channels_created,
+            channels_in_use=self._channels_in_use,
+            channels_waiting=self._channels_waiting
+        )
 
     async def _create_connection(self) -> Connection:
         """Create a new RabbitMQ connection"""
@@ -78,20 +120,23 @@ class RabbitMQService:
         )
 
     async def _create_channel(self) -> Channel:
-        """Create a new channel"""
+        """Create a new channel with publisher confirms enabled"""
         connection = await self._get_connection()
-        return await connection.channel()
+        channel = await connection.channel(publisher_confirms=True)
+        self._channels_created += 1
+        return channel
 
-    async def _get_exchange(self) -> Exchange:
-        """Get or create the exchange"""
-        if not self.exchange:
-            channel = await self._get_channel()
-            self.exchange = await channel.declare_exchange(
+    async def _get_exchange(self, channel: Channel) -> Exchange:
+        """Get the exchange on the given channel, declaring it on first use"""
+        if not self._exchange_declared:
+            exchange = await channel.declare_exchange(
                 self.config.exchange_name,
                 self.config.exchange_type,
                 durable=True
             )
-        return self.exchange
+            self._exchange_declared = True
+            return exchange
+        return await channel.get_exchange(self.config.exchange_name, ensure=False)
 
     async def publish(self, message: RabbitMQMessage) -> None:
         """
@@ -112,68 +157,196 @@ class RabbitMQService:
             await rabbitmq.publish(message)
         """
         try:
-            exchange = await self._get_exchange()
-            await exchange.publish(
-                Message(
-                    body=json.dumps(message.body).encode(),
-                    headers=message.headers or {}
-                ),
-                routing_key=message.routing_key
-            )
+            async with self.acquire_channel() as channel:
+                exchange = await self._get_exchange(channel)
+                await exchange.publish(
+                    Message(
+                        body=json.dumps(message.body).encode(),
+                        headers=message.headers or {}
+                    ),
+                    routing_key=message.routing_key
+                )
             logger.debug(f"Published message: {message.body}")
         except Exception as e:
             logger.error(f"Error publishing message: {str(e)}")
             raise
 
-    async def consume(self, queue_name: str, callback: Callable[[Any], None]) -> None:
+    async def consume(
+        self,
+        queue_name: str,
+        callback: Callable[[Any], None],
+        ordering_key: Optional[Callable[[Any], Hashable]] = None,
+        pass_headers: bool = False
+    ) -> None:
         """
         Consume messages from a RabbitMQ queue and process them with callback.
 
+        Up to `consumer_concurrency` messages are processed at once, out of at most `prefetch_count`
+        unacknowledged deliveries. Messages with the same ordering key are always handled by the
+        same worker, so they are processed in the order they were received.
+
+        A callback may return an awaitable of the outcome of the message (e.g. the future of a
+        queued send): the message is then acknowledged once it completes, and the worker moves on
+        to the next message right away.
+
         Args:
             queue_name (str): Name of the queue to consume from
             callback (Callable[[Any], None]): Async function to process messages
+            ordering_key (Optional[Callable[[Any], Hashable]]): Get the key of a message body whose
+                messages must be processed in order (e.g. the chat). Without it, messages are not ordered.
+            pass_headers (bool): Call the callback with the message headers as second argument
 
         Example:
             async def process_message(message):
                 print(f"Received: {message}")
 
-            await rabbitmq.consume("user_events", process_message)
+            await rabbitmq.consume("user_events", process_message, ordering_key=lambda body: body["user_id"])
 
         Note:
             - Queue is declared as durable
-            - Messages are automatically acknowledged after callback completes
-            - Exceptions in callback will be logged and re-raised
+            - Messages are acknowledged after callback completes (or the awaitable it returned)
+            - Messages whose callback fails are retried through `<queue_name>.retry` after
+              `retry_delay_seconds`, and moved to `<queue_name>.dead` after `max_retries` retries
         """
         try:
-            channel = await self._get_channel()
-            exchange = await self._get_exchange()
-
-            # Declare queue
-            queue = await channel.declare_queue(queue_name, durable=True)
-            await queue.bind(exchange, queue_name)
-
-            logger.info(f"Started consuming from queue: {queue_name}")
-
-            async with queue.iterator() as queue_iter:
-                async for message in queue_iter:
-                    async with message.process():
-                        try:
-                            body = json.loads(message.body.decode())
-                            await callback(body)
-                        except Exception as e:
-                            logger.error(f"Error processing message: {str(e)}")
-                            raise
+            async with self.acquire_channel() as channel:
+                await channel.set_qos(prefetch_count=self.config.prefetch_count)
+                exchange = await self._get_exchange(channel)
+
+                # Declare queue
+                queue = await channel.declare_queue(queue_name, durable=True)
+                await queue.bind(exchange, queue_name)
+                await self._declare_retry_queues(channel, exchange, queue_name)
+
+                worker_queues = [asyncio.Queue() for _ in range(self.config.consumer_concurrency)]
+                workers = [
+                    asyncio.create_task(self._consume_worker(exchange, queue_name, worker_queue, callback, pass_headers))
+                    for worker_queue in worker_queues
+                ]
+                logger.info(f"Started consuming from queue: {queue_name} with {len(workers)} workers")
+
+                try:
+                    async with queue.iterator() as queue_iter:
+                        async for message in queue_iter:
+                            try:
+                                body = json.loads(message.body.decode())
+                            except Exception as e:
+                                logger.error(f"Error decoding message: {str(e)}")
+                                await self._dead_letter(exchange, queue_name, message, e, retry=False)
+                                continue
+
+                            try:
+                                key = ordering_key(body) if ordering_key else message.delivery_tag
+                                worker_queue = worker_queues[hash(key) % len(worker_queues)]
+                            except Exception as e:
+                                logger.error(f"Error getting the ordering key of message: {str(e)}")
+                                await self._dead_letter(exchange, queue_name, message, e, retry=False)
+                                continue
+
+                            worker_queue.put_nowait((message, body))
+                finally:
+                    # Unacknowledged messages are redelivered by the broker
+                    for worker in workers:
+                        worker.cancel()
         except Exception as e:
             logger.error(f"Error consuming messages: {str(e)}")
             raise
 
+    async def _declare_retry_queues(self, channel: Channel, exchange: Exchange, queue_name: str) -> None:
+        """
+        Declare the retry queue, which sends messages back to `queue_name` once their delay expired,
+        and the dead letter queue, where messages are parked after their last retry.
+        """
+        retry_queue = await channel.declare_queue(
+            f"{queue_name}.retry",
+            durable=True,
+            arguments={
+                "x-message-ttl": int(self.config.retry_delay_seconds * 1000),
+                "x-dead-letter-exchange": self.config.exchange_name,
+                "x-dead-letter-routing-key": queue_name,
+            }
+        )
+        await retry_queue.bind(exchange, f"{queue_name}.retry")
+
+        dead_letter_queue = await channel.declare_queue(f"{queue_name}.dead", durable=True)
+        await dead_letter_queue.bind(exchange, f"{queue_name}.dead")
+
+    async def _consume_worker(
+        self,
+        exchange: Exchange,
+        queue_name: str,
+        messages: asyncio.Queue,
+        callback: Callable[[Any], None],
+        pass_headers: bool = False
+    ) -> None:
+        """Process the messages dispatched to this worker, one at a time"""
+        while True:
+            message, body = await messages.get()
+            try:
+                if pass_headers:
+                    result = await callback(body, dict(message.headers or {}))
+                else:
+                    result = await callback(body)
+
+                if inspect.isawaitable(result):
+                    settlement = asyncio.create_task(self._settle(exchange, queue_name, message, result))
+                    self._settlements.add(settlement)
+                    settlement.add_done_callback(self._settlements.discard)
+                else:
+                    await message.ack()
+            except Exception as e:
+                logger.error(f"Error processing message: {str(e)}")
+                await self._dead_letter(exchange, queue_name, message, e)
+            finally:
+                messages.task_done()
+
+    async def _settle(self, exchange: Exchange, queue_name: str, message: AbstractIncomingMessage, delivery: Awaitable) -> None:
+        """Acknowledge a message once the delivery returned by its callback completed"""
+        try:
+            await delivery
+            await message.ack()
+        except Exception as e:
+            logger.error(f"Error processing message: {str(e)}")
+            await self._dead_letter(exchange, queue_name, message, e)
+
+    async def _dead_letter(
+        self,
+        exchange: Exchange,
+        queue_name: str,
+        message: AbstractIncomingMessage,
+        error: Exception,
+        retry: bool = True
+    ) -> None:
+        """Send a failed message to the retry queue, or to the dead letter queue once it is out of retries"""
+        headers = dict(message.headers or {})
+        retries = int(headers.get("x-retry-count", 0))
+        retry = retry and retries < self.config.max_retries
+        routing_key = f"{queue_name}.retry" if retry else f"{queue_name}.dead"
+
+        headers.update({"x-retry-count": retries + 1, "x-last-error": str(error)[:255]})
+        try:
+            # Only acknowledged once the broker confirmed the copy, so a failed republish is never lost
+            await exchange.publish(
+                Message(body=message.body, headers=headers, delivery_mode=DeliveryMode.PERSISTENT),
+                routing_key=routing_key
+            )
+            await message.ack()
+            logger.warning(f"Moved failed message to {routing_key} (retry {retries + 1})")
+        except Exception as e:
+            logger.error(f"Error moving failed message to {routing_key}: {str(e)}")
+            await message.nack(requeue=True)
+
     async def close(self) -> None:
         """Close all connections and channels"""
         try:
             if self.channel_pool:
                 await self.channel_pool.close()
-            if self.connection_pool:
-                await self.connection_pool.close()
+                self.channel_pool = None
+            if self.connection:
+                await self.connection.close()
+                self.connection = None
+            self._exchange_declared = False
+            self._channels_created = 0
             logger.info("Closed all RabbitMQ connections")
         except Exception as e:
             logger.error(f"Error closing connections: {str(e)}")
@@ -1,92 +1,122 @@
 import typing as t
-import json
+import asyncio
+
+import aiohttp
 
 from app.core.logging import logger
+from app.core.config import config
+from app.helpers.cache import LRUTTLCache
 from app.types.base import BackendAPIResponse
 
 from app.services.core.notification import BaseNotificationService
-from app.services.core.api import APIService
-from app.services.notification.routes import TelegramAPIRoutes, UserAPIRoutes
+from app.services.notification.routes import UserAPIRoutes
 
-from app.provider.bot_controller import get_bot_controller
 from app.provider.bot import get_bot
+from app.provider.send_throttler import get_send_throttler
+
+
+# Shared by every instance, keyed by lowercased username (Telegram usernames are case insensitive)
+_chat_id_cache = LRUTTLCache[str, int](max_size=config.CHAT_ID_CACHE_SIZE, ttl_seconds=config.CHAT_ID_CACHE_TTL_SECONDS)
 
 
 class TelegramNotificationService(BaseNotificationService):
     """Telegram notification service for sending messages to users via Telegram.
 
-    This service handles sending notifications to specific Telegram users by their username.
-    It manages the bot controller lifecycle and provides methods for sending formatted messages.
+    This service handles sending notifications to Telegram users by their username.
+    It sends through the singleton bot (and so its single aiohttp session) alongside the running
+    dispatcher, without stopping the poller. A single instance is meant to be shared, and
+    `send_notification` can be called concurrently.
 
-    Attributes:
-        username (str): The Telegram username to send notifications to
-        chat_id (Optional[int]): The chat ID associated with the username, initialized during service setup
+    Chat IDs are resolved through an in-memory LRU cache, in front of the server lookup, which is
+    made with an aiohttp session so concurrent lookups neither block the event loop nor share a
+    blocking client across threads.
+    Messages go through the shared send throttler, which keeps them under Telegram's flood limits.
     """
 
-    def __init__(self, username: str):
-        """Initialize the Telegram notification service.
+    def __init__(self):
+        """Initialize the Telegram notification service."""
+        self._bot = get_bot()
+        self._send_throttler = get_send_throttler()
+        self._session: t.Optional[aiohttp.ClientSession] = None
+
+    async def send_notification(
+        self,
+        username: str,
+        message: str,
+        chat_id: t.Optional[int] = None,
+        priority: str = "normal"
+    ) -> None:
+        """Send a notification message to the user, and wait until it is sent.
 
         Args:
-            username (str): The Telegram username to send notifications to
+            username (str): The Telegram username to send the notification to
+            message (str): The message to send, supports Markdown formatting
+            chat_id (Optional[int]): The chat ID of the user, if already known
+            priority (str): Lane of the message in the send throttler ("high", "normal" or "low")
+
+        Raises:
+            ValueError: If the chat ID cannot be found for the given username
+            Exception: The error of the last attempt, if the message could not be sent
         """
-        self._bot_controller = get_bot_controller()
-        self._bot = get_bot()
-        
-        self.username: str = username
-        self.chat_id: t.Optional[int] = None
-        self.telegram_api: APIService[TelegramAPIRoutes] = None
-        self.user_api: APIService[UserAPIRoutes] = None
+        delivery = await self.queue_notification(username, message, chat_id=chat_id, priority=priority)
+        await delivery
+        logger.info(f"Sent notification to {username}: {message}")
+
+    async def queue_notification(
+        self,
+        username: str,
+        message: str,
+        chat_id: t.Optional[int] = None,
+        priority: str = "normal"
+    ) -> asyncio.Future:
+        """Resolve the chat of the user and queue the notification in the send throttler, without waiting for it to be sent.
 
-    async def initialize(self) -> None:
-        """Initialize the service by getting the chat ID for the username.
+        Args:
+            username (str): The Telegram username to send the notification to
+            message (str): The message to send, supports Markdown formatting
+            chat_id (Optional[int]): The chat ID of the user, if already known
+            priority (str): Lane of the message in the send throttler ("high", "normal" or "low")
 
-        This method:
-        1. Temporarily stops the bot controller to prevent message conflicts
-        2. Attempts to find the chat ID for the given username
-        3. Raises an error if the chat ID cannot be found
+        Returns:
+            asyncio.Future: Resolved once the message is sent, or with the error of its last attempt
 
         Raises:
             ValueError: If the chat ID cannot be found for the given username
         """
-        await self._bot_controller.close()
-
-        self.telegram_api = APIService[TelegramAPIRoutes](
-            service_name="telegram",
-            base_url=TelegramAPIRoutes.BASE
-        )
-        self.user_api = APIService[UserAPIRoutes](
-            service_name="user",
-            base_url=UserAPIRoutes.BASE
-        )
+        if chat_id is not None:
+            _chat_id_cache.set(username.lower(), chat_id)
+        else:
+            chat_id = await self.get_chat_id(username)
 
-        self.chat_id = await self._get_chat_id_from_username(self.username)
-        if self.chat_id is None:
-            logger.error(f"Chat ID not found for username: {self.username}. Might be the user has not started the bot yet.")
-            raise ValueError(f"Chat ID not found for username: {self.username}. Might be the user has not started the bot yet.")
+        if chat_id is None:
+            logger.error(f"Chat ID not found for username: {username}. Might be the user has not started the bot yet.")
+            raise ValueError(f"Chat ID not found for username: {username}. Might be the user has not started the bot yet.")
 
-    async def send_notification(self, message: str) -> None:
-        """Send a notification message to the user.
-
-        Args:
-            message (str): The message to send, supports Markdown formatting
-        """
-        await self._bot.send_message(
-            chat_id=self.chat_id,
+        return self._send_throttler.enqueue_message(
+            chat_id=chat_id,
             text=message,
+            priority=priority,
             parse_mode="Markdown"
         )
-        logger.info(f"Sent notification to {self.username}: {message}")
 
-    async def _get_updates(self) -> t.List[t.Any]:
-        """Get updates from the Telegram bot.
+    async def get_chat_id(self, username: str) -> t.Optional[int]:
+        """Get the chat ID for a given Telegram username, from the cache when possible.
+
+        Args:
+            username (str): The Telegram username to find the chat ID for
 
         Returns:
-            List[t.Any]: A list of updates from the bot
+            Optional[int]: The chat ID if found, None otherwise
         """
-        return self.telegram_api.get(TelegramAPIRoutes.GET_UPDATES)
-    
+        chat_id = _chat_id_cache.get(username.lower())
+        if chat_id is None:
+            chat_id = await self._get_chat_id_from_username(username)
+            if chat_id is not None:
+                _chat_id_cache.set(username.lower(), chat_id)
+        return chat_id
+
     async def _get_chat_id_from_username(self, username: str) -> t.Optional[int]:
-        """Get the chat ID for a given Telegram username.
+        """Get the chat ID for a given Telegram username from the server.
 
         Args:
             username (str): The Telegram username to find the chat ID for
@@ -94,31 +124,38 @@ class TelegramNotificationService(BaseNotificationService):
         Returns:
             Optional[int]: The chat ID if found, None otherwise
         """
+        url = f"{UserAPIRoutes.BASE.value}{UserAPIRoutes.GET_CHAT_ID_BY_USERNAME.value}"
         try:
-            chat_id: BackendAPIResponse[int] = self.user_api.get(UserAPIRoutes.GET_CHAT_ID_BY_USERNAME, params={"telegram_username": username})
+            async with self._get_session().get(url, params={"telegram_username": username}) as response:
+                response.raise_for_status()
+                chat_id: BackendAPIResponse[int] = await response.json()
             return chat_id["data"]
         except Exception as e:
             logger.error(f"Error getting chat ID for username: {username}. Error: {e}")
             return None
-    
-    async def end(self) -> None:
-        """End the service by restarting the bot controller.
 
-        This method restarts the bot controller to resume normal bot operation
-        after sending notifications.
-        """
-        await self._bot_controller.start()
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the HTTP session, as it has to be created within the event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=config.CHAT_ID_LOOKUP_TIMEOUT_SECONDS)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the HTTP session used for the chat ID lookups."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
 
 if __name__ == "__main__":
-    import asyncio
-    
     async def main():
-        notification_service = TelegramNotificationService(username="thatsmeadarsh")
-        await notification_service.initialize()  # Initialize before use
-        await notification_service.send_notification("Hello world! *bold* _italic_ [link](https://www.google.com)")
-        print("Notification sent!")
+        notification_service = TelegramNotificationService()
+        try:
+            await notification_service.send_notification("thatsmeadarsh", "Hello world! *bold* _italic_ [link](https://www.google.com)")
+            print("Notification sent!")
+        finally:
+            await notification_service.close()
 
     asyncio.run(main())
-
-
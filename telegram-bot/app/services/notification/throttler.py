@@ -0,0 +1,221 @@
+import typing as t
+import asyncio
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.types import Message
+
+from app.core.logging import logger
+
+
+PRIORITIES = ("high", "normal", "low")
+DEFAULT_PRIORITY = "normal"
+
+
+@dataclass
+class _PendingSend:
+    chat_id: int
+    text: str
+    priority: str
+    kwargs: t.Dict[str, t.Any]
+    future: asyncio.Future
+    sequence: int = field(default=0)  # Order in which the message was queued
+    attempts: int = field(default=0)
+
+
+class TelegramSendThrottler:
+    """Send scheduler keeping outgoing messages under Telegram's flood limits.
+
+    Every message goes through:
+    - A global token bucket of `global_rate` messages per second
+    - A per-chat minimum interval of `per_chat_interval` seconds
+    - Per-chat order: the messages of a chat are sent in the order they were queued, whatever their lane
+    - Priority lanes: among the chats which can receive a message, the one whose next message is in
+      the highest lane is served first
+
+    When Telegram answers with a flood wait (`retry_after`), sending is paused for that time and the
+    message is put back at the front of its lane and chat, so nothing is dropped or reordered.
+
+    Usage:
+        ```python
+        throttler = get_send_throttler()
+        await throttler.send_message(chat_id, "Hello!", priority="high", parse_mode="Markdown")
+
+        # Or queue it without waiting, e.g. to acknowledge the source of the message once it is sent
+        future = throttler.enqueue_message(chat_id, "Hello!", priority="low")
+        ```
+
+    Args:
+        bot (Bot): The bot to send the messages with
+        global_rate (float): Maximum messages per second across all chats
+        per_chat_interval (float): Minimum seconds between two messages of the same chat
+        max_flood_retries (int): Maximum flood wait retries of a message before it fails
+    """
+
+    def __init__(self, bot: Bot, global_rate: float, per_chat_interval: float, max_flood_retries: int):
+        self._bot = bot
+        self.global_rate = global_rate
+        self.per_chat_interval = per_chat_interval
+        self.max_flood_retries = max_flood_retries
+
+        self._lanes: t.Dict[str, t.Deque[_PendingSend]] = {priority: deque() for priority in PRIORITIES}
+        self._chat_queues: t.Dict[int, t.Deque[int]] = {}  # chat -> sequences of its queued messages, oldest first
+        self._sequence = itertools.count()
+        self._chat_ready_at: t.Dict[int, float] = {}
+        self._paused_until = 0.0
+
+        # Global token bucket, starting with a single token so a cold start doesn't burst past the limit
+        self._tokens = 1.0
+        self._tokens_updated_at = time.monotonic()
+
+        self._wakeup = asyncio.Event()
+        self._dispatcher: t.Optional[asyncio.Task] = None
+        self._deliveries: t.Set[asyncio.Task] = set()
+
+    @property
+    def pending(self) -> int:
+        """Number of messages waiting to be sent"""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    async def send_message(self, chat_id: int, text: str, priority: str = DEFAULT_PRIORITY, **kwargs) -> Message:
+        """Queue a message and wait until it is sent.
+
+        Args:
+            chat_id (int): The chat to send the message to
+            text (str): The message text
+            priority (str): Lane of the message, one of "high", "normal" or "low"
+            **kwargs: Additional arguments of `Bot.send_message` (e.g. parse_mode)
+
+        Returns:
+            Message: The sent message
+
+        Raises:
+            Exception: The error of the last attempt, if the message could not be sent
+        """
+        return await self.enqueue_message(chat_id, text, priority, **kwargs)
+
+    def enqueue_message(self, chat_id: int, text: str, priority: str = DEFAULT_PRIORITY, **kwargs) -> "asyncio.Future[Message]":
+        """Queue a message without waiting for it to be sent.
+
+        Args:
+            chat_id (int): The chat to send the message to
+            text (str): The message text
+            priority (str): Lane of the message, one of "high", "normal" or "low"
+            **kwargs: Additional arguments of `Bot.send_message` (e.g. parse_mode)
+
+        Returns:
+            asyncio.Future[Message]: Resolved with the sent message, or the error of the last attempt
+        """
+        if priority not in self._lanes:
+            logger.warning(f"Unknown priority '{priority}', using '{DEFAULT_PRIORITY}'")
+            priority = DEFAULT_PRIORITY
+
+        future = asyncio.get_running_loop().create_future()
+        sequence = next(self._sequence)
+        self._lanes[priority].append(_PendingSend(chat_id=chat_id, text=text, priority=priority, kwargs=kwargs, future=future, sequence=sequence))
+        self._chat_queues.setdefault(chat_id, deque()).append(sequence)
+        self._ensure_dispatcher()
+        self._wakeup.set()
+        return future
+
+    def _ensure_dispatcher(self) -> None:
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    def _next_ready(self, now: float) -> t.Tuple[t.Optional[_PendingSend], t.Optional[float]]:
+        """
+        Pop the first message, by lane priority, which is the oldest queued message of its chat and
+        whose chat can receive a message now.
+
+        Returns:
+            The message (or None), and the time at which the next message will be ready (or None if empty)
+        """
+        next_ready_at: t.Optional[float] = None
+        for lane in self._lanes.values():
+            for index, pending in enumerate(lane):
+                chat_queue = self._chat_queues[pending.chat_id]
+                if chat_queue[0] != pending.sequence:
+                    continue  # An older message of the chat goes first
+
+                ready_at = self._chat_ready_at.get(pending.chat_id, 0.0)
+                if ready_at <= now:
+                    del lane[index]
+                    chat_queue.popleft()
+                    if not chat_queue:
+                        del self._chat_queues[pending.chat_id]
+                    return pending, now
+                next_ready_at = ready_at if next_ready_at is None else min(next_ready_at, ready_at)
+        return None, next_ready_at
+
+    def _take_token(self, now: float) -> float:
+        """Take a token from the global bucket, returning the seconds to wait when it is empty"""
+        self._tokens = min(self.global_rate, self._tokens + (now - self._tokens_updated_at) * self.global_rate)
+        self._tokens_updated_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.global_rate
+
+    async def _dispatch(self) -> None:
+        while True:
+            if not self.pending:
+                # Nothing to send, sleep until a message is queued
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            now = time.monotonic()
+            if self._paused_until > now:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+
+            wait_time = self._take_token(now)
+            if wait_time > 0:
+                await asyncio.sleep(wait_time)
+                continue
+
+            pending, next_ready_at = self._next_ready(now)
+            if pending is None:
+                # Every queued chat is still cooling down, give the token back
+                self._tokens += 1
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(next_ready_at - now, 0.0))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._chat_ready_at[pending.chat_id] = now + self.per_chat_interval
+            delivery = asyncio.create_task(self._deliver(pending))
+            self._deliveries.add(delivery)
+            delivery.add_done_callback(self._deliveries.discard)
+
+    async def _deliver(self, pending: _PendingSend) -> None:
+        pending.attempts += 1
+        try:
+            message = await self._bot.send_message(chat_id=pending.chat_id, text=pending.text, **pending.kwargs)
+            if not pending.future.done():
+                pending.future.set_result(message)
+        except TelegramRetryAfter as e:
+            if pending.attempts > self.max_flood_retries:
+                logger.error(f"Giving up on message to chat {pending.chat_id} after {pending.attempts} flood waits")
+                if not pending.future.done():
+                    pending.future.set_exception(e)
+                return
+
+            logger.warning(f"Flood wait of {e.retry_after} seconds while sending to chat {pending.chat_id}")
+            resume_at = time.monotonic() + e.retry_after
+            self._paused_until = max(self._paused_until, resume_at)
+            self._chat_ready_at[pending.chat_id] = max(self._chat_ready_at.get(pending.chat_id, 0.0), resume_at)
+
+            # Back at the front of its lane and chat, so it is the first of its chat to be sent again
+            self._lanes[pending.priority].appendleft(pending)
+            self._chat_queues.setdefault(pending.chat_id, deque()).appendleft(pending.sequence)
+            self._wakeup.set()
+        except Exception as e:
+            if not pending.future.done():
+                pending.future.set_exception(e)
@@ -1,7 +1,13 @@
+import typing as t
+import json
+
+import aiohttp
 
 from app.services.core.api import APIService
 from app.services.server.routes import AgentAPIRoutes
 from app.types.base import BackendAPIResponse
+from app.helpers.api import ApiError
+from app.core.config import config
 from app.core.logging import logger
 
 
@@ -18,6 +24,7 @@ class AgentService:
             service_name="Agent API",
             base_url=AgentAPIRoutes.BASE
         )
+        self._session: t.Optional[aiohttp.ClientSession] = None
         logger.info("Initialized AgentAPI")
 
     def ask_question(self, chat_id: int, question: str) -> str:
@@ -27,3 +34,70 @@ class AgentService:
         response: BackendAPIResponse = self.api.post(AgentAPIRoutes.ASK_QUESTION, data={"chat_id": chat_id, "question": question})
         return response["data"]
 
+    async def stream_answer(self, chat_id: int, question: str) -> t.AsyncIterator[str]:
+        """
+        Ask a question to the agent, and get the pieces of the answer as soon as they are produced.
+
+        Usage:
+            ```python
+            async for delta in agent_service.stream_answer(chat_id, question):
+                print(delta, end="")
+            ```
+
+        Yields:
+            str: The pieces of the answer
+
+        Raises:
+            ApiError: If the request fails, or the answer fails midway
+        """
+        url = f"{AgentAPIRoutes.BASE.value}{AgentAPIRoutes.ASK_QUESTION_STREAM.value}"
+        try:
+            async with self._get_session().post(
+                url,
+                json={"chat_id": chat_id, "question": question},
+                headers={"Accept": "text/event-stream"}
+            ) as response:
+                if response.status >= 400:
+                    logger.error(f"Server error for Agent API: {response.status}")
+                    raise ApiError("SERVER_ERROR", "Internal server error", {"status": response.status})
+
+                async for event, data in self._read_events(response):
+                    if event == "done":
+                        return
+                    if event == "error":
+                        raise ApiError("AGENT_ERROR", data.get("detail", "The agent failed to answer"))
+                    yield data["content"]
+        except aiohttp.ClientError as e:
+            logger.error(f"Connection error for Agent API: {e}")
+            raise ApiError("CONNECTION_ERROR", "Connection error")
+
+    @staticmethod
+    async def _read_events(response: aiohttp.ClientResponse) -> t.AsyncIterator[t.Tuple[t.Optional[str], t.Dict[str, t.Any]]]:
+        """Parse the server-sent events of the response into (event, data) pairs"""
+        event, data = None, []
+        async for raw_line in response.content:
+            line = raw_line.decode("utf-8").rstrip("\r\n")
+            if not line:
+                if data:
+                    yield event, json.loads("\n".join(data))
+                event, data = None, []
+            elif line.startswith("event:"):
+                event = line[len("event:"):].strip()
+            elif line.startswith("data:"):
+                data.append(line[len("data:"):].lstrip())
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Lazily create the HTTP session, as it has to be created within the event loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=config.AGENT_STREAM_TIMEOUT_SECONDS)
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """
+        Close the HTTP session used for streaming.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
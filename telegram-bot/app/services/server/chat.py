@@ -1,6 +1,8 @@
 import typing as t
 import asyncio
 
+from aiogram import types
+
 from app.core.logging import logger
 from app.models.chat import ChatSchema
 from app.services.core.api import APIService
@@ -35,6 +37,23 @@ class ChatService:
             logger.error(f"Error saving message: {e}")
             raise e
 
+    async def save_reply(self, reply: types.Message, text: t.Optional[str] = None) -> ChatSchema:
+        """
+        Save a message the bot sent, under the ID Telegram gave it.
+
+        Args:
+            reply (types.Message): The sent message
+            text (Optional[str]): Its final text, if it was edited since it was sent
+        """
+        return await self.save_message(ChatSchema(
+            message_content=text if text is not None else str(reply.text),
+            chat_id=int(reply.chat.id),
+            chat_type=str(reply.chat.type),
+            username=str(reply.from_user.username),
+            user_id=int(reply.from_user.id),
+            message_id=int(reply.message_id),
+        ))
+
 
 if __name__ == "__main__":
     async def main():
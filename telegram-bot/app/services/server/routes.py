@@ -19,4 +19,5 @@ class AgentAPIRoutes(Enum):
     BASE: str = config.API_URL
 
     ASK_QUESTION: str = "/agent/ask-question"
+    ASK_QUESTION_STREAM: str = "/agent/ask-question/stream"
 
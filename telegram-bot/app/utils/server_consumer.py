@@ -13,12 +13,23 @@ class ServerConsumer:
     def __init__(self):
         self.rabbitmq = RabbitMQService()
         self.queue_name = "opportunity_notifications"
+        self.telegram_notification_service = TelegramNotificationService()
 
-    async def _process_message(self, message: dict) -> None:
+    async def _process_message(self, message: dict, headers: dict) -> asyncio.Future:
         """Process a single notification message
-        
+
+        The notification is only queued in the send throttler: the message is acknowledged once
+        it is sent, while the next ones are processed, so the lanes fill up to the prefetch count.
+
         Args:
             message (dict): Message containing username, message, and timestamp
+            headers (dict): Message headers, whose "priority" is the send lane of the notification
+
+        Returns:
+            asyncio.Future: Resolved once the notification is sent
+
+        Raises:
+            Exception: If the message could not be queued, so it is retried later
         """
         try:
             # Convert the message dictionary to an OpportunityNotification object
@@ -27,13 +38,15 @@ class ServerConsumer:
             username = data.username
             text = data.message
 
-            telegram_notification_service = TelegramNotificationService(username=username)
-            await telegram_notification_service.initialize()
-            
-            await telegram_notification_service.send_notification(text)
-            await telegram_notification_service.end()
-            logger.info(f"Successfully sent message to username: {username}")
-            
+            delivery = await self.telegram_notification_service.queue_notification(
+                username,
+                text,
+                chat_id=data.chat_id,
+                priority=headers.get("priority", "normal")
+            )
+            logger.info(f"Queued message to username: {username}")
+            return delivery
+
         except Exception as e:
             logger.error(f"Error processing message: {str(e)}")
             raise
@@ -42,14 +55,20 @@ class ServerConsumer:
         """Start consuming messages from RabbitMQ"""
         try:
             logger.info("Starting Telegram notification consumer...")
-            await self.rabbitmq.consume(self.queue_name, self._process_message)
+            await self.rabbitmq.consume(
+                self.queue_name,
+                self._process_message,
+                ordering_key=lambda message: message.get("username"),  # Keep the order of the messages of a chat
+                pass_headers=True
+            )
         except Exception as e:
             logger.error(f"Error in consumer: {str(e)}")
             raise
 
     async def close(self) -> None:
-        """Close RabbitMQ connections"""
+        """Close RabbitMQ connections and the HTTP session of the notification service"""
         await self.rabbitmq.close()
+        await self.telegram_notification_service.close()
 
 
 if __name__ == "__main__":